@@ -1,17 +1,62 @@
-import os
+import hashlib
 
-import re
+import os
 
 import shutil
 
 import sys
 
+import threading
+
 import time
 
-import requests
 
-import platform
+if __name__ == "__main__":
+    # Exécutable figé : les processus du pool repassent par ici avant tout le reste
+    import multiprocessing
+    multiprocessing.freeze_support()
+
+if __name__ == "__main__" and sys.argv[1:2] == ["vmt"]:
+    # Le moteur devient le module principal, avant l'import de PyQt5 et de requests : le mode sans
+    # interface tourne sur des machines sans affichage, et les processus du pool (spawn) ne
+    # rechargent que vmt_engine, jamais l'interface
+    import runpy
+    sys.argv = [sys.argv[0]] + sys.argv[2:]
+    runpy.run_module("vmt_engine", run_name="__main__", alter_sys=True)
+
+from vmt_engine import (
+    VMTJob, VMTJobCancelled, _scan_material_dir, apply_dirs_changes, entries_size, move_referenced_vmt_vtf,
+    move_vmt_vtf, recover_vmt_journal, report_vmt_references, rewrite_vmt_tree, scan_vmt_dir_records,
+    vmt_diff_path, vmt_journal_path,
+)
+
 
+class _LazyModule:
+    """Module importé au premier accès à l'un de ses attributs.
+
+    L'import est protégé par un verrou : check_update interroge plusieurs serveurs en
+    parallèle et le premier accès peut venir de plusieurs threads à la fois.
+    """
+
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+        self._lock = threading.Lock()
+
+    def __getattr__(self, attr):
+        module = self._module
+        if module is None:
+            with self._lock:
+                if self._module is None:
+                    import importlib
+                    self._module = importlib.import_module(self._name)
+                module = self._module
+        return getattr(module, attr)
+
+
+# requests (et urllib3, certifi...) coûte plus que tout le reste du démarrage : chargé au premier appel réseau
+requests = _LazyModule("requests")
+import platform
 import subprocess
 
 import uuid
@@ -26,10 +71,9 @@ from PyQt5.QtWidgets import (
 
 from PyQt5.QtCore import Qt, QTimer
 
-import hashlib
-from PyQt5.QtWidgets import QDialog, QProgressBar
-from PyQt5.QtCore import QThread, pyqtSignal
-from PyQt5.QtGui import QFont
+from PyQt5.QtWidgets import QDialog, QProgressBar, QCheckBox, QListView, QTableView, QHeaderView
+from PyQt5.QtCore import QThread, pyqtSignal, QAbstractListModel, QAbstractTableModel, QModelIndex, QSortFilterProxyModel
+from PyQt5.QtGui import QFont, QColor
 
 def get_hardware_id():
     """Génère un identifiant unique basé sur le matériel du PC"""
@@ -2203,6 +2247,8 @@ VERSION = "18.9.0"  # version locale
 UPDATE_CHECK_URL = "https://raw.githubusercontent.com/sakuoo1/vm/main/version.txt"
 UPDATE_SCRIPT_URL = "https://raw.githubusercontent.com/sakuoo1/vm/main/aa.py"
 
+# Le moteur est un fichier à part : chaque mise à jour de aa.py remplace aussi vmt_engine.py
+UPDATE_ENGINE_NAME = "vmt_engine.py"
 # Variable globale pour stocker la meilleure URL de téléchargement
 BEST_UPDATE_URL = UPDATE_SCRIPT_URL
 
@@ -2435,6 +2481,30 @@ def check_update(silent=False):
 
 # ------------------ Fonctions de téléchargement optimisées ------------------
 
+def download_engine_update(script_url, timeout=30):
+    """Télécharge vmt_engine.py depuis le même serveur que script_url et le pose à côté de aa.py.
+
+    Écriture dans un temporaire puis os.replace : un échec laisse le moteur en place.
+    Retourne (succès, URL ou message d'erreur).
+    """
+    engine_url = script_url.split('?')[0].rsplit("/", 1)[0] + "/" + UPDATE_ENGINE_NAME
+    try:
+        response = requests.get(engine_url, timeout=timeout, headers={'Cache-Control': 'no-cache'})
+        if response.status_code != 200:
+            return False, f"HTTP {response.status_code} pour {engine_url}"
+        content = response.content
+        if b"def vmt_cli_main" not in content:
+            return False, f"Contenu invalide : {engine_url}"
+        engine_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), UPDATE_ENGINE_NAME)
+        tmp_path = engine_path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(content)
+        os.replace(tmp_path, engine_path)
+        return True, engine_url
+    except Exception as e:
+        return False, str(e)
+
+
 def download_update_optimized(latest_version, progress_callback=None):
     """Télécharge la mise à jour de manière optimisée avec gestion d'erreurs robuste"""
     
@@ -2539,7 +2609,11 @@ def download_update_optimized(latest_version, progress_callback=None):
         
         if progress_callback:
             progress_callback("Installation de la mise à jour...", 70)
-        
+
+        # Le moteur d'abord : aa.py n'est remplacé que si vmt_engine.py a pu l'être
+        engine_ok, engine_message = download_engine_update(successful_download['url'])
+        if not engine_ok:
+            return False, f"Échec du téléchargement du moteur: {engine_message}"
         # Sauvegarder le fichier
         script_path = os.path.abspath(__file__)
         backup_path = script_path + ".backup"
@@ -2576,44 +2650,570 @@ def download_update_optimized(latest_version, progress_callback=None):
     except Exception as e:
         return False, f"Erreur critique lors de la mise à jour: {e}"
 
-# ------------------ Fonctions VMT/Dossier ------------------
-
-def read_file(path):
-    for enc in ('utf-8','cp1252','latin-1'):
-        try:
-            with open(path,'r',encoding=enc) as f:
-
-
-
-
-
-
-
+# ------------------ Interface principale ------------------
+# Lignes gardées dans la vue du journal (les plus anciennes sont retirées, le fichier garde tout)
+LOG_VIEW_MAX_LINES = 50000
+
+# Lignes retirées d'un coup quand la vue dépasse LOG_VIEW_MAX_LINES
+LOG_VIEW_TRIM_LINES = 5000
+
+# Intervalle de livraison des lignes en attente vers la vue et vers le fichier (ms)
+LOG_VIEW_FLUSH_MS = 100
+
+# Journal complet sur disque, à côté du script comme crash.txt ; archivé en .old au-delà de cette taille
+LOG_FILE_NAME = "journal_vmt.log"
+LOG_FILE_MAX_BYTES = 20 * 1024 * 1024
+
+# Couleur des lignes selon leur étiquette
+LOG_LINE_COLORS = (
+    ("[ERREUR", "#FF6B6B"),
+    ("[INTERROMPU", "#FF6B6B"),
+    ("[NON RÉSOLUE", "#FFB347"),
+    ("[MANQUANTE", "#FFB347"),
+    ("[IGNORÉ", "#AAAAAA"),
+    ("[MODIFIÉ", "#7CD992"),
+    ("[PROFIL", "#8AB4F8"),
+)
 
 
+class LogFileWriter:
+    """Écrit le journal complet sur disque dans un thread dédié : l'interface ne fait que déposer des lots.
 
+    error garde la première erreur d'ouverture ou d'écriture ; le LogView la rapporte dans le journal.
+    """
 
-                return f.read(), enc
+    def __init__(self, path):
+        import queue
+        self.path = path
+        self.error = None
+        self._queue = queue.SimpleQueue()
+        # Ouverture dans le thread de l'interface : une erreur est connue avant la première ligne
+        try:
+            if os.path.exists(path) and os.path.getsize(path) > LOG_FILE_MAX_BYTES:
+                os.replace(path, path + ".old")
+            self._file = open(path, "a", encoding="utf-8", errors="replace")
+        except OSError as e:
+            self.error = e
+            self._file = None
+            self._thread = None
+            return
+        self._thread = threading.Thread(target=self._run, name="journal-vmt", daemon=True)
+        self._thread.start()
 
+    def write_lines(self, lines):
+        if self._thread is not None:
+            self._queue.put(lines)
 
+    def close(self):
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join(timeout=5)
 
+    def _run(self):
+        f = self._file
+        try:
+            f.write(f"===== {time.strftime('%Y-%m-%d %H:%M:%S')} =====\n")
+            while True:
+                batch = self._queue.get()
+                closing = batch is None
+                lines = [] if closing else list(batch)
+                # Regroupe tout ce qui attend déjà : une écriture par réveil
+                while not closing and not self._queue.empty():
+                    more = self._queue.get()
+                    if more is None:
+                        closing = True
+                    else:
+                        lines.extend(more)
+                if f is not None and lines:
+                    try:
+                        f.write("\n".join(lines) + "\n")
+                        f.flush()
+                    except OSError as e:
+                        # Disque plein ou retiré : la suite du journal reste dans la vue seulement
+                        self.error = e
+                        f.close()
+                        f = None
+                if closing:
+                    break
+        except OSError as e:
+            self.error = e
+        finally:
+            if f is not None:
+                f.close()
+
+
+class LogListModel(QAbstractListModel):
+    """Lignes du journal pour un QListView : seules les lignes visibles sont dessinées"""
+
+    def __init__(self, max_lines=LOG_VIEW_MAX_LINES, parent=None):
+        super().__init__(parent)
+        self.max_lines = max_lines
+        self._lines = []
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._lines)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        line = self._lines[index.row()]
+        if role == Qt.DisplayRole:
+            return line
+        if role == Qt.ForegroundRole:
+            for tag, color in LOG_LINE_COLORS:
+                if line.startswith(tag):
+                    return QColor(color)
+        return None
+
+    def append_lines(self, lines):
+        if not lines:
+            return
+        first = len(self._lines)
+        self.beginInsertRows(QModelIndex(), first, first + len(lines) - 1)
+        self._lines.extend(lines)
+        self.endInsertRows()
+        if len(self._lines) > self.max_lines + LOG_VIEW_TRIM_LINES:
+            # Retrait par blocs : une seule notification pour des milliers de lignes
+            excess = len(self._lines) - self.max_lines
+            self.beginRemoveRows(QModelIndex(), 0, excess - 1)
+            del self._lines[:excess]
+            self.endRemoveRows()
+
+    def clear(self):
+        self.beginResetModel()
+        self._lines = []
+        self.endResetModel()
+
+    def lines(self):
+        return self._lines
+
+
+class LogFilterProxy(QSortFilterProxyModel):
+    """Filtre du journal : texte recherché (sans casse) et, au besoin, erreurs seulement"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._text = ""
+        self._errors_only = False
+
+    def set_filter(self, text, errors_only):
+        self._text = text.lower()
+        self._errors_only = errors_only
+        self.invalidateFilter()
+
+    def filterAcceptsRow(self, source_row, source_parent):
+        if not self._text and not self._errors_only:
+            return True
+        line = self.sourceModel().lines()[source_row]
+        if self._errors_only and not line.startswith("[ERREUR"):
+            return False
+        return not self._text or self._text in line.lower()
+
+
+class LogView(QWidget):
+    """Journal d'activité : remplace le QTextEdit avec la même interface append()/clear().
+
+    append() ne fait que déposer la ligne dans un tampon circulaire ; un timer livre les
+    lignes par lots au modèle (borné à LOG_VIEW_MAX_LINES) et au LogFileWriter qui garde
+    le journal complet sur disque.
+    """
+
+    def __init__(self, log_path=None, parent=None):
+        import collections
+        super().__init__(parent)
+        self.model = LogListModel()
+        self.proxy = LogFilterProxy(self)
+        self.proxy.setSourceModel(self.model)
+        # Tampon circulaire : si l'interface prend du retard, la vue ne garde que les dernières lignes
+        self._pending_view = collections.deque(maxlen=LOG_VIEW_MAX_LINES)
+        self._pending_file = []
+        self._file_writer = LogFileWriter(log_path) if log_path else None
+        self._check_file_writer()
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        filter_layout = QHBoxLayout()
+        self.search_entry = QLineEdit()
+        self.search_entry.setPlaceholderText("🔍 Filtrer le journal...")
+        self.errors_only_check = QCheckBox("Erreurs seulement")
+        self.errors_only_check.setStyleSheet("QCheckBox { color: #FFFFFF; font-size: 12px; }")
+        self.search_entry.textChanged.connect(self._apply_filter)
+        self.errors_only_check.toggled.connect(self._apply_filter)
+        filter_layout.addWidget(self.search_entry)
+        filter_layout.addWidget(self.errors_only_check)
+        layout.addLayout(filter_layout)
+
+        self.view = QListView()
+        self.view.setModel(self.proxy)
+        # Hauteur de ligne fixe : la vue n'a pas à mesurer chaque ligne
+        self.view.setUniformItemSizes(True)
+        self.view.setSelectionMode(QListView.ExtendedSelection)
+        self.view.setHorizontalScrollBarPolicy(Qt.ScrollBarAsNeeded)
+        layout.addWidget(self.view)
+
+        self._flush_timer = QTimer(self)
+        self._flush_timer.setInterval(LOG_VIEW_FLUSH_MS)
+        self._flush_timer.timeout.connect(self.flush)
+        self._flush_timer.start()
+
+    def setStyleSheet(self, style):
+        self.view.setStyleSheet(style)
+
+    def setReadOnly(self, _read_only):
+        # Compatibilité avec l'ancien QTextEdit : la vue est toujours en lecture seule
+        pass
+
+    def append(self, text):
+        """Même interface que QTextEdit.append ; un texte de plusieurs lignes donne plusieurs lignes"""
+        lines = text.split("\n") if "\n" in text else [text]
+        self._pending_view.extend(lines)
+        self._pending_file.extend(lines)
+
+    def append_lines(self, lines):
+        self._pending_view.extend(lines)
+        self._pending_file.extend(lines)
+
+    def flush(self):
+        self._check_file_writer()
+        if self._pending_file and self._file_writer is not None:
+            self._file_writer.write_lines(self._pending_file)
+        self._pending_file = []
+        if not self._pending_view:
+            return
+        scrollbar = self.view.verticalScrollBar()
+        at_bottom = scrollbar.value() >= scrollbar.maximum() - 2
+        lines = list(self._pending_view)
+        self._pending_view.clear()
+        self.model.append_lines(lines)
+        if at_bottom:
+            self.view.scrollToBottom()
+
+    def clear(self):
+        self._pending_view.clear()
+        self.model.clear()
+
+    def toPlainText(self):
+        self.flush()
+        return "\n".join(self.model.lines())
+
+    def close_log(self):
+        self.flush()
+        self._flush_timer.stop()
+        if self._file_writer is not None:
+            self._file_writer.close()
+            self._file_writer = None
+
+    def _apply_filter(self):
+        self.proxy.set_filter(self.search_entry.text(), self.errors_only_check.isChecked())
+
+    def _check_file_writer(self):
+        """Rapporte une fois dans la vue une erreur du journal sur disque, puis cesse de l'alimenter"""
+        writer = self._file_writer
+        if writer is None or writer.error is None:
+            return
+        self._file_writer = None
+        writer.close()
+        self._pending_view.append(f"[ERREUR JOURNAL] Journal sur disque indisponible : {writer.path} ({writer.error})")
+
+
+def format_size(nbytes):
+    for unit in ("o", "Ko", "Mo", "Go"):
+        if nbytes < 1024 or unit == "Go":
+            return f"{nbytes} {unit}" if unit == "o" else f"{nbytes:.1f} {unit}"
+        nbytes /= 1024
+
+
+class DetectedDirsModel(QAbstractTableModel):
+    """Dossiers détectés (chemin, VMT, VTF, taille) avec une case à cocher par dossier"""
+
+    COLUMNS = ("Dossier", "VMT", "VTF", "Taille")
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        # [dossier, nombre de VMT, nombre de VTF, octets, coché]
+        self._records = []
+        self._paths = set()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._records)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.COLUMNS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.COLUMNS[section]
+        return None
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        record = self._records[index.row()]
+        column = index.column()
+        if role == Qt.DisplayRole:
+            return format_size(record[3]) if column == 3 else record[column]
+        if role == Qt.UserRole:
+            # Valeur brute pour le tri : la taille se trie en octets, pas en texte
+            return record[column].lower() if column == 0 else record[column]
+        if role == Qt.CheckStateRole and column == 0:
+            return Qt.Checked if record[4] else Qt.Unchecked
+        if role == Qt.TextAlignmentRole and column:
+            return int(Qt.AlignRight | Qt.AlignVCenter)
+        return None
+
+    def flags(self, index):
+        flags = super().flags(index)
+        if index.isValid() and index.column() == 0:
+            flags |= Qt.ItemIsUserCheckable
+        return flags
+
+    def setData(self, index, value, role=Qt.EditRole):
+        if not index.isValid() or role != Qt.CheckStateRole or index.column() != 0:
+            return False
+        self._records[index.row()][4] = value == Qt.Checked
+        self.dataChanged.emit(index, index, [Qt.CheckStateRole])
+        return True
 
+    def set_records(self, records):
+        self.beginResetModel()
+        self._records = [[path, vmt_count, vtf_count, nbytes, True] for path, vmt_count, vtf_count, nbytes in records]
+        self._paths = {record[0] for record in self._records}
+        self.endResetModel()
+
+    def add_record(self, record):
+        """Ajoute un dossier coché ; False s'il est déjà listé"""
+        if record[0] in self._paths:
+            return False
+        row = len(self._records)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self._records.append([*record, True])
+        self._paths.add(record[0])
+        self.endInsertRows()
+        return True
 
+    def set_checked(self, rows, checked):
+        for row in rows:
+            self._records[row][4] = checked
+        if self._records:
+            self.dataChanged.emit(self.index(0, 0), self.index(len(self._records) - 1, 0), [Qt.CheckStateRole])
+
+    def clear(self):
+        self.set_records([])
+
+    def checked_paths(self):
+        return [record[0] for record in self._records if record[4]]
+
+
+class DetectedDirsView(QWidget):
+    """Liste des dossiers détectés : tri par colonne, filtre sur le chemin, sélection par cases à cocher.
+
+    Renommage et déplacement ne traitent que les dossiers cochés ; tous le sont après une analyse.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.model = DetectedDirsModel(self)
+        self.proxy = QSortFilterProxyModel(self)
+        self.proxy.setSourceModel(self.model)
+        self.proxy.setSortRole(Qt.UserRole)
+        self.proxy.setFilterKeyColumn(0)
+        self.proxy.setFilterCaseSensitivity(Qt.CaseInsensitive)
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        filter_layout = QHBoxLayout()
+        self.search_entry = QLineEdit()
+        self.search_entry.setPlaceholderText("🔍 Filtrer les dossiers...")
+        self.search_entry.textChanged.connect(self.proxy.setFilterFixedString)
+        self.check_all_btn = QPushButton("☑ Tout cocher")
+        self.uncheck_all_btn = QPushButton("☐ Tout décocher")
+        self.add_dir_btn = QPushButton("➕ Ajouter")
+        # Les boutons de cochage n'agissent que sur les lignes visibles avec le filtre courant
+        self.check_all_btn.clicked.connect(lambda: self._set_visible_checked(True))
+        self.uncheck_all_btn.clicked.connect(lambda: self._set_visible_checked(False))
+        self.add_dir_btn.clicked.connect(self._choose_dir)
+        filter_layout.addWidget(self.search_entry)
+        filter_layout.addWidget(self.check_all_btn)
+        filter_layout.addWidget(self.uncheck_all_btn)
+        filter_layout.addWidget(self.add_dir_btn)
+        layout.addLayout(filter_layout)
+
+        self.view = QTableView()
+        self.view.setModel(self.proxy)
+        self.view.setSortingEnabled(True)
+        self.view.sortByColumn(0, Qt.AscendingOrder)
+        self.view.setSelectionBehavior(QTableView.SelectRows)
+        self.view.setWordWrap(False)
+        self.view.verticalHeader().setVisible(False)
+        # Hauteur de ligne fixe : la vue n'a pas à mesurer chaque ligne
+        self.view.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        header = self.view.horizontalHeader()
+        header.setSectionResizeMode(0, QHeaderView.Stretch)
+        for column in range(1, len(DetectedDirsModel.COLUMNS)):
+            header.setSectionResizeMode(column, QHeaderView.ResizeToContents)
+        layout.addWidget(self.view)
+
+    def setStyleSheet(self, style):
+        self.view.setStyleSheet(style)
+
+    def set_records(self, records):
+        self.model.set_records(records)
+
+    def clear(self):
+        self.model.clear()
+
+    def checked_paths(self):
+        return self.model.checked_paths()
+
+    def add_dir(self, path):
+        """Ajoute un dossier à la main, avec ses comptes ; False s'il est déjà listé ou illisible"""
+        try:
+            _, vmt_entries, vtf_entries = _scan_material_dir(path)
+        except OSError:
+            return False
+        return self.model.add_record((path, len(vmt_entries), len(vtf_entries), entries_size(vmt_entries + vtf_entries)))
 
+    def _choose_dir(self):
+        path = QFileDialog.getExistingDirectory(self, "Ajouter un dossier")
+        if path:
+            self.add_dir(os.path.normpath(path))
 
+    def _set_visible_checked(self, checked):
+        rows = [self.proxy.mapToSource(self.proxy.index(row, 0)).row() for row in range(self.proxy.rowCount())]
+        self.model.set_checked(rows, checked)
 
 
+class UpdateCheckWorker(QThread):
+    """Exécute check_update hors du thread de l'interface"""
+    result = pyqtSignal(object, object, object)  # version distante, à jour, message
 
+    def __init__(self, silent=False):
+        super().__init__()
+        self.silent = silent
 
+    def run(self):
+        try:
+            latest_version, up_to_date, error_msg = check_update(silent=self.silent)
+        except Exception as e:
+            latest_version, up_to_date, error_msg = "Erreur", False, str(e)
+        self.result.emit(latest_version, up_to_date, error_msg)
 
 
+class VMTJobWorker(QThread):
+    """Exécute une opération VMT en arrière-plan et transmet journal et progression par lots"""
+    progress = pyqtSignal(int, int, object)  # fichiers analysés, fichiers réécrits, octets
+    log_batch = pyqtSignal(list)
+    job_finished = pyqtSignal(bool, str)
 
+    # Intervalle de livraison du journal et de la progression vers l'interface (ms)
+    FLUSH_INTERVAL_MS = 100
 
-        except Exception:
+    def __init__(self, func, *args, **kwargs):
+        super().__init__()
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+        self.job = VMTJob()
+        self._pending_logs = []
+        self._logs_lock = threading.Lock()
+        # Le timer vit dans le thread de l'interface : le travail ne fait que remplir le tampon
+        self._flush_timer = QTimer()
+        self._flush_timer.setInterval(self.FLUSH_INTERVAL_MS)
+        self._flush_timer.timeout.connect(self.flush)
+        self._result = (False, "")
+        # Valeur rendue par func, lue par l'interface une fois le travail terminé
+        self.value = None
+        self.finished.connect(self._on_thread_finished)
+
+    def append(self, message):
+        """Même interface que log_widget.append, appelable depuis le thread de travail"""
+        with self._logs_lock:
+            self._pending_logs.append(message)
+
+    def flush(self):
+        with self._logs_lock:
+            batch, self._pending_logs = self._pending_logs, []
+        if batch:
+            self.log_batch.emit(batch)
+        self.progress.emit(self.job.files_scanned, self.job.files_rewritten, self.job.bytes_processed)
+
+    def cancel(self):
+        self.job.cancel()
+
+    def start(self, *args):
+        self._flush_timer.start()
+        super().start(*args)
+
+    def _on_thread_finished(self):
+        # Dernier lot livré avant d'annoncer la fin, pour garder l'ordre du journal
+        self._flush_timer.stop()
+        self.flush()
+        self.job_finished.emit(*self._result)
 
+    def run(self):
+        try:
+            self.value = self.func(*self.args, log_widget=self, job=self.job, **self.kwargs)
+            self._result = (True, "")
+        except VMTJobCancelled:
+            self._result = (False, "Opération annulée par l'utilisateur")
+        except Exception as e:
+            self._result = (False, f"Erreur: {e}")
 
 
+class VMTPathRenamer(QWidget):
+    def __init__(self):
+        super().__init__()
 
+        self.setWindowTitle("SAK VMT RENAME ETC ")
+        
+        # Style futuriste pour la fenêtre principale
+        self.setStyleSheet("""
+            QWidget {
+                background: qlineargradient(x1: 0, y1: 0, x2: 0, y2: 1,
+                    stop: 0 #0A0A0A, stop: 1 #1A1A1A);
+                color: #FFFFFF;
+                font-family: 'Inter', 'Segoe UI', Arial, sans-serif;
+            }
+            QLabel {
+                color: #FFFFFF;
+                font-weight: 500;
+            }
+            QLineEdit {
+                background: qlineargradient(x1: 0, y1: 0, x2: 0, y2: 1,
+                    stop: 0 #1E1E1E, stop: 1 #2A2A2A);
+                color: #FFFFFF;
+                border: 2px solid #333333;
+                border-radius: 12px;
+                padding: 12px 16px;
+                font-size: 13px;
+            }
+            QLineEdit:focus {
+                border: 2px solid #00D4FF;
+            }
+            QTextEdit {
+                background: qlineargradient(x1: 0, y1: 0, x2: 0, y2: 1,
+                    stop: 0 #1E1E1E, stop: 1 #2A2A2A);
+                color: #FFFFFF;
+                border: 2px solid #333333;
+                border-radius: 12px;
+                padding: 8px;
+            }
+            QGroupBox {
+                font-weight: 600;
+                font-size: 14px;
+                color: #00D4FF;
+                border: 2px solid #333333;
+                border-radius: 12px;
+                margin-top: 10px;
+                padding-top: 15px;
+            }
+            QGroupBox::title {
+                subcontrol-origin: margin;
+                left: 15px;
+                padding: 0 8px 0 8px;
+                color: #00D4FF;
+                background: #1A1A1A;
+            }
+        """)
 
 
 
@@ -2625,11 +3225,11 @@ def read_file(path):
 
 
 
-            continue
 
 
 
 
+        self.setGeometry(100, 100, 1100, 900)
 
 
 
@@ -2641,11 +3241,15 @@ def read_file(path):
 
 
 
-    raise Exception(f"Impossible de lire {path}")
 
 
 
 
+        self.update_check_worker = None
+        self.init_ui()
+        # Après le premier affichage de la fenêtre, et dans un thread : le réseau ne retarde plus le démarrage
+        QTimer.singleShot(0, self.manual_check_update)
+        # Timer pour vérification automatique toutes les 15 minutes
 
 
 
@@ -2653,6 +3257,7 @@ def read_file(path):
 
 
 
+        self.update_timer = QTimer()
 
 
 
@@ -2660,20 +3265,51 @@ def read_file(path):
 
 
 
+        self.update_timer.timeout.connect(self.auto_check_update)
 
 
 
 
+        self.update_timer.start(15 * 60 * 1000)  # 15 minutes en millisecondes
+    
+    def _start_update_check(self, silent, slot):
+        """Lance check_update dans un UpdateCheckWorker ; retourne False si une vérification est déjà en cours"""
+        if self.update_check_worker is not None and self.update_check_worker.isRunning():
+            return False
+        self.update_check_worker = UpdateCheckWorker(silent=silent)
+        self.update_check_worker.result.connect(slot)
+        self.update_check_worker.start()
+        return True
 
+    def auto_check_update(self):
+        """Vérification automatique silencieuse des mises à jour"""
+        self._start_update_check(True, self.on_auto_update_checked)
 
+    def on_auto_update_checked(self, latest_version, up_to_date, error_msg):
+        try:
+            if latest_version != "Erreur" and not up_to_date:
+                # Mise à jour disponible - notifier discrètement
+                self.update_label.setText(f"🔔 Nouvelle version disponible ({latest_version})")
+                self.update_btn.setEnabled(True)
+                self.log_widget.append(f"🔔 Mise à jour automatique détectée: {latest_version}")
+            elif up_to_date:
+                # Application à jour
+                self.update_label.setText(f"✅ Application à jour ({VERSION})")
+                self.update_btn.setEnabled(False)
+            # En cas d'erreur, ne rien faire (vérification silencieuse)
+            
+        except Exception as e:
+            # Erreur silencieuse - ne pas déranger l'utilisateur
+            print(f"[DEBUG] Erreur vérification automatique: {e}")
+            pass
 
 
 
+    def init_ui(self):
 
 
 
 
-def replace_paths_in_vmt(MATERIALS_DIR, NEW_PATH, log_widget):
 
 
 
@@ -2685,11 +3321,11 @@ def replace_paths_in_vmt(MATERIALS_DIR, NEW_PATH, log_widget):
 
 
 
+        layout = QVBoxLayout()
 
 
 
 
-    key_pattern = re.compile(r'(\$[a-z0-9_]+\s+)(["\'])([^"\']+)(["\'])', re.IGNORECASE)
 
 
 
@@ -2701,14 +3337,15 @@ def replace_paths_in_vmt(MATERIALS_DIR, NEW_PATH, log_widget):
 
 
 
+        # Version label + update buttons
 
 
 
 
-    any_quoted = re.compile(r'(["\'])([^"\']*[/\\][^"\']*)\1')
 
 
 
+        update_layout = QHBoxLayout()
 
 
 
@@ -2716,14 +3353,37 @@ def replace_paths_in_vmt(MATERIALS_DIR, NEW_PATH, log_widget):
 
 
 
+        self.update_label = QLabel("🔄 Vérification mise à jour...")
+        self.update_label.setStyleSheet("color: #00D4FF; font-weight: 600; font-size: 14px;")
 
 
 
 
 
-    modified_vmt_files = []
 
 
+        self.check_update_btn = QPushButton("🔄 Vérifier")
+        self.check_update_btn.setStyleSheet("""
+            QPushButton {
+                background: qlineargradient(x1: 0, y1: 0, x2: 0, y2: 1,
+                    stop: 0 #00D4FF, stop: 1 #0099CC);
+                color: #000000;
+                font-weight: 600;
+                border: none;
+                border-radius: 12px;
+                padding: 12px 20px;
+                font-size: 13px;
+                min-width: 120px;
+            }
+            QPushButton:hover {
+                background: qlineargradient(x1: 0, y1: 0, x2: 0, y2: 1,
+                    stop: 0 #1AE5FF, stop: 1 #00B8E6);
+            }
+            QPushButton:pressed {
+                background: qlineargradient(x1: 0, y1: 0, x2: 0, y2: 1,
+                    stop: 0 #0099CC, stop: 1 #007399);
+            }
+        """)
 
 
 
@@ -2731,14 +3391,36 @@ def replace_paths_in_vmt(MATERIALS_DIR, NEW_PATH, log_widget):
 
 
 
+        self.check_update_btn.clicked.connect(self.manual_check_update)
 
 
 
 
 
 
-    vmt_dirs = set()
 
+        self.debug_btn = QPushButton("🐛 Debug GitHub")
+        self.debug_btn.setStyleSheet("""
+            QPushButton {
+                background: qlineargradient(x1: 0, y1: 0, x2: 0, y2: 1,
+                    stop: 0 #9933CC, stop: 1 #7A29A3);
+                color: #FFFFFF;
+                font-weight: 600;
+                border: none;
+                border-radius: 12px;
+                padding: 12px 20px;
+                font-size: 13px;
+                min-width: 120px;
+            }
+            QPushButton:hover {
+                background: qlineargradient(x1: 0, y1: 0, x2: 0, y2: 1,
+                    stop: 0 #BB44FF, stop: 1 #9933CC);
+            }
+            QPushButton:pressed {
+                background: qlineargradient(x1: 0, y1: 0, x2: 0, y2: 1,
+                    stop: 0 #7A29A3, stop: 1 #5C1F7A);
+            }
+        """)
 
 
 
@@ -2746,6 +3428,7 @@ def replace_paths_in_vmt(MATERIALS_DIR, NEW_PATH, log_widget):
 
 
 
+        self.debug_btn.clicked.connect(self.debug_github)
 
 
 
@@ -2753,7 +3436,28 @@ def replace_paths_in_vmt(MATERIALS_DIR, NEW_PATH, log_widget):
 
 
 
-    for root, _, files in os.walk(MATERIALS_DIR):
+        self.test_local_btn = QPushButton("🧪 Test Local")
+        self.test_local_btn.setStyleSheet("""
+            QPushButton {
+                background: qlineargradient(x1: 0, y1: 0, x2: 0, y2: 1,
+                    stop: 0 #FF6600, stop: 1 #CC5200);
+                color: #FFFFFF;
+                font-weight: 600;
+                border: none;
+                border-radius: 12px;
+                padding: 12px 20px;
+                font-size: 13px;
+                min-width: 120px;
+            }
+            QPushButton:hover {
+                background: qlineargradient(x1: 0, y1: 0, x2: 0, y2: 1,
+                    stop: 0 #FF8800, stop: 1 #E65C00);
+            }
+            QPushButton:pressed {
+                background: qlineargradient(x1: 0, y1: 0, x2: 0, y2: 1,
+                    stop: 0 #CC5200, stop: 1 #994000);
+            }
+        """)
 
 
 
@@ -2761,6 +3465,7 @@ def replace_paths_in_vmt(MATERIALS_DIR, NEW_PATH, log_widget):
 
 
 
+        self.test_local_btn.clicked.connect(self.test_local_version)
 
 
 
@@ -2768,14 +3473,36 @@ def replace_paths_in_vmt(MATERIALS_DIR, NEW_PATH, log_widget):
 
 
 
+        self.force_check_btn = QPushButton("⚡ Force Check")
+        self.force_check_btn.setStyleSheet("""
+            QPushButton {
+                background: qlineargradient(x1: 0, y1: 0, x2: 0, y2: 1,
+                    stop: 0 #FFFF00, stop: 1 #CCCC00);
+                color: #000000;
+                font-weight: 600;
+                border: none;
+                border-radius: 12px;
+                padding: 12px 20px;
+                font-size: 13px;
+                min-width: 120px;
+            }
+            QPushButton:hover {
+                background: qlineargradient(x1: 0, y1: 0, x2: 0, y2: 1,
+                    stop: 0 #FFFF33, stop: 1 #E6E600);
+            }
+            QPushButton:pressed {
+                background: qlineargradient(x1: 0, y1: 0, x2: 0, y2: 1,
+                    stop: 0 #CCCC00, stop: 1 #999900);
+            }
+        """)
 
-        for fname in files:
 
 
 
 
 
 
+        self.force_check_btn.clicked.connect(self.force_check_update)
 
 
 
@@ -2783,14 +3510,36 @@ def replace_paths_in_vmt(MATERIALS_DIR, NEW_PATH, log_widget):
 
 
 
+        self.ultra_check_btn = QPushButton("🚀 Ultra Check")
+        self.ultra_check_btn.setStyleSheet("""
+            QPushButton {
+                background: qlineargradient(x1: 0, y1: 0, x2: 0, y2: 1,
+                    stop: 0 #00FF88, stop: 1 #00CC6A);
+                color: #000000;
+                font-weight: 600;
+                border: none;
+                border-radius: 12px;
+                padding: 12px 20px;
+                font-size: 13px;
+                min-width: 120px;
+            }
+            QPushButton:hover {
+                background: qlineargradient(x1: 0, y1: 0, x2: 0, y2: 1,
+                    stop: 0 #1AFF99, stop: 1 #00E675);
+            }
+            QPushButton:pressed {
+                background: qlineargradient(x1: 0, y1: 0, x2: 0, y2: 1,
+                    stop: 0 #00CC6A, stop: 1 #00B35C);
+            }
+        """)
 
 
-            if not fname.lower().endswith(".vmt"):
 
 
 
 
 
+        self.ultra_check_btn.clicked.connect(self.ultra_check_update)
 
 
 
@@ -2798,26 +3547,28 @@ def replace_paths_in_vmt(MATERIALS_DIR, NEW_PATH, log_widget):
 
 
 
-
-
-
-                continue
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-            fullpath = os.path.join(root, fname)
+        self.connection_test_btn = QPushButton("🌐 Test Connexion")
+        self.connection_test_btn.setStyleSheet("""
+            QPushButton {
+                background: qlineargradient(x1: 0, y1: 0, x2: 0, y2: 1,
+                    stop: 0 #00CCFF, stop: 1 #0099CC);
+                color: #000000;
+                font-weight: 600;
+                border: none;
+                border-radius: 12px;
+                padding: 12px 20px;
+                font-size: 13px;
+                min-width: 120px;
+            }
+            QPushButton:hover {
+                background: qlineargradient(x1: 0, y1: 0, x2: 0, y2: 1,
+                    stop: 0 #33D6FF, stop: 1 #00B8E6);
+            }
+            QPushButton:pressed {
+                background: qlineargradient(x1: 0, y1: 0, x2: 0, y2: 1,
+                    stop: 0 #0099CC, stop: 1 #007399);
+            }
+        """)
 
 
 
@@ -2825,6 +3576,7 @@ def replace_paths_in_vmt(MATERIALS_DIR, NEW_PATH, log_widget):
 
 
 
+        self.connection_test_btn.clicked.connect(self.test_connection)
 
 
 
@@ -2832,14 +3584,41 @@ def replace_paths_in_vmt(MATERIALS_DIR, NEW_PATH, log_widget):
 
 
 
+        self.update_btn = QPushButton("⬇️ Télécharger mise à jour")
+        self.update_btn.setStyleSheet("""
+            QPushButton {
+                background: qlineargradient(x1: 0, y1: 0, x2: 0, y2: 1,
+                    stop: 0 #FF4757, stop: 1 #CC3A47);
+                color: #FFFFFF;
+                font-weight: 600;
+                border: none;
+                border-radius: 12px;
+                padding: 12px 20px;
+                font-size: 13px;
+                min-width: 120px;
+            }
+            QPushButton:hover {
+                background: qlineargradient(x1: 0, y1: 0, x2: 0, y2: 1,
+                    stop: 0 #FF5A6B, stop: 1 #E6434F);
+            }
+            QPushButton:pressed {
+                background: qlineargradient(x1: 0, y1: 0, x2: 0, y2: 1,
+                    stop: 0 #CC3A47, stop: 1 #B32D3A);
+            }
+            QPushButton:disabled {
+                background: qlineargradient(x1: 0, y1: 0, x2: 0, y2: 1,
+                    stop: 0 #333333, stop: 1 #2A2A2A);
+                color: #707070;
+            }
+        """)
 
-            vmt_dirs.add(root)
 
 
 
 
 
 
+        self.update_btn.setEnabled(False)
 
 
 
@@ -2847,14 +3626,15 @@ def replace_paths_in_vmt(MATERIALS_DIR, NEW_PATH, log_widget):
 
 
 
+        self.update_btn.clicked.connect(self.download_update)
 
 
-            try:
 
 
 
 
 
+        update_layout.addWidget(self.update_label)
 
 
 
@@ -2862,14 +3642,15 @@ def replace_paths_in_vmt(MATERIALS_DIR, NEW_PATH, log_widget):
 
 
 
+        update_layout.addWidget(self.check_update_btn)
 
 
 
-                content, enc = read_file(fullpath)
 
 
 
 
+        update_layout.addWidget(self.debug_btn)
 
 
 
@@ -2877,14 +3658,15 @@ def replace_paths_in_vmt(MATERIALS_DIR, NEW_PATH, log_widget):
 
 
 
+        update_layout.addWidget(self.test_local_btn)
 
 
 
 
-            except Exception as e:
 
 
 
+        update_layout.addWidget(self.force_check_btn)
 
 
 
@@ -2892,14 +3674,15 @@ def replace_paths_in_vmt(MATERIALS_DIR, NEW_PATH, log_widget):
 
 
 
+        update_layout.addWidget(self.ultra_check_btn)
 
 
 
 
 
-                log_widget.append(f"[ERREUR LECTURE] {fullpath} -> {e}")
 
 
+        update_layout.addWidget(self.connection_test_btn)
 
 
 
@@ -2907,14 +3690,15 @@ def replace_paths_in_vmt(MATERIALS_DIR, NEW_PATH, log_widget):
 
 
 
+        update_layout.addWidget(self.update_btn)
 
 
 
 
 
 
-                continue
 
+        layout.addLayout(update_layout)
 
 
 
@@ -2929,7 +3713,6 @@ def replace_paths_in_vmt(MATERIALS_DIR, NEW_PATH, log_widget):
 
 
 
-            lines = content.splitlines(keepends=True)
 
 
 
@@ -2945,9 +3728,9 @@ def replace_paths_in_vmt(MATERIALS_DIR, NEW_PATH, log_widget):
 
 
 
-            new_lines = []
 
 
+        def styled_button(text):
 
 
 
@@ -2961,9 +3744,9 @@ def replace_paths_in_vmt(MATERIALS_DIR, NEW_PATH, log_widget):
 
 
 
-            file_changes = []
 
 
+            btn = QPushButton(text)
 
 
 
@@ -2977,9 +3760,9 @@ def replace_paths_in_vmt(MATERIALS_DIR, NEW_PATH, log_widget):
 
 
 
-            for line in lines:
 
 
+            btn.setCursor(Qt.PointingHandCursor)
 
 
 
@@ -2993,9 +3776,9 @@ def replace_paths_in_vmt(MATERIALS_DIR, NEW_PATH, log_widget):
 
 
 
-                stripped = line.lstrip()
 
 
+            btn.setStyleSheet("""
 
 
 
@@ -3009,9 +3792,9 @@ def replace_paths_in_vmt(MATERIALS_DIR, NEW_PATH, log_widget):
 
 
 
-                if stripped.startswith("//") or stripped.startswith("/*"):
 
 
+                QPushButton {
 
 
 
@@ -3025,9 +3808,17 @@ def replace_paths_in_vmt(MATERIALS_DIR, NEW_PATH, log_widget):
 
 
 
-                    new_lines.append(line)
 
 
+            background: qlineargradient(x1: 0, y1: 0, x2: 0, y2: 1,
+                stop: 0 #00D4FF, stop: 1 #0099CC);
+            color: #000000;
+            font-weight: 600;
+            border: none;
+            border-radius: 12px;
+            padding: 12px 20px;
+            font-size: 13px;
+            min-width: 120px;
 
 
 
@@ -3041,11 +3832,11 @@ def replace_paths_in_vmt(MATERIALS_DIR, NEW_PATH, log_widget):
 
 
 
-                    continue
 
 
 
 
+        }
 
 
 
@@ -3057,11 +3848,11 @@ def replace_paths_in_vmt(MATERIALS_DIR, NEW_PATH, log_widget):
 
 
 
-                def repl_auto(m):
 
 
 
 
+        QPushButton:hover {
 
 
 
@@ -3073,11 +3864,11 @@ def replace_paths_in_vmt(MATERIALS_DIR, NEW_PATH, log_widget):
 
 
 
-                    key, quote, pathval = m.group(1), m.group(2), m.group(3).replace('\\','/')
 
 
 
 
+            background-color: #FF3333;
 
 
 
@@ -3089,11 +3880,11 @@ def replace_paths_in_vmt(MATERIALS_DIR, NEW_PATH, log_widget):
 
 
 
-                    parts = pathval.split('/')
 
 
 
 
+        }
 
 
 
@@ -3105,11 +3896,12 @@ def replace_paths_in_vmt(MATERIALS_DIR, NEW_PATH, log_widget):
 
 
 
-                    if len(parts) > 1:
 
 
 
 
+            """)
+            return btn
 
 
 
@@ -3121,7 +3913,6 @@ def replace_paths_in_vmt(MATERIALS_DIR, NEW_PATH, log_widget):
 
 
 
-                        newpath = NEW_PATH + '/' + parts[-1]
 
 
 
@@ -3137,12 +3928,12 @@ def replace_paths_in_vmt(MATERIALS_DIR, NEW_PATH, log_widget):
 
 
 
-                        file_changes.append((key.strip(), pathval, newpath))
 
 
 
 
 
+        # Dossier
 
 
 
@@ -3153,12 +3944,12 @@ def replace_paths_in_vmt(MATERIALS_DIR, NEW_PATH, log_widget):
 
 
 
-                        return key + quote + newpath + quote
 
 
 
 
 
+        folder_group = QGroupBox("Dossier à scanner")
 
 
 
@@ -3169,12 +3960,12 @@ def replace_paths_in_vmt(MATERIALS_DIR, NEW_PATH, log_widget):
 
 
 
-                    return m.group(0)
 
 
 
 
 
+        folder_layout = QHBoxLayout()
 
 
 
@@ -3185,12 +3976,12 @@ def replace_paths_in_vmt(MATERIALS_DIR, NEW_PATH, log_widget):
 
 
 
-                def repl_any_auto(m):
 
 
 
 
 
+        self.folder_entry = QLineEdit()
 
 
 
@@ -3201,12 +3992,12 @@ def replace_paths_in_vmt(MATERIALS_DIR, NEW_PATH, log_widget):
 
 
 
-                    quote, pathval = m.group(1), m.group(2).replace('\\','/')
 
 
 
 
 
+        self.folder_entry.setPlaceholderText("Ex: C:/Jeu/materials")
 
 
 
@@ -3217,12 +4008,33 @@ def replace_paths_in_vmt(MATERIALS_DIR, NEW_PATH, log_widget):
 
 
 
-                    parts = pathval.split('/')
 
 
 
 
 
+        browse_btn = QPushButton("📁 Parcourir")
+        browse_btn.setStyleSheet("""
+            QPushButton {
+                background: qlineargradient(x1: 0, y1: 0, x2: 0, y2: 1,
+                    stop: 0 #00D4FF, stop: 1 #0099CC);
+                color: #000000;
+                font-weight: 600;
+                border: none;
+                border-radius: 12px;
+                padding: 12px 20px;
+                font-size: 13px;
+                min-width: 120px;
+            }
+            QPushButton:hover {
+                background: qlineargradient(x1: 0, y1: 0, x2: 0, y2: 1,
+                    stop: 0 #1AE5FF, stop: 1 #00B8E6);
+            }
+            QPushButton:pressed {
+                background: qlineargradient(x1: 0, y1: 0, x2: 0, y2: 1,
+                    stop: 0 #0099CC, stop: 1 #007399);
+            }
+        """)
 
 
 
@@ -3233,12 +4045,12 @@ def replace_paths_in_vmt(MATERIALS_DIR, NEW_PATH, log_widget):
 
 
 
-                    if len(parts) > 1:
 
 
 
 
 
+        browse_btn.clicked.connect(self.browse_folder)
 
 
 
@@ -3249,12 +4061,12 @@ def replace_paths_in_vmt(MATERIALS_DIR, NEW_PATH, log_widget):
 
 
 
-                        newpath = NEW_PATH + '/' + parts[-1]
 
 
 
 
 
+        folder_layout.addWidget(self.folder_entry)
 
 
 
@@ -3265,12 +4077,12 @@ def replace_paths_in_vmt(MATERIALS_DIR, NEW_PATH, log_widget):
 
 
 
-                        file_changes.append(("<any>", pathval, newpath))
 
 
 
 
 
+        folder_layout.addWidget(browse_btn)
 
 
 
@@ -3281,12 +4093,12 @@ def replace_paths_in_vmt(MATERIALS_DIR, NEW_PATH, log_widget):
 
 
 
-                        return quote + newpath + quote
 
 
 
 
 
+        folder_group.setLayout(folder_layout)
 
 
 
@@ -3297,12 +4109,12 @@ def replace_paths_in_vmt(MATERIALS_DIR, NEW_PATH, log_widget):
 
 
 
-                    return m.group(0)
 
 
 
 
 
+        layout.addWidget(folder_group)
 
 
 
@@ -3313,7 +4125,6 @@ def replace_paths_in_vmt(MATERIALS_DIR, NEW_PATH, log_widget):
 
 
 
-                line_mod = key_pattern.sub(repl_auto, line)
 
 
 
@@ -3329,13 +4140,13 @@ def replace_paths_in_vmt(MATERIALS_DIR, NEW_PATH, log_widget):
 
 
 
-                line_mod = any_quoted.sub(repl_any_auto, line_mod)
 
 
 
 
 
 
+        # Nouveau chemin
 
 
 
@@ -3345,13 +4156,13 @@ def replace_paths_in_vmt(MATERIALS_DIR, NEW_PATH, log_widget):
 
 
 
-                new_lines.append(line_mod)
 
 
 
 
 
 
+        path_group = QGroupBox("Nouveau chemin")
 
 
 
@@ -3361,13 +4172,13 @@ def replace_paths_in_vmt(MATERIALS_DIR, NEW_PATH, log_widget):
 
 
 
-            if file_changes:
 
 
 
 
 
 
+        path_layout = QHBoxLayout()
 
 
 
@@ -3377,13 +4188,13 @@ def replace_paths_in_vmt(MATERIALS_DIR, NEW_PATH, log_widget):
 
 
 
-                modified_vmt_files.append((fullpath, new_lines, enc, file_changes))
 
 
 
 
 
 
+        self.path_entry = QLineEdit()
 
 
 
@@ -3393,13 +4204,13 @@ def replace_paths_in_vmt(MATERIALS_DIR, NEW_PATH, log_widget):
 
 
 
-    return vmt_dirs, modified_vmt_files
 
 
 
 
 
 
+        self.path_entry.setPlaceholderText("Ex: models/nrxa/mayd3")
 
 
 
@@ -3415,6 +4226,7 @@ def replace_paths_in_vmt(MATERIALS_DIR, NEW_PATH, log_widget):
 
 
 
+        path_layout.addWidget(self.path_entry)
 
 
 
@@ -3425,12 +4237,12 @@ def replace_paths_in_vmt(MATERIALS_DIR, NEW_PATH, log_widget):
 
 
 
-def apply_vmt_changes(modified_vmt_files, log_widget):
 
 
 
 
 
+        path_group.setLayout(path_layout)
 
 
 
@@ -3441,12 +4253,12 @@ def apply_vmt_changes(modified_vmt_files, log_widget):
 
 
 
-    for fullpath, new_lines, enc, _ in modified_vmt_files:
 
 
 
 
 
+        layout.addWidget(path_group)
 
 
 
@@ -3457,7 +4269,6 @@ def apply_vmt_changes(modified_vmt_files, log_widget):
 
 
 
-        try:
 
 
 
@@ -3473,13 +4284,13 @@ def apply_vmt_changes(modified_vmt_files, log_widget):
 
 
 
-            with open(fullpath, "w", encoding=enc) as f:
 
 
 
 
 
 
+        # Préfixe/Suffixe
 
 
 
@@ -3489,13 +4300,13 @@ def apply_vmt_changes(modified_vmt_files, log_widget):
 
 
 
-                f.write(''.join(new_lines))
 
 
 
 
 
 
+        prefix_group = QGroupBox("Préfixe/Suffixe (optionnel)")
 
 
 
@@ -3505,13 +4316,13 @@ def apply_vmt_changes(modified_vmt_files, log_widget):
 
 
 
-            log_widget.append(f"[MODIFIÉ] {fullpath}")
 
 
 
 
 
 
+        prefix_layout = QHBoxLayout()
 
 
 
@@ -3521,13 +4332,13 @@ def apply_vmt_changes(modified_vmt_files, log_widget):
 
 
 
-        except Exception as e:
 
 
 
 
 
 
+        self.prefix_entry = QLineEdit()
 
 
 
@@ -3537,13 +4348,13 @@ def apply_vmt_changes(modified_vmt_files, log_widget):
 
 
 
-            log_widget.append(f"[ERREUR ÉCRITURE] {fullpath} -> {e}")
 
 
 
 
 
 
+        self.prefix_entry.setPlaceholderText("Ex: nrxa_ ou _new")
 
 
 
@@ -3559,6 +4370,7 @@ def apply_vmt_changes(modified_vmt_files, log_widget):
 
 
 
+        prefix_layout.addWidget(self.prefix_entry)
 
 
 
@@ -3569,12 +4381,12 @@ def apply_vmt_changes(modified_vmt_files, log_widget):
 
 
 
-def apply_dirs_changes(dirs_to_rename, log_widget, prefix_suffix=""):
 
 
 
 
 
+        prefix_group.setLayout(prefix_layout)
 
 
 
@@ -3585,12 +4397,12 @@ def apply_dirs_changes(dirs_to_rename, log_widget, prefix_suffix=""):
 
 
 
-    for old, new in dirs_to_rename:
 
 
 
 
 
+        layout.addWidget(prefix_group)
 
 
 
@@ -3601,7 +4413,6 @@ def apply_dirs_changes(dirs_to_rename, log_widget, prefix_suffix=""):
 
 
 
-        base_name = os.path.basename(new)
 
 
 
@@ -3617,13 +4428,13 @@ def apply_dirs_changes(dirs_to_rename, log_widget, prefix_suffix=""):
 
 
 
-        parent_dir = os.path.dirname(new)
 
 
 
 
 
 
+        # Actions
 
 
 
@@ -3633,13 +4444,13 @@ def apply_dirs_changes(dirs_to_rename, log_widget, prefix_suffix=""):
 
 
 
-        new_name = os.path.join(parent_dir, f"{prefix_suffix}{base_name}")
 
 
 
 
 
 
+        action_group = QGroupBox("Actions")
 
 
 
@@ -3649,13 +4460,13 @@ def apply_dirs_changes(dirs_to_rename, log_widget, prefix_suffix=""):
 
 
 
-        try:
 
 
 
 
 
 
+        action_layout = QVBoxLayout()
 
 
 
@@ -3663,14 +4474,15 @@ def apply_dirs_changes(dirs_to_rename, log_widget, prefix_suffix=""):
 
 
 
+        
 
 
-            os.makedirs(os.path.dirname(new_name), exist_ok=True)
 
 
 
 
 
+        # Première ligne d'actions
 
 
 
@@ -3678,10 +4490,10 @@ def apply_dirs_changes(dirs_to_rename, log_widget, prefix_suffix=""):
 
 
 
+        action_layout1 = QHBoxLayout()
 
 
 
-            if os.path.exists(new_name):
 
 
 
@@ -3694,10 +4506,31 @@ def apply_dirs_changes(dirs_to_rename, log_widget, prefix_suffix=""):
 
 
 
+        self.run_vmt_btn = QPushButton("🔄 Modifier chemins VMT")
+        self.run_vmt_btn.setStyleSheet("""
+            QPushButton {
+                background: qlineargradient(x1: 0, y1: 0, x2: 0, y2: 1,
+                    stop: 0 #00D4FF, stop: 1 #0099CC);
+                color: #000000;
+                font-weight: 600;
+                border: none;
+                border-radius: 12px;
+                padding: 12px 20px;
+                font-size: 13px;
+                min-width: 160px;
+            }
+            QPushButton:hover {
+                background: qlineargradient(x1: 0, y1: 0, x2: 0, y2: 1,
+                    stop: 0 #1AE5FF, stop: 1 #00B8E6);
+            }
+            QPushButton:pressed {
+                background: qlineargradient(x1: 0, y1: 0, x2: 0, y2: 1,
+                    stop: 0 #0099CC, stop: 1 #007399);
+            }
+        """)
 
 
 
-                for name in os.listdir(old):
 
 
 
@@ -3710,10 +4543,31 @@ def apply_dirs_changes(dirs_to_rename, log_widget, prefix_suffix=""):
 
 
 
+        self.run_rename_btn = QPushButton("📦 Renommer dossiers")
+        self.run_rename_btn.setStyleSheet("""
+            QPushButton {
+                background: qlineargradient(x1: 0, y1: 0, x2: 0, y2: 1,
+                    stop: 0 #9933CC, stop: 1 #7A29A3);
+                color: #FFFFFF;
+                font-weight: 600;
+                border: none;
+                border-radius: 12px;
+                padding: 12px 20px;
+                font-size: 13px;
+                min-width: 160px;
+            }
+            QPushButton:hover {
+                background: qlineargradient(x1: 0, y1: 0, x2: 0, y2: 1,
+                    stop: 0 #BB44FF, stop: 1 #9933CC);
+            }
+            QPushButton:pressed {
+                background: qlineargradient(x1: 0, y1: 0, x2: 0, y2: 1,
+                    stop: 0 #7A29A3, stop: 1 #5C1F7A);
+            }
+        """)
 
 
 
-                    src = os.path.join(old, name)
 
 
 
@@ -3726,10 +4580,31 @@ def apply_dirs_changes(dirs_to_rename, log_widget, prefix_suffix=""):
 
 
 
+        self.scan_btn = QPushButton("🔍 Scanner dossiers")
+        self.scan_btn.setStyleSheet("""
+            QPushButton {
+                background: qlineargradient(x1: 0, y1: 0, x2: 0, y2: 1,
+                    stop: 0 #00FF88, stop: 1 #00CC6A);
+                color: #000000;
+                font-weight: 600;
+                border: none;
+                border-radius: 12px;
+                padding: 12px 20px;
+                font-size: 13px;
+                min-width: 160px;
+            }
+            QPushButton:hover {
+                background: qlineargradient(x1: 0, y1: 0, x2: 0, y2: 1,
+                    stop: 0 #1AFF99, stop: 1 #00E675);
+            }
+            QPushButton:pressed {
+                background: qlineargradient(x1: 0, y1: 0, x2: 0, y2: 1,
+                    stop: 0 #00CC6A, stop: 1 #00B35C);
+            }
+        """)
 
 
 
-                    dst = os.path.join(new_name, name)
 
 
 
@@ -3742,10 +4617,31 @@ def apply_dirs_changes(dirs_to_rename, log_widget, prefix_suffix=""):
 
 
 
+        self.reset_btn = QPushButton("♻️ Reset")
+        self.reset_btn.setStyleSheet("""
+            QPushButton {
+                background: qlineargradient(x1: 0, y1: 0, x2: 0, y2: 1,
+                    stop: 0 #FF6600, stop: 1 #CC5200);
+                color: #FFFFFF;
+                font-weight: 600;
+                border: none;
+                border-radius: 12px;
+                padding: 12px 20px;
+                font-size: 13px;
+                min-width: 160px;
+            }
+            QPushButton:hover {
+                background: qlineargradient(x1: 0, y1: 0, x2: 0, y2: 1,
+                    stop: 0 #FF8800, stop: 1 #E65C00);
+            }
+            QPushButton:pressed {
+                background: qlineargradient(x1: 0, y1: 0, x2: 0, y2: 1,
+                    stop: 0 #CC5200, stop: 1 #994000);
+            }
+        """)
 
 
 
-                    shutil.move(src, dst)
 
 
 
@@ -3758,10 +4654,10 @@ def apply_dirs_changes(dirs_to_rename, log_widget, prefix_suffix=""):
 
 
 
+        for btn, func in [(self.run_vmt_btn, self.run_vmt), (self.run_rename_btn, self.run_rename),
 
 
 
-                try:
 
 
 
@@ -3774,10 +4670,10 @@ def apply_dirs_changes(dirs_to_rename, log_widget, prefix_suffix=""):
 
 
 
+                          (self.scan_btn, self.scan_vmt_dirs), (self.reset_btn, self.reset_fields)]:
 
 
 
-                    os.rmdir(old)
 
 
 
@@ -3790,10 +4686,10 @@ def apply_dirs_changes(dirs_to_rename, log_widget, prefix_suffix=""):
 
 
 
+            btn.clicked.connect(func)
 
 
 
-                except OSError:
 
 
 
@@ -3806,14 +4702,15 @@ def apply_dirs_changes(dirs_to_rename, log_widget, prefix_suffix=""):
 
 
 
+            action_layout1.addWidget(btn)
 
 
 
-                    pass
 
 
 
 
+        
 
 
 
@@ -3821,14 +4718,15 @@ def apply_dirs_changes(dirs_to_rename, log_widget, prefix_suffix=""):
 
 
 
+        # Deuxième ligne d'actions
 
 
 
 
-                log_widget.append(f"[DOSSIER FUSIONNÉ] {old} -> {new_name}")
 
 
 
+        action_layout2 = QHBoxLayout()
 
 
 
@@ -3841,215 +4739,29 @@ def apply_dirs_changes(dirs_to_rename, log_widget, prefix_suffix=""):
 
 
 
-            else:
 
 
 
-
-
-
-
-
-
-
-
-
-
-
-
-                shutil.move(old, new_name)
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-                log_widget.append(f"[DOSSIER RENOMMÉ] {old} -> {new_name}")
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-        except Exception as e:
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-            log_widget.append(f"[ERREUR RENOMMAGE] {old} -> {new_name} : {e}")
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-# ------------------ Interface principale ------------------
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-class VMTPathRenamer(QWidget):
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-    def __init__(self):
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-        super().__init__()
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-        self.setWindowTitle("SAK VMT RENAME ETC ")
-        
-        # Style futuriste pour la fenêtre principale
-        self.setStyleSheet("""
-            QWidget {
-                background: qlineargradient(x1: 0, y1: 0, x2: 0, y2: 1,
-                    stop: 0 #0A0A0A, stop: 1 #1A1A1A);
-                color: #FFFFFF;
-                font-family: 'Inter', 'Segoe UI', Arial, sans-serif;
-            }
-            QLabel {
-                color: #FFFFFF;
-                font-weight: 500;
-            }
-            QLineEdit {
+        self.apply_move_btn = QPushButton("✅ Déplacer VMT/VTF")
+        self.apply_move_btn.setStyleSheet("""
+            QPushButton {
                 background: qlineargradient(x1: 0, y1: 0, x2: 0, y2: 1,
-                    stop: 0 #1E1E1E, stop: 1 #2A2A2A);
-                color: #FFFFFF;
-                border: 2px solid #333333;
+                    stop: 0 #00FF88, stop: 1 #00CC6A);
+                color: #000000;
+                font-weight: 600;
+                border: none;
                 border-radius: 12px;
-                padding: 12px 16px;
+                padding: 12px 20px;
                 font-size: 13px;
+                min-width: 160px;
             }
-            QLineEdit:focus {
-                border: 2px solid #00D4FF;
-            }
-            QTextEdit {
+            QPushButton:hover {
                 background: qlineargradient(x1: 0, y1: 0, x2: 0, y2: 1,
-                    stop: 0 #1E1E1E, stop: 1 #2A2A2A);
-                color: #FFFFFF;
-                border: 2px solid #333333;
-                border-radius: 12px;
-                padding: 8px;
-            }
-            QGroupBox {
-                font-weight: 600;
-                font-size: 14px;
-                color: #00D4FF;
-                border: 2px solid #333333;
-                border-radius: 12px;
-                margin-top: 10px;
-                padding-top: 15px;
+                    stop: 0 #1AFF99, stop: 1 #00E675);
             }
-            QGroupBox::title {
-                subcontrol-origin: margin;
-                left: 15px;
-                padding: 0 8px 0 8px;
-                color: #00D4FF;
-                background: #1A1A1A;
+            QPushButton:pressed {
+                background: qlineargradient(x1: 0, y1: 0, x2: 0, y2: 1,
+                    stop: 0 #00CC6A, stop: 1 #00B35C);
             }
         """)
 
@@ -4059,2618 +4771,7 @@ class VMTPathRenamer(QWidget):
 
 
 
-
-
-
-
-
-
-
-
-        self.setGeometry(100, 100, 1100, 900)
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-        self.init_ui()
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-        self.manual_check_update()
-
-
-
-
-
-
-
-        
-
-
-
-
-
-
-
-        # Timer pour vérification automatique toutes les 15 minutes
-
-
-
-
-
-
-
-        self.update_timer = QTimer()
-
-
-
-
-
-
-
-        self.update_timer.timeout.connect(self.auto_check_update)
-
-
-
-
-        self.update_timer.start(15 * 60 * 1000)  # 15 minutes en millisecondes
-    
-    def auto_check_update(self):
-        """Vérification automatique silencieuse des mises à jour"""
-        try:
-            latest_version, up_to_date, error_msg = check_update(silent=True)
-            
-            if latest_version != "Erreur" and not up_to_date:
-                # Mise à jour disponible - notifier discrètement
-                self.update_label.setText(f"🔔 Nouvelle version disponible ({latest_version})")
-                self.update_btn.setEnabled(True)
-                self.log_widget.append(f"🔔 Mise à jour automatique détectée: {latest_version}")
-            elif up_to_date:
-                # Application à jour
-                self.update_label.setText(f"✅ Application à jour ({VERSION})")
-                self.update_btn.setEnabled(False)
-            # En cas d'erreur, ne rien faire (vérification silencieuse)
-            
-        except Exception as e:
-            # Erreur silencieuse - ne pas déranger l'utilisateur
-            print(f"[DEBUG] Erreur vérification automatique: {e}")
-            pass
-
-
-
-    def init_ui(self):
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-        layout = QVBoxLayout()
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-        # Version label + update buttons
-
-
-
-
-
-
-
-        update_layout = QHBoxLayout()
-
-
-
-
-
-
-
-        self.update_label = QLabel("🔄 Vérification mise à jour...")
-        self.update_label.setStyleSheet("color: #00D4FF; font-weight: 600; font-size: 14px;")
-
-
-
-
-
-
-
-        self.check_update_btn = QPushButton("🔄 Vérifier")
-        self.check_update_btn.setStyleSheet("""
-            QPushButton {
-                background: qlineargradient(x1: 0, y1: 0, x2: 0, y2: 1,
-                    stop: 0 #00D4FF, stop: 1 #0099CC);
-                color: #000000;
-                font-weight: 600;
-                border: none;
-                border-radius: 12px;
-                padding: 12px 20px;
-                font-size: 13px;
-                min-width: 120px;
-            }
-            QPushButton:hover {
-                background: qlineargradient(x1: 0, y1: 0, x2: 0, y2: 1,
-                    stop: 0 #1AE5FF, stop: 1 #00B8E6);
-            }
-            QPushButton:pressed {
-                background: qlineargradient(x1: 0, y1: 0, x2: 0, y2: 1,
-                    stop: 0 #0099CC, stop: 1 #007399);
-            }
-        """)
-
-
-
-
-
-
-
-        self.check_update_btn.clicked.connect(self.manual_check_update)
-
-
-
-
-
-
-
-        self.debug_btn = QPushButton("🐛 Debug GitHub")
-        self.debug_btn.setStyleSheet("""
-            QPushButton {
-                background: qlineargradient(x1: 0, y1: 0, x2: 0, y2: 1,
-                    stop: 0 #9933CC, stop: 1 #7A29A3);
-                color: #FFFFFF;
-                font-weight: 600;
-                border: none;
-                border-radius: 12px;
-                padding: 12px 20px;
-                font-size: 13px;
-                min-width: 120px;
-            }
-            QPushButton:hover {
-                background: qlineargradient(x1: 0, y1: 0, x2: 0, y2: 1,
-                    stop: 0 #BB44FF, stop: 1 #9933CC);
-            }
-            QPushButton:pressed {
-                background: qlineargradient(x1: 0, y1: 0, x2: 0, y2: 1,
-                    stop: 0 #7A29A3, stop: 1 #5C1F7A);
-            }
-        """)
-
-
-
-
-
-
-
-        self.debug_btn.clicked.connect(self.debug_github)
-
-
-
-
-
-
-
-        self.test_local_btn = QPushButton("🧪 Test Local")
-        self.test_local_btn.setStyleSheet("""
-            QPushButton {
-                background: qlineargradient(x1: 0, y1: 0, x2: 0, y2: 1,
-                    stop: 0 #FF6600, stop: 1 #CC5200);
-                color: #FFFFFF;
-                font-weight: 600;
-                border: none;
-                border-radius: 12px;
-                padding: 12px 20px;
-                font-size: 13px;
-                min-width: 120px;
-            }
-            QPushButton:hover {
-                background: qlineargradient(x1: 0, y1: 0, x2: 0, y2: 1,
-                    stop: 0 #FF8800, stop: 1 #E65C00);
-            }
-            QPushButton:pressed {
-                background: qlineargradient(x1: 0, y1: 0, x2: 0, y2: 1,
-                    stop: 0 #CC5200, stop: 1 #994000);
-            }
-        """)
-
-
-
-
-
-
-
-        self.test_local_btn.clicked.connect(self.test_local_version)
-
-
-
-
-
-
-
-        self.force_check_btn = QPushButton("⚡ Force Check")
-        self.force_check_btn.setStyleSheet("""
-            QPushButton {
-                background: qlineargradient(x1: 0, y1: 0, x2: 0, y2: 1,
-                    stop: 0 #FFFF00, stop: 1 #CCCC00);
-                color: #000000;
-                font-weight: 600;
-                border: none;
-                border-radius: 12px;
-                padding: 12px 20px;
-                font-size: 13px;
-                min-width: 120px;
-            }
-            QPushButton:hover {
-                background: qlineargradient(x1: 0, y1: 0, x2: 0, y2: 1,
-                    stop: 0 #FFFF33, stop: 1 #E6E600);
-            }
-            QPushButton:pressed {
-                background: qlineargradient(x1: 0, y1: 0, x2: 0, y2: 1,
-                    stop: 0 #CCCC00, stop: 1 #999900);
-            }
-        """)
-
-
-
-
-
-
-
-        self.force_check_btn.clicked.connect(self.force_check_update)
-
-
-
-
-
-
-
-        self.ultra_check_btn = QPushButton("🚀 Ultra Check")
-        self.ultra_check_btn.setStyleSheet("""
-            QPushButton {
-                background: qlineargradient(x1: 0, y1: 0, x2: 0, y2: 1,
-                    stop: 0 #00FF88, stop: 1 #00CC6A);
-                color: #000000;
-                font-weight: 600;
-                border: none;
-                border-radius: 12px;
-                padding: 12px 20px;
-                font-size: 13px;
-                min-width: 120px;
-            }
-            QPushButton:hover {
-                background: qlineargradient(x1: 0, y1: 0, x2: 0, y2: 1,
-                    stop: 0 #1AFF99, stop: 1 #00E675);
-            }
-            QPushButton:pressed {
-                background: qlineargradient(x1: 0, y1: 0, x2: 0, y2: 1,
-                    stop: 0 #00CC6A, stop: 1 #00B35C);
-            }
-        """)
-
-
-
-
-
-
-
-        self.ultra_check_btn.clicked.connect(self.ultra_check_update)
-
-
-
-
-
-
-
-        self.connection_test_btn = QPushButton("🌐 Test Connexion")
-        self.connection_test_btn.setStyleSheet("""
-            QPushButton {
-                background: qlineargradient(x1: 0, y1: 0, x2: 0, y2: 1,
-                    stop: 0 #00CCFF, stop: 1 #0099CC);
-                color: #000000;
-                font-weight: 600;
-                border: none;
-                border-radius: 12px;
-                padding: 12px 20px;
-                font-size: 13px;
-                min-width: 120px;
-            }
-            QPushButton:hover {
-                background: qlineargradient(x1: 0, y1: 0, x2: 0, y2: 1,
-                    stop: 0 #33D6FF, stop: 1 #00B8E6);
-            }
-            QPushButton:pressed {
-                background: qlineargradient(x1: 0, y1: 0, x2: 0, y2: 1,
-                    stop: 0 #0099CC, stop: 1 #007399);
-            }
-        """)
-
-
-
-
-
-
-
-        self.connection_test_btn.clicked.connect(self.test_connection)
-
-
-
-
-
-
-
-        self.update_btn = QPushButton("⬇️ Télécharger mise à jour")
-        self.update_btn.setStyleSheet("""
-            QPushButton {
-                background: qlineargradient(x1: 0, y1: 0, x2: 0, y2: 1,
-                    stop: 0 #FF4757, stop: 1 #CC3A47);
-                color: #FFFFFF;
-                font-weight: 600;
-                border: none;
-                border-radius: 12px;
-                padding: 12px 20px;
-                font-size: 13px;
-                min-width: 120px;
-            }
-            QPushButton:hover {
-                background: qlineargradient(x1: 0, y1: 0, x2: 0, y2: 1,
-                    stop: 0 #FF5A6B, stop: 1 #E6434F);
-            }
-            QPushButton:pressed {
-                background: qlineargradient(x1: 0, y1: 0, x2: 0, y2: 1,
-                    stop: 0 #CC3A47, stop: 1 #B32D3A);
-            }
-            QPushButton:disabled {
-                background: qlineargradient(x1: 0, y1: 0, x2: 0, y2: 1,
-                    stop: 0 #333333, stop: 1 #2A2A2A);
-                color: #707070;
-            }
-        """)
-
-
-
-
-
-
-
-        self.update_btn.setEnabled(False)
-
-
-
-
-
-
-
-        self.update_btn.clicked.connect(self.download_update)
-
-
-
-
-
-
-
-        update_layout.addWidget(self.update_label)
-
-
-
-
-
-
-
-        update_layout.addWidget(self.check_update_btn)
-
-
-
-
-
-
-
-        update_layout.addWidget(self.debug_btn)
-
-
-
-
-
-
-
-        update_layout.addWidget(self.test_local_btn)
-
-
-
-
-
-
-
-        update_layout.addWidget(self.force_check_btn)
-
-
-
-
-
-
-
-        update_layout.addWidget(self.ultra_check_btn)
-
-
-
-
-
-
-
-        update_layout.addWidget(self.connection_test_btn)
-
-
-
-
-
-
-
-        update_layout.addWidget(self.update_btn)
-
-
-
-
-
-
-
-        layout.addLayout(update_layout)
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-        def styled_button(text):
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-            btn = QPushButton(text)
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-            btn.setCursor(Qt.PointingHandCursor)
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-            btn.setStyleSheet("""
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-                QPushButton {
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-            background: qlineargradient(x1: 0, y1: 0, x2: 0, y2: 1,
-                stop: 0 #00D4FF, stop: 1 #0099CC);
-            color: #000000;
-            font-weight: 600;
-            border: none;
-            border-radius: 12px;
-            padding: 12px 20px;
-            font-size: 13px;
-            min-width: 120px;
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-        }
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-        QPushButton:hover {
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-            background-color: #FF3333;
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-        }
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-            """)
-            return btn
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-        # Dossier
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-        folder_group = QGroupBox("Dossier à scanner")
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-        folder_layout = QHBoxLayout()
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-        self.folder_entry = QLineEdit()
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-        self.folder_entry.setPlaceholderText("Ex: C:/Jeu/materials")
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-        browse_btn = QPushButton("📁 Parcourir")
-        browse_btn.setStyleSheet("""
-            QPushButton {
-                background: qlineargradient(x1: 0, y1: 0, x2: 0, y2: 1,
-                    stop: 0 #00D4FF, stop: 1 #0099CC);
-                color: #000000;
-                font-weight: 600;
-                border: none;
-                border-radius: 12px;
-                padding: 12px 20px;
-                font-size: 13px;
-                min-width: 120px;
-            }
-            QPushButton:hover {
-                background: qlineargradient(x1: 0, y1: 0, x2: 0, y2: 1,
-                    stop: 0 #1AE5FF, stop: 1 #00B8E6);
-            }
-            QPushButton:pressed {
-                background: qlineargradient(x1: 0, y1: 0, x2: 0, y2: 1,
-                    stop: 0 #0099CC, stop: 1 #007399);
-            }
-        """)
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-        browse_btn.clicked.connect(self.browse_folder)
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-        folder_layout.addWidget(self.folder_entry)
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-        folder_layout.addWidget(browse_btn)
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-        folder_group.setLayout(folder_layout)
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-        layout.addWidget(folder_group)
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-        # Nouveau chemin
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-        path_group = QGroupBox("Nouveau chemin")
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-        path_layout = QHBoxLayout()
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-        self.path_entry = QLineEdit()
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-        self.path_entry.setPlaceholderText("Ex: models/nrxa/mayd3")
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-        path_layout.addWidget(self.path_entry)
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-        path_group.setLayout(path_layout)
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-        layout.addWidget(path_group)
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-        # Préfixe/Suffixe
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-        prefix_group = QGroupBox("Préfixe/Suffixe (optionnel)")
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-        prefix_layout = QHBoxLayout()
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-        self.prefix_entry = QLineEdit()
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-        self.prefix_entry.setPlaceholderText("Ex: nrxa_ ou _new")
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-        prefix_layout.addWidget(self.prefix_entry)
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-        prefix_group.setLayout(prefix_layout)
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-        layout.addWidget(prefix_group)
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-        # Actions
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-        action_group = QGroupBox("Actions")
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-        action_layout = QVBoxLayout()
-
-
-
-
-
-
-
-        
-
-
-
-
-
-
-
-        # Première ligne d'actions
-
-
-
-
-
-
-
-        action_layout1 = QHBoxLayout()
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-        self.run_vmt_btn = QPushButton("🔄 Modifier chemins VMT")
-        self.run_vmt_btn.setStyleSheet("""
-            QPushButton {
-                background: qlineargradient(x1: 0, y1: 0, x2: 0, y2: 1,
-                    stop: 0 #00D4FF, stop: 1 #0099CC);
-                color: #000000;
-                font-weight: 600;
-                border: none;
-                border-radius: 12px;
-                padding: 12px 20px;
-                font-size: 13px;
-                min-width: 160px;
-            }
-            QPushButton:hover {
-                background: qlineargradient(x1: 0, y1: 0, x2: 0, y2: 1,
-                    stop: 0 #1AE5FF, stop: 1 #00B8E6);
-            }
-            QPushButton:pressed {
-                background: qlineargradient(x1: 0, y1: 0, x2: 0, y2: 1,
-                    stop: 0 #0099CC, stop: 1 #007399);
-            }
-        """)
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-        self.run_rename_btn = QPushButton("📦 Renommer dossiers")
-        self.run_rename_btn.setStyleSheet("""
-            QPushButton {
-                background: qlineargradient(x1: 0, y1: 0, x2: 0, y2: 1,
-                    stop: 0 #9933CC, stop: 1 #7A29A3);
-                color: #FFFFFF;
-                font-weight: 600;
-                border: none;
-                border-radius: 12px;
-                padding: 12px 20px;
-                font-size: 13px;
-                min-width: 160px;
-            }
-            QPushButton:hover {
-                background: qlineargradient(x1: 0, y1: 0, x2: 0, y2: 1,
-                    stop: 0 #BB44FF, stop: 1 #9933CC);
-            }
-            QPushButton:pressed {
-                background: qlineargradient(x1: 0, y1: 0, x2: 0, y2: 1,
-                    stop: 0 #7A29A3, stop: 1 #5C1F7A);
-            }
-        """)
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-        self.scan_btn = QPushButton("🔍 Scanner dossiers")
-        self.scan_btn.setStyleSheet("""
-            QPushButton {
-                background: qlineargradient(x1: 0, y1: 0, x2: 0, y2: 1,
-                    stop: 0 #00FF88, stop: 1 #00CC6A);
-                color: #000000;
-                font-weight: 600;
-                border: none;
-                border-radius: 12px;
-                padding: 12px 20px;
-                font-size: 13px;
-                min-width: 160px;
-            }
-            QPushButton:hover {
-                background: qlineargradient(x1: 0, y1: 0, x2: 0, y2: 1,
-                    stop: 0 #1AFF99, stop: 1 #00E675);
-            }
-            QPushButton:pressed {
-                background: qlineargradient(x1: 0, y1: 0, x2: 0, y2: 1,
-                    stop: 0 #00CC6A, stop: 1 #00B35C);
-            }
-        """)
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-        self.reset_btn = QPushButton("♻️ Reset")
-        self.reset_btn.setStyleSheet("""
-            QPushButton {
-                background: qlineargradient(x1: 0, y1: 0, x2: 0, y2: 1,
-                    stop: 0 #FF6600, stop: 1 #CC5200);
-                color: #FFFFFF;
-                font-weight: 600;
-                border: none;
-                border-radius: 12px;
-                padding: 12px 20px;
-                font-size: 13px;
-                min-width: 160px;
-            }
-            QPushButton:hover {
-                background: qlineargradient(x1: 0, y1: 0, x2: 0, y2: 1,
-                    stop: 0 #FF8800, stop: 1 #E65C00);
-            }
-            QPushButton:pressed {
-                background: qlineargradient(x1: 0, y1: 0, x2: 0, y2: 1,
-                    stop: 0 #CC5200, stop: 1 #994000);
-            }
-        """)
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-        for btn, func in [(self.run_vmt_btn, self.run_vmt), (self.run_rename_btn, self.run_rename),
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-                          (self.scan_btn, self.scan_vmt_dirs), (self.reset_btn, self.reset_fields)]:
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-            btn.clicked.connect(func)
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-            action_layout1.addWidget(btn)
-
-
-
-
-
-
-
-        
-
-
-
-
-
-
-
-        # Deuxième ligne d'actions
-
-
-
-
-
-
-
-        action_layout2 = QHBoxLayout()
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-        self.apply_move_btn = QPushButton("✅ Déplacer VMT/VTF")
-        self.apply_move_btn.setStyleSheet("""
-            QPushButton {
-                background: qlineargradient(x1: 0, y1: 0, x2: 0, y2: 1,
-                    stop: 0 #00FF88, stop: 1 #00CC6A);
-                color: #000000;
-                font-weight: 600;
-                border: none;
-                border-radius: 12px;
-                padding: 12px 20px;
-                font-size: 13px;
-                min-width: 160px;
-            }
-            QPushButton:hover {
-                background: qlineargradient(x1: 0, y1: 0, x2: 0, y2: 1,
-                    stop: 0 #1AFF99, stop: 1 #00E675);
-            }
-            QPushButton:pressed {
-                background: qlineargradient(x1: 0, y1: 0, x2: 0, y2: 1,
-                    stop: 0 #00CC6A, stop: 1 #00B35C);
-            }
-        """)
-
-
-
-
-
-
-
-        
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-        for btn, func in [(self.apply_move_btn, self.apply_move_vmt_vtf),
-
-
-
-
-
-
-
-                          ]:
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-            btn.clicked.connect(func)
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-            action_layout2.addWidget(btn)
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-        action_layout.addLayout(action_layout1)
-
-
-
-
-
-
-
-        action_layout.addLayout(action_layout2)
-
-
-
-
-
-
-
-        action_group.setLayout(action_layout)
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-        layout.addWidget(action_group)
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-        # Logs
-
-
-
-
-
-
-
-        log_layout = QHBoxLayout()
-
-
-
-
-
-
-
-        log_layout.addWidget(QLabel("Journal d'activité"))
-
-
-
-
-
-
-
-        clear_logs_btn = QPushButton("🗑️ Effacer")
-
-
-
-
-
-
-
-        clear_logs_btn.clicked.connect(self.clear_logs)
-
-
-
-
-
-
-
-        log_layout.addWidget(clear_logs_btn)
-
-
-
-
-
-
-
-        layout.addLayout(log_layout)
-
-
-
-
-
-
-
-        
-
-
-
-
-
-
-
-        self.log_widget = QTextEdit()
-        self.log_widget.setStyleSheet("""
-            QTextEdit {
-                background: qlineargradient(x1: 0, y1: 0, x2: 0, y2: 1,
-                    stop: 0 #1E1E1E, stop: 1 #2A2A2A);
-                color: #FFFFFF;
-                border: 2px solid #333333;
-                border-radius: 12px;
-                padding: 8px;
-                font-family: 'Consolas', 'Courier New', monospace;
-                font-size: 11px;
-            }
-        """)
-
-
-
-
-
-
-
-        self.log_widget.setReadOnly(True)
-
-
-
-
-
-
-
-        layout.addWidget(self.log_widget)
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-        # Dossiers détectés
-
-
-
-
-
-
-
-        layout.addWidget(QLabel("Dossiers détectés"))
-
-
-
-
-
-
-
-        self.detected_dirs_widget = QTextEdit()
-        self.detected_dirs_widget.setStyleSheet("""
-            QTextEdit {
-                background: qlineargradient(x1: 0, y1: 0, x2: 0, y2: 1,
-                    stop: 0 #1E1E1E, stop: 1 #2A2A2A);
-                color: #FFFFFF;
-                border: 2px solid #333333;
-                border-radius: 12px;
-                padding: 8px;
-                font-family: 'Consolas', 'Courier New', monospace;
-                font-size: 11px;
-            }
-        """)
-
-
-
-
-
-
-
-        layout.addWidget(self.detected_dirs_widget)
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-        # Timer countdown en bas à gauche
-
-
-
-
-
-
-
-        countdown_layout = QHBoxLayout()
-
-
-
-
-
-
-
-        self.countdown_label = QLabel("⏱️ Prochaine vérification dans: 15:00")
-
-
-
-
-
-
-
-        self.countdown_label.setStyleSheet("color: #888888; font-size: 10px;")
-
-
-
-
-
-
-
-        countdown_layout.addWidget(self.countdown_label)
-
-
-
-
-
-
-
-        # Bouton Changelog
-
-        self.changelog_btn = QPushButton("📋 Changelog")
-
-        self.changelog_btn.clicked.connect(self.show_changelog)
-
-        self.changelog_btn.setStyleSheet("""
-
-            QPushButton {
-
-                background-color: #444;
-
-                color: white;
-
-                font-weight: bold;
-
-                padding: 5px 10px;
-
-                border-radius: 3px;
-
-                border: none;
-
-                font-size: 9px;
-
-                margin-left: 10px;
-
-            }
-
-            QPushButton:hover { background-color: #666; }
-
-        """)
-
-        countdown_layout.addWidget(self.changelog_btn)
-
-
-
-        countdown_layout.addStretch()  # Pousse le label vers la gauche
-
-
-
-
-
-
-
-        layout.addLayout(countdown_layout)
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-        self.setLayout(layout)
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-        self.setStyleSheet("""
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-            QWidget {
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-                background-color: #111;
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-                color: #FFF;
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-                font-family: 'Segoe UI';
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-                font-size: 14px;
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-            }
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-            QGroupBox {
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-                border: 2px solid #990000;
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-                border-radius: 10px;
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-                margin-top: 12px;
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-                padding: 12px;
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-                font-weight: bold;
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-                color: #FF3333;
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-            }
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-            QLabel {
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-                color: #FF3333;
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-                font-weight: bold;
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-            }
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-            QLineEdit, QTextEdit {
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-                background-color: #222;
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-                color: #FFF;
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-                border: 1px solid #333;
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-                border-radius: 6px;
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-                padding: 6px 8px;
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-            }
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-            QTextEdit {
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-                color: #FF6666;
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-            }
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-        """)
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-    # ------------------ Fonctions ------------------
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-    def browse_folder(self):
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-        folder = QFileDialog.getExistingDirectory(self, "Choisir un dossier")
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-        if folder:
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-            self.folder_entry.setText(folder)
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-    def reset_fields(self):
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-        self.folder_entry.clear()
+        
 
 
 
@@ -6686,7 +4787,6 @@ class VMTPathRenamer(QWidget):
 
 
 
-        self.path_entry.clear()
 
 
 
@@ -6694,6 +4794,58 @@ class VMTPathRenamer(QWidget):
 
 
 
+        self.preview_vmt_btn = QPushButton("📝 Aperçu des modifications")
+        self.preview_vmt_btn.setStyleSheet("""
+            QPushButton {
+                background: qlineargradient(x1: 0, y1: 0, x2: 0, y2: 1,
+                    stop: 0 #4D7FFF, stop: 1 #3D66CC);
+                color: #FFFFFF;
+                font-weight: 600;
+                border: none;
+                border-radius: 12px;
+                padding: 12px 20px;
+                font-size: 13px;
+                min-width: 160px;
+            }
+            QPushButton:hover {
+                background: qlineargradient(x1: 0, y1: 0, x2: 0, y2: 1,
+                    stop: 0 #6690FF, stop: 1 #4D7FFF);
+            }
+            QPushButton:pressed {
+                background: qlineargradient(x1: 0, y1: 0, x2: 0, y2: 1,
+                    stop: 0 #3D66CC, stop: 1 #2E4D99);
+            }
+        """)
+        self.cancel_job_btn = QPushButton("⛔ Annuler l'opération")
+        self.cancel_job_btn.setStyleSheet("""
+            QPushButton {
+                background: qlineargradient(x1: 0, y1: 0, x2: 0, y2: 1,
+                    stop: 0 #FF3355, stop: 1 #CC2944);
+                color: #FFFFFF;
+                font-weight: 600;
+                border: none;
+                border-radius: 12px;
+                padding: 12px 20px;
+                font-size: 13px;
+                min-width: 160px;
+            }
+            QPushButton:hover {
+                background: qlineargradient(x1: 0, y1: 0, x2: 0, y2: 1,
+                    stop: 0 #FF5570, stop: 1 #E62E4D);
+            }
+            QPushButton:disabled {
+                background: #333333;
+                color: #777777;
+            }
+        """)
+        self.cancel_job_btn.setEnabled(False)
+        self.check_refs_btn = QPushButton("🧭 Vérifier les textures")
+        self.check_refs_btn.setStyleSheet(self.preview_vmt_btn.styleSheet())
+        for btn, func in [(self.apply_move_btn, self.apply_move_vmt_vtf),
+                          (self.preview_vmt_btn, self.preview_vmt),
+                          (self.check_refs_btn, self.check_vmt_references),
+                          (self.cancel_job_btn, self.cancel_job),
+                          ]:
 
 
 
@@ -6702,7 +4854,6 @@ class VMTPathRenamer(QWidget):
 
 
 
-        self.prefix_entry.clear()
 
 
 
@@ -6710,6 +4861,7 @@ class VMTPathRenamer(QWidget):
 
 
 
+            btn.clicked.connect(func)
 
 
 
@@ -6718,7 +4870,6 @@ class VMTPathRenamer(QWidget):
 
 
 
-        self.detected_dirs_widget.clear()
 
 
 
@@ -6726,7 +4877,20 @@ class VMTPathRenamer(QWidget):
 
 
 
-        self.log_widget.clear()
+            action_layout2.addWidget(btn)
+        self.move_referenced_check = QCheckBox("Déplacer seulement les VTF référencés")
+        self.move_referenced_check.setStyleSheet("QCheckBox { color: #FFFFFF; font-size: 12px; }")
+        action_layout2.addWidget(self.move_referenced_check)
+        self.patch_models_check = QCheckBox("Corriger les $cdmaterials des modèles")
+        self.patch_models_check.setStyleSheet(self.move_referenced_check.styleSheet())
+        action_layout2.addWidget(self.patch_models_check)
+        self.profile_check = QCheckBox("Écrire le profil par étape (JSON)")
+        self.profile_check.setStyleSheet(self.move_referenced_check.styleSheet())
+        action_layout2.addWidget(self.profile_check)
+        self.cprofile_check = QCheckBox("Profil détaillé (cProfile)")
+        self.cprofile_check.setStyleSheet(self.move_referenced_check.styleSheet())
+        action_layout2.addWidget(self.cprofile_check)
+        action_layout.addLayout(action_layout1)
 
 
 
@@ -6734,6 +4898,7 @@ class VMTPathRenamer(QWidget):
 
 
 
+        action_layout.addLayout(action_layout2)
 
 
 
@@ -6741,8 +4906,8 @@ class VMTPathRenamer(QWidget):
 
 
 
+        action_group.setLayout(action_layout)
 
-    def clear_logs(self):
 
 
 
@@ -6750,7 +4915,6 @@ class VMTPathRenamer(QWidget):
 
 
 
-        """Efface le journal d'activité"""
 
 
 
@@ -6758,7 +4922,13 @@ class VMTPathRenamer(QWidget):
 
 
 
-        self.log_widget.clear()
+        layout.addWidget(action_group)
+        # Progression de l'opération en arrière-plan
+        self.job_progress_label = QLabel("")
+        self.job_progress_label.setStyleSheet("color: #00D4FF; font-size: 12px;")
+        layout.addWidget(self.job_progress_label)
+        self.job_worker = None
+        self.job_result_callback = None
 
 
 
@@ -6766,7 +4936,6 @@ class VMTPathRenamer(QWidget):
 
 
 
-        self.log_widget.append("🗑️ Journal effacé")
 
 
 
@@ -6791,6 +4960,7 @@ class VMTPathRenamer(QWidget):
 
 
 
+        # Logs
 
 
 
@@ -6798,7 +4968,7 @@ class VMTPathRenamer(QWidget):
 
 
 
-    def scan_vmt_dirs(self):
+        log_layout = QHBoxLayout()
 
 
 
@@ -6806,6 +4976,7 @@ class VMTPathRenamer(QWidget):
 
 
 
+        log_layout.addWidget(QLabel("Journal d'activité"))
 
 
 
@@ -6813,14 +4984,15 @@ class VMTPathRenamer(QWidget):
 
 
 
+        clear_logs_btn = QPushButton("🗑️ Effacer")
 
-        self.detected_dirs_widget.clear()
 
 
 
 
 
 
+        clear_logs_btn.clicked.connect(self.clear_logs)
 
 
 
@@ -6828,14 +5000,15 @@ class VMTPathRenamer(QWidget):
 
 
 
+        log_layout.addWidget(clear_logs_btn)
 
 
-        MATERIALS_DIR = self.folder_entry.text().strip()
 
 
 
 
 
+        layout.addLayout(log_layout)
 
 
 
@@ -6843,14 +5016,27 @@ class VMTPathRenamer(QWidget):
 
 
 
+        
 
 
 
-        if not os.path.isdir(MATERIALS_DIR):
 
 
 
 
+        self.log_widget = LogView(os.path.join(os.path.abspath(os.path.dirname(__file__)), LOG_FILE_NAME))
+        self.log_widget.setStyleSheet("""
+            QListView {
+                background: qlineargradient(x1: 0, y1: 0, x2: 0, y2: 1,
+                    stop: 0 #1E1E1E, stop: 1 #2A2A2A);
+                color: #FFFFFF;
+                border: 2px solid #333333;
+                border-radius: 12px;
+                padding: 8px;
+                font-family: 'Consolas', 'Courier New', monospace;
+                font-size: 11px;
+            }
+        """)
 
 
 
@@ -6858,14 +5044,15 @@ class VMTPathRenamer(QWidget):
 
 
 
+        self.log_widget.setReadOnly(True)
 
 
 
 
-            QMessageBox.critical(self, "Erreur", "Le dossier spécifié n'existe pas.")
 
 
 
+        layout.addWidget(self.log_widget)
 
 
 
@@ -6878,7 +5065,6 @@ class VMTPathRenamer(QWidget):
 
 
 
-            return
 
 
 
@@ -6894,11 +5080,11 @@ class VMTPathRenamer(QWidget):
 
 
 
-        vmt_dirs = set()
 
 
 
 
+        # Dossiers détectés
 
 
 
@@ -6906,14 +5092,27 @@ class VMTPathRenamer(QWidget):
 
 
 
+        layout.addWidget(QLabel("Dossiers détectés"))
 
 
 
 
-        for root, _, files in os.walk(MATERIALS_DIR):
 
 
 
+        self.detected_dirs_widget = DetectedDirsView()
+        self.detected_dirs_widget.setStyleSheet("""
+            QTableView {
+                background: qlineargradient(x1: 0, y1: 0, x2: 0, y2: 1,
+                    stop: 0 #1E1E1E, stop: 1 #2A2A2A);
+                color: #FFFFFF;
+                border: 2px solid #333333;
+                border-radius: 12px;
+                padding: 8px;
+                font-family: 'Consolas', 'Courier New', monospace;
+                font-size: 11px;
+            }
+        """)
 
 
 
@@ -6921,12 +5120,12 @@ class VMTPathRenamer(QWidget):
 
 
 
+        layout.addWidget(self.detected_dirs_widget)
 
 
 
 
 
-            if any(fname.lower().endswith(".vmt") for fname in files):
 
 
 
@@ -6937,14 +5136,15 @@ class VMTPathRenamer(QWidget):
 
 
 
+        # Timer countdown en bas à gauche
 
 
 
 
 
-                vmt_dirs.add(root)
 
 
+        countdown_layout = QHBoxLayout()
 
 
 
@@ -6952,14 +5152,15 @@ class VMTPathRenamer(QWidget):
 
 
 
+        self.countdown_label = QLabel("⏱️ Prochaine vérification dans: 15:00")
 
 
 
 
 
 
-        for d in sorted(vmt_dirs):
 
+        self.countdown_label.setStyleSheet("color: #888888; font-size: 10px;")
 
 
 
@@ -6967,6 +5168,7 @@ class VMTPathRenamer(QWidget):
 
 
 
+        countdown_layout.addWidget(self.countdown_label)
 
 
 
@@ -6974,27 +5176,43 @@ class VMTPathRenamer(QWidget):
 
 
 
-            self.detected_dirs_widget.append(d)
+        # Bouton Changelog
 
+        self.changelog_btn = QPushButton("📋 Changelog")
 
+        self.changelog_btn.clicked.connect(self.show_changelog)
 
+        self.changelog_btn.setStyleSheet("""
 
+            QPushButton {
 
+                background-color: #444;
 
+                color: white;
 
+                font-weight: bold;
 
+                padding: 5px 10px;
 
+                border-radius: 3px;
 
+                border: none;
 
+                font-size: 9px;
 
+                margin-left: 10px;
 
+            }
 
+            QPushButton:hover { background-color: #666; }
 
-        self.log_widget.append(f"{len(vmt_dirs)} dossiers détectés et listés.")
+        """)
 
+        countdown_layout.addWidget(self.changelog_btn)
 
 
 
+        countdown_layout.addStretch()  # Pousse le label vers la gauche
 
 
 
@@ -7002,6 +5220,7 @@ class VMTPathRenamer(QWidget):
 
 
 
+        layout.addLayout(countdown_layout)
 
 
 
@@ -7017,12 +5236,12 @@ class VMTPathRenamer(QWidget):
 
 
 
+        self.setLayout(layout)
 
 
 
 
 
-    def run_vmt(self):
 
 
 
@@ -7033,12 +5252,12 @@ class VMTPathRenamer(QWidget):
 
 
 
+        self.setStyleSheet("""
 
 
 
 
 
-        self.log_widget.clear()
 
 
 
@@ -7049,12 +5268,12 @@ class VMTPathRenamer(QWidget):
 
 
 
+            QWidget {
 
 
 
 
 
-        MATERIALS_DIR = self.folder_entry.text().strip()
 
 
 
@@ -7065,12 +5284,12 @@ class VMTPathRenamer(QWidget):
 
 
 
+                background-color: #111;
 
 
 
 
 
-        NEW_PATH = self.path_entry.text().strip().replace('\\','/')
 
 
 
@@ -7081,12 +5300,12 @@ class VMTPathRenamer(QWidget):
 
 
 
+                color: #FFF;
 
 
 
 
 
-        if not os.path.isdir(MATERIALS_DIR) or not NEW_PATH:
 
 
 
@@ -7097,12 +5316,12 @@ class VMTPathRenamer(QWidget):
 
 
 
+                font-family: 'Segoe UI';
 
 
 
 
 
-            QMessageBox.critical(self, "Erreur", "Vérifiez dossier et chemin cible.")
 
 
 
@@ -7113,12 +5332,12 @@ class VMTPathRenamer(QWidget):
 
 
 
+                font-size: 14px;
 
 
 
 
 
-            return
 
 
 
@@ -7129,12 +5348,12 @@ class VMTPathRenamer(QWidget):
 
 
 
+            }
 
 
 
 
 
-        self.log_widget.append("=== Début remplacement chemins VMT ===")
 
 
 
@@ -7145,12 +5364,12 @@ class VMTPathRenamer(QWidget):
 
 
 
+            QGroupBox {
 
 
 
 
 
-        vmt_dirs, modified_vmt_files = replace_paths_in_vmt(MATERIALS_DIR, NEW_PATH, self.log_widget)
 
 
 
@@ -7161,12 +5380,12 @@ class VMTPathRenamer(QWidget):
 
 
 
+                border: 2px solid #990000;
 
 
 
 
 
-        apply_vmt_changes(modified_vmt_files, self.log_widget)
 
 
 
@@ -7177,12 +5396,12 @@ class VMTPathRenamer(QWidget):
 
 
 
+                border-radius: 10px;
 
 
 
 
 
-        self.log_widget.append("=== Remplacement terminé ===")
 
 
 
@@ -7193,6 +5412,7 @@ class VMTPathRenamer(QWidget):
 
 
 
+                margin-top: 12px;
 
 
 
@@ -7208,13 +5428,13 @@ class VMTPathRenamer(QWidget):
 
 
 
+                padding: 12px;
 
 
 
 
 
 
-    def run_rename(self):
 
 
 
@@ -7224,13 +5444,13 @@ class VMTPathRenamer(QWidget):
 
 
 
+                font-weight: bold;
 
 
 
 
 
 
-        self.log_widget.clear()
 
 
 
@@ -7240,13 +5460,13 @@ class VMTPathRenamer(QWidget):
 
 
 
+                color: #FF3333;
 
 
 
 
 
 
-        prefix_suffix = self.prefix_entry.text().strip()
 
 
 
@@ -7256,13 +5476,13 @@ class VMTPathRenamer(QWidget):
 
 
 
+            }
 
 
 
 
 
 
-        dirs_to_rename = [(line.strip(), line.strip())
 
 
 
@@ -7272,13 +5492,13 @@ class VMTPathRenamer(QWidget):
 
 
 
+            QLabel {
 
 
 
 
 
 
-                          for line in self.detected_dirs_widget.toPlainText().splitlines()
 
 
 
@@ -7288,13 +5508,13 @@ class VMTPathRenamer(QWidget):
 
 
 
+                color: #FF3333;
 
 
 
 
 
 
-                          if line.strip()]
 
 
 
@@ -7304,13 +5524,13 @@ class VMTPathRenamer(QWidget):
 
 
 
+                font-weight: bold;
 
 
 
 
 
 
-        if not dirs_to_rename:
 
 
 
@@ -7320,13 +5540,13 @@ class VMTPathRenamer(QWidget):
 
 
 
+            }
 
 
 
 
 
 
-            self.log_widget.append("Aucun dossier à renommer.")
 
 
 
@@ -7336,13 +5556,13 @@ class VMTPathRenamer(QWidget):
 
 
 
+            QLineEdit, QTextEdit {
 
 
 
 
 
 
-            return
 
 
 
@@ -7352,13 +5572,13 @@ class VMTPathRenamer(QWidget):
 
 
 
+                background-color: #222;
 
 
 
 
 
 
-        apply_dirs_changes(dirs_to_rename, self.log_widget, prefix_suffix=prefix_suffix)
 
 
 
@@ -7368,13 +5588,13 @@ class VMTPathRenamer(QWidget):
 
 
 
+                color: #FFF;
 
 
 
 
 
 
-        self.log_widget.append("=== Renommage terminé ===")
 
 
 
@@ -7384,6 +5604,7 @@ class VMTPathRenamer(QWidget):
 
 
 
+                border: 1px solid #333;
 
 
 
@@ -7399,6 +5620,7 @@ class VMTPathRenamer(QWidget):
 
 
 
+                border-radius: 6px;
 
 
 
@@ -7406,7 +5628,6 @@ class VMTPathRenamer(QWidget):
 
 
 
-    def apply_move_vmt_vtf(self):
 
 
 
@@ -7415,6 +5636,7 @@ class VMTPathRenamer(QWidget):
 
 
 
+                padding: 6px 8px;
 
 
 
@@ -7422,7 +5644,6 @@ class VMTPathRenamer(QWidget):
 
 
 
-        self.log_widget.append("=== Début déplacement VMT/VTF ===")
 
 
 
@@ -7431,6 +5652,7 @@ class VMTPathRenamer(QWidget):
 
 
 
+            }
 
 
 
@@ -7438,7 +5660,6 @@ class VMTPathRenamer(QWidget):
 
 
 
-        target_dir = QFileDialog.getExistingDirectory(self, "Choisir le dossier de destination")
 
 
 
@@ -7447,6 +5668,7 @@ class VMTPathRenamer(QWidget):
 
 
 
+            QTextEdit {
 
 
 
@@ -7454,7 +5676,6 @@ class VMTPathRenamer(QWidget):
 
 
 
-        if not target_dir:
 
 
 
@@ -7463,6 +5684,7 @@ class VMTPathRenamer(QWidget):
 
 
 
+                color: #FF6666;
 
 
 
@@ -7470,7 +5692,6 @@ class VMTPathRenamer(QWidget):
 
 
 
-            self.log_widget.append("[ANNULÉ] Aucun dossier choisi.")
 
 
 
@@ -7479,6 +5700,7 @@ class VMTPathRenamer(QWidget):
 
 
 
+            }
 
 
 
@@ -7486,7 +5708,6 @@ class VMTPathRenamer(QWidget):
 
 
 
-            return
 
 
 
@@ -7495,6 +5716,7 @@ class VMTPathRenamer(QWidget):
 
 
 
+        """)
 
 
 
@@ -7502,7 +5724,6 @@ class VMTPathRenamer(QWidget):
 
 
 
-        prefix_suffix = self.prefix_entry.text().strip()
 
 
 
@@ -7518,7 +5739,6 @@ class VMTPathRenamer(QWidget):
 
 
 
-        for line in self.detected_dirs_widget.toPlainText().splitlines():
 
 
 
@@ -7528,13 +5748,13 @@ class VMTPathRenamer(QWidget):
 
 
 
+    # ------------------ Fonctions ------------------
 
 
 
 
 
 
-            old_dir = line.strip()
 
 
 
@@ -7544,13 +5764,13 @@ class VMTPathRenamer(QWidget):
 
 
 
+    def browse_folder(self):
 
 
 
 
 
 
-            if not old_dir or not os.path.exists(old_dir):
 
 
 
@@ -7560,13 +5780,13 @@ class VMTPathRenamer(QWidget):
 
 
 
+        folder = QFileDialog.getExistingDirectory(self, "Choisir un dossier")
 
 
 
 
 
 
-                continue
 
 
 
@@ -7576,13 +5796,13 @@ class VMTPathRenamer(QWidget):
 
 
 
+        if folder:
 
 
 
 
 
 
-            base_name = os.path.basename(old_dir)
 
 
 
@@ -7592,13 +5812,13 @@ class VMTPathRenamer(QWidget):
 
 
 
+            self.folder_entry.setText(folder)
 
 
 
 
 
 
-            dest_dir = os.path.join(target_dir, f"{prefix_suffix}{base_name}" if prefix_suffix else base_name)
 
 
 
@@ -7614,7 +5834,6 @@ class VMTPathRenamer(QWidget):
 
 
 
-            os.makedirs(dest_dir, exist_ok=True)
 
 
 
@@ -7625,12 +5844,12 @@ class VMTPathRenamer(QWidget):
 
 
 
+    def reset_fields(self):
 
 
 
 
 
-            for ext in ('.vmt', '.vtf'):
 
 
 
@@ -7641,12 +5860,12 @@ class VMTPathRenamer(QWidget):
 
 
 
+        self.folder_entry.clear()
 
 
 
 
 
-                for fname in os.listdir(old_dir):
 
 
 
@@ -7657,12 +5876,12 @@ class VMTPathRenamer(QWidget):
 
 
 
+        self.path_entry.clear()
 
 
 
 
 
-                    if fname.lower().endswith(ext):
 
 
 
@@ -7673,12 +5892,12 @@ class VMTPathRenamer(QWidget):
 
 
 
+        self.prefix_entry.clear()
 
 
 
 
 
-                        src = os.path.join(old_dir, fname)
 
 
 
@@ -7689,14 +5908,15 @@ class VMTPathRenamer(QWidget):
 
 
 
+        self.detected_dirs_widget.clear()
 
 
 
 
 
-                        dst = os.path.join(dest_dir, fname)
 
 
+        self.log_widget.clear()
 
 
 
@@ -7710,9 +5930,9 @@ class VMTPathRenamer(QWidget):
 
 
 
-                        shutil.move(src, dst)
 
 
+    def clear_logs(self):
 
 
 
@@ -7720,14 +5940,15 @@ class VMTPathRenamer(QWidget):
 
 
 
+        """Efface le journal d'activité"""
 
 
 
 
 
 
-                        self.log_widget.append(f"[DÉPLACÉ] {src} -> {dst}")
 
+        self.log_widget.clear()
 
 
 
@@ -7735,6 +5956,7 @@ class VMTPathRenamer(QWidget):
 
 
 
+        self.log_widget.append("🗑️ Journal effacé")
 
 
 
@@ -7742,7 +5964,6 @@ class VMTPathRenamer(QWidget):
 
 
 
-        self.log_widget.append("=== Déplacement VMT/VTF terminé ===")
 
 
 
@@ -7767,15 +5988,186 @@ class VMTPathRenamer(QWidget):
 
 
 
+    def scan_vmt_dirs(self):
+        self.detected_dirs_widget.clear()
+        MATERIALS_DIR = self.folder_entry.text().strip()
+        if not os.path.isdir(MATERIALS_DIR):
+            QMessageBox.critical(self, "Erreur", "Le dossier spécifié n'existe pas.")
+            return
+        self._start_job("=== Analyse terminée ===", scan_vmt_dir_records, MATERIALS_DIR,
+                        on_result=self.detected_dirs_widget.set_records)
 
 
+    def _start_job(self, done_message, func, *args, on_result=None, **kwargs):
+        """Lance une opération VMT dans un VMTJobWorker et verrouille les boutons d'action.
 
+        on_result reçoit la valeur rendue par func si l'opération se termine sans erreur.
+        """
+        if self.job_worker is not None and self.job_worker.isRunning():
+            QMessageBox.warning(self, "Opération en cours", "Une opération est déjà en cours. Annulez-la ou attendez la fin.")
+            return
+        self.job_done_message = done_message
+        self.job_result_callback = on_result
+        self.job_worker = VMTJobWorker(func, *args, **kwargs)
+        self.job_worker.log_batch.connect(self.on_job_log_batch)
+        self.job_worker.progress.connect(self.on_job_progress)
+        self.job_worker.job_finished.connect(self.on_job_finished)
+        self.set_job_running(True)
+        self.job_worker.start()
+
+    def set_job_running(self, running):
+        for btn in (self.run_vmt_btn, self.run_rename_btn, self.scan_btn, self.reset_btn, self.apply_move_btn,
+                    self.preview_vmt_btn, self.check_refs_btn):
+            btn.setEnabled(not running)
+        self.cancel_job_btn.setEnabled(running)
+        if running:
+            self.job_progress_label.setText("⏳ Opération en cours...")
+
+    def cancel_job(self):
+        if self.job_worker is not None and self.job_worker.isRunning():
+            self.job_worker.cancel()
+            self.cancel_job_btn.setEnabled(False)
+            self.log_widget.append("⛔ Annulation demandée, arrêt au prochain fichier...")
+
+    def on_job_log_batch(self, messages):
+        # Le lot entier passe dans le tampon du LogView, livré à la vue au prochain tick
+        self.log_widget.append_lines(messages)
+
+    def on_job_progress(self, scanned, rewritten, nbytes):
+        self.job_progress_label.setText(
+            f"⏳ Analysés: {scanned} | Modifiés: {rewritten} | {nbytes / (1024 * 1024):.1f} Mo"
+        )
 
+    def on_job_finished(self, success, message):
+        self.set_job_running(False)
+        if success:
+            if self.job_result_callback is not None:
+                self.job_result_callback(self.job_worker.value)
+            self.log_widget.append(self.job_done_message)
+            self.job_progress_label.setText("✅ " + self.job_progress_label.text().lstrip("⏳ "))
+        else:
+            self.log_widget.append(f"[INTERROMPU] {message}")
+            self.job_progress_label.setText(f"⛔ {message}")
 
+    def closeEvent(self, event):
+        # Ne pas détruire un QThread encore actif
+        if self.job_worker is not None and self.job_worker.isRunning():
+            self.job_worker.cancel()
+            self.job_worker.wait()
+        if self.update_check_worker is not None and self.update_check_worker.isRunning():
+            # Les requêtes de check_update ont toutes un timeout : l'attente est bornée
+            self.update_check_worker.result.disconnect()
+            self.update_check_worker.wait()
+        self.log_widget.close_log()
+        super().closeEvent(event)
 
+    def run_vmt(self):
+        self.log_widget.clear()
+        MATERIALS_DIR = self.folder_entry.text().strip()
+        NEW_PATH = self.path_entry.text().strip().replace('\\','/')
+        if not os.path.isdir(MATERIALS_DIR) or not NEW_PATH:
+            QMessageBox.critical(self, "Erreur", "Vérifiez dossier et chemin cible.")
+            return
+        if not self.recover_interrupted_run(MATERIALS_DIR):
+            return
+        self.log_widget.append("=== Début remplacement chemins VMT ===")
+        self._start_job("=== Remplacement terminé ===", rewrite_vmt_tree, MATERIALS_DIR, NEW_PATH,
+                        models_dir=self.models_dir_for(MATERIALS_DIR), profile=self.profile_check.isChecked(),
+                        profile_calls=self.cprofile_check.isChecked(), on_result=self.close_vmt_plan)
+
+    def close_vmt_plan(self, result):
+        """Libère le fichier temporaire du plan rendu par rewrite_vmt_tree"""
+        _, plan = result
+        plan.close()
+
+    def models_dir_for(self, MATERIALS_DIR):
+        """Dossier models voisin du dossier materials si la correction des modèles est cochée"""
+        if not self.patch_models_check.isChecked():
+            return None
+        models_dir = os.path.join(os.path.dirname(os.path.abspath(MATERIALS_DIR)), "models")
+        if not os.path.isdir(models_dir):
+            self.log_widget.append(f"[INFO] Pas de dossier models à côté de {MATERIALS_DIR}, modèles ignorés")
+            return None
+        return models_dir
+
+    def preview_vmt(self):
+        """Simulation de run_vmt : écrit le diff des modifications sans toucher aux fichiers"""
+        self.log_widget.clear()
+        MATERIALS_DIR = self.folder_entry.text().strip()
+        NEW_PATH = self.path_entry.text().strip().replace('\\','/')
+        if not os.path.isdir(MATERIALS_DIR) or not NEW_PATH:
+            QMessageBox.critical(self, "Erreur", "Vérifiez dossier et chemin cible.")
+            return
+        self.log_widget.append("=== Début simulation remplacement chemins VMT ===")
+        self._start_job("=== Simulation terminée ===", rewrite_vmt_tree, MATERIALS_DIR, NEW_PATH,
+                        dry_run=True, diff_path=vmt_diff_path(MATERIALS_DIR),
+                        models_dir=self.models_dir_for(MATERIALS_DIR), on_result=self.close_vmt_plan)
+
+    def recover_interrupted_run(self, MATERIALS_DIR):
+        """Propose de reprendre ou d'annuler une passe d'écriture interrompue. Retourne False pour abandonner."""
+        journal_path = vmt_journal_path(MATERIALS_DIR)
+        if not os.path.exists(journal_path):
+            return True
+        box = QMessageBox(self)
+        box.setIcon(QMessageBox.Warning)
+        box.setWindowTitle("Exécution interrompue")
+        box.setText("La dernière modification des VMT de ce dossier a été interrompue.\n\n"
+                    "Reprendre : termine les écritures en attente.\n"
+                    "Restaurer : remet tous les fichiers de cette exécution dans leur état d'origine.")
+        resume_btn = box.addButton("▶️ Reprendre", QMessageBox.AcceptRole)
+        rollback_btn = box.addButton("⏪ Restaurer", QMessageBox.DestructiveRole)
+        box.addButton("Annuler", QMessageBox.RejectRole)
+        box.exec_()
+        if box.clickedButton() is resume_btn:
+            mode = "resume"
+        elif box.clickedButton() is rollback_btn:
+            mode = "rollback"
+        else:
+            return False
+        try:
+            count = recover_vmt_journal(journal_path, self.log_widget, mode=mode)
+            self.log_widget.append(f"[JOURNAL] {count} fichiers traités ({mode})")
+        except Exception as e:
+            QMessageBox.critical(self, "Erreur", f"Impossible de traiter le journal: {e}")
+            return False
+        return True
 
+    def run_rename(self):
+        self.log_widget.clear()
+        prefix_suffix = self.prefix_entry.text().strip()
+        dirs_to_rename = [(path, path) for path in self.detected_dirs_widget.checked_paths()]
+        if not dirs_to_rename:
+            self.log_widget.append("Aucun dossier à renommer.")
+            return
+        self._start_job("=== Renommage terminé ===", apply_dirs_changes, dirs_to_rename, prefix_suffix=prefix_suffix)
 
+    def apply_move_vmt_vtf(self):
+        self.log_widget.append("=== Début déplacement VMT/VTF ===")
+        target_dir = QFileDialog.getExistingDirectory(self, "Choisir le dossier de destination")
+        if not target_dir:
+            self.log_widget.append("[ANNULÉ] Aucun dossier choisi.")
+            return
+        prefix_suffix = self.prefix_entry.text().strip()
+        dirs = self.detected_dirs_widget.checked_paths()
+        if self.move_referenced_check.isChecked():
+            MATERIALS_DIR = self.folder_entry.text().strip()
+            if not os.path.isdir(MATERIALS_DIR):
+                QMessageBox.critical(self, "Erreur", "Choisissez le dossier materials pour trouver les textures référencées.")
+                return
+            self._start_job("=== Déplacement VMT/VTF terminé ===", move_referenced_vmt_vtf, MATERIALS_DIR, dirs, target_dir,
+                            prefix_suffix=prefix_suffix)
+            return
+        self._start_job("=== Déplacement VMT/VTF terminé ===", move_vmt_vtf, dirs, target_dir, prefix_suffix=prefix_suffix)
 
+    def check_vmt_references(self):
+        """Liste les textures référencées introuvables et les VTF qu'aucun VMT n'utilise"""
+        self.log_widget.clear()
+        MATERIALS_DIR = self.folder_entry.text().strip()
+        if not os.path.isdir(MATERIALS_DIR):
+            QMessageBox.critical(self, "Erreur", "Dossier invalide.")
+            return
+        self.log_widget.append("=== Début vérification des textures ===")
+        self._start_job("=== Vérification terminée ===", report_vmt_references, MATERIALS_DIR)
 
 
 
@@ -7786,14 +6178,14 @@ class VMTPathRenamer(QWidget):
 
     def manual_check_update(self):
         """Vérification manuelle des mises à jour optimisée"""
-        
+        if not self._start_update_check(False, self.on_update_checked):
+            return
         self.log_widget.append("🔄 Vérification des mises à jour...")
         self.check_update_btn.setEnabled(False)
         self.check_update_btn.setText("🔄 Vérification...")
-        
+
+    def on_update_checked(self, latest_version, up_to_date, error_msg):
         try:
-            latest_version, up_to_date, error_msg = check_update()
-            
             if latest_version == "Erreur":
                 self.update_label.setText("⚠️ Impossible de vérifier la mise à jour")
                 self.update_btn.setEnabled(False)
@@ -8370,21 +6762,11 @@ Voulez-vous procéder maintenant?
 
 
             self.log_widget.append(f"[MAJ] Source: {successful_url}")
-
-
-
-
-
-
-
-            
-
-
-
-
-
-
-
+            # Le moteur d'abord : aa.py n'est remplacé que si vmt_engine.py a pu l'être
+            engine_ok, engine_message = download_engine_update(successful_url)
+            if not engine_ok:
+                raise Exception(f"Impossible de télécharger le moteur: {engine_message}")
+            self.log_widget.append(f"[MAJ] ✅ Moteur mis à jour depuis: {engine_message}")
             script_path = os.path.abspath(sys.argv[0])
 
 
@@ -14855,6 +13237,12 @@ if __name__ == "__main__":
 
 
 
+    # Nécessaire pour le pool de processus du moteur VMT dans un exécutable figé
+    import multiprocessing
+    multiprocessing.freeze_support()
+
+
+
     try:
 
 
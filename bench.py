@@ -0,0 +1,502 @@
+"""Benchmarks du moteur VMT (vmt_engine.py) et du démarrage de aa.py
+
+Utilisation :
+    python bench.py rewriter [--lines 1000000]
+    python bench.py startup [--repeat 5]
+    python bench.py rules [--lines 300000]
+    python bench.py pipeline [--vmt 20000] [--encodings utf-8,cp1252] [--vtf-size 1024 65536]
+                             [--json résultats.json] [--baseline ancien.json]
+"""
+import argparse
+import json
+import os
+import random
+import re
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import vmt_engine
+
+
+def legacy_rewrite_vmt_lines(lines, NEW_PATH):
+    """Boucle d'origine de replace_paths_in_vmt (deux closures et deux sub() par ligne), pour comparaison"""
+    key_pattern = re.compile(r'(\$[a-z0-9_]+\s+)(["\'])([^"\']+)(["\'])', re.IGNORECASE)
+    any_quoted = re.compile(r'(["\'])([^"\']*[/\\][^"\']*)\1')
+    new_lines = []
+    file_changes = []
+    for line in lines:
+        stripped = line.lstrip()
+        if stripped.startswith("//") or stripped.startswith("/*"):
+            new_lines.append(line)
+            continue
+        def repl_auto(m):
+            key, quote, pathval = m.group(1), m.group(2), m.group(3).replace('\\','/')
+            parts = pathval.split('/')
+            if len(parts) > 1:
+                newpath = NEW_PATH + '/' + parts[-1]
+                file_changes.append((key.strip(), pathval, newpath))
+                return key + quote + newpath + quote
+            return m.group(0)
+        def repl_any_auto(m):
+            quote, pathval = m.group(1), m.group(2).replace('\\','/')
+            parts = pathval.split('/')
+            if len(parts) > 1:
+                newpath = NEW_PATH + '/' + parts[-1]
+                file_changes.append(("<any>", pathval, newpath))
+                return quote + newpath + quote
+            return m.group(0)
+        line_mod = key_pattern.sub(repl_auto, line)
+        line_mod = any_quoted.sub(repl_any_auto, line_mod)
+        new_lines.append(line_mod)
+    return new_lines, file_changes
+
+
+# Version à une seule regex par ligne, remplacée par tokenize_keyvalues : gardée pour comparaison
+_LINE_PATH_PATTERN = re.compile(r'(\$[a-z0-9_]+\s+)(["\'])([^"\']*[/\\][^"\']*)(["\'])|(["\'])([^"\']*[/\\][^"\']*)\5', re.IGNORECASE)
+
+
+def line_regex_rewrite_vmt_lines(lines, NEW_PATH):
+    """Passe unique par ligne (une regex combinée, découpage par finditer), avant le tokenizer KeyValues"""
+    prefix = NEW_PATH + '/'
+    finditer = _LINE_PATH_PATTERN.finditer
+    new_lines = []
+    file_changes = []
+    append_line = new_lines.append
+    for line in lines:
+        if '/' not in line and '\\' not in line:
+            append_line(line)
+            continue
+        if line.lstrip().startswith(('//', '/*')):
+            append_line(line)
+            continue
+        pieces = []
+        pos = 0
+        for m in finditer(line):
+            key = m.group(1)
+            if key is not None:
+                quote, pathval = m.group(2), m.group(3)
+            else:
+                quote, pathval = m.group(5), m.group(6)
+            pathval = pathval.replace('\\', '/')
+            newpath = prefix + pathval[pathval.rfind('/') + 1:]
+            if key is not None:
+                file_changes.append((key.strip(), pathval, newpath))
+                pieces.append(line[pos:m.start()] + key + quote + newpath + quote)
+            else:
+                file_changes.append(("<any>", pathval, newpath))
+                pieces.append(line[pos:m.start()] + quote + newpath + quote)
+            pos = m.end()
+        if pieces:
+            pieces.append(line[pos:])
+            append_line(''.join(pieces))
+        else:
+            append_line(line)
+    return new_lines, file_changes
+
+
+def make_vmt_corpus(n_lines, seed=0):
+    """Génère au moins n_lines lignes de VMT bien formés (shader, paramètres, textures, blocs Proxies, commentaires)"""
+    rng = random.Random(seed)
+    folders = ["models/props_c17", "models\\player\\items", "models/weapons/v_models", "effects/shiny", "nature"]
+    texture_keys = ["$basetexture", "$bumpmap", "$envmapmask", "$detail", "$phongexponenttexture"]
+    params = [
+        lambda: f'\t"{rng.choice(texture_keys)}" "{rng.choice(folders)}/tex_{rng.randrange(10000)}"\n',
+        lambda: f'\t{rng.choice(texture_keys)} "{rng.choice(folders)}/tex_{rng.randrange(10000)}"\n',
+        lambda: '\t"$surfaceprop" "metal"\n',
+        lambda: f'\t"$phongboost" "{rng.randrange(10)}"\n',
+        lambda: '\t"$envmaptint" "[.5 .5 .5]"\n',
+        lambda: '\t// ancien chemin: models/old/tex\n',
+    ]
+    lines = []
+    while len(lines) < n_lines:
+        lines.append('"VertexLitGeneric"\n')
+        lines.append('{\n')
+        for _ in range(rng.randrange(2, 10)):
+            lines.append(rng.choice(params)())
+        if rng.random() < 0.2:
+            lines.extend(['\t"Proxies"\n', '\t{\n', '\t\t"Sine"\n', '\t\t{\n',
+                          '\t\t\t"resultVar" "$color"\n', '\t\t\t"sineperiod" "2"\n', '\t\t}\n', '\t}\n'])
+        lines.append('}\n')
+    return lines
+
+
+def _time_call(func, *args, repeat=3):
+    """Meilleur temps sur plusieurs exécutions, pour lisser le bruit de la machine"""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(*args)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def _decode_then_rewrite(raw, NEW_PATH, rewrite):
+    return rewrite(raw.decode('utf-8').splitlines(keepends=True), NEW_PATH)
+
+
+def _decode_then_rewrite_text(raw, NEW_PATH):
+    # Chemin réel du moteur : le texte entier passe dans le tokenizer, sans découpage en lignes
+    return vmt_engine._rewrite_vmt_text(raw.decode('utf-8'), NEW_PATH)
+
+
+def bench_rewriter(n_lines, NEW_PATH="models/bench/new"):
+    lines = make_vmt_corpus(n_lines)
+    n_lines = len(lines)
+    text = ''.join(lines)
+    raw = text.encode('ascii')
+    runs = [
+        ("2 regex + closures (origine)", legacy_rewrite_vmt_lines, (lines, NEW_PATH)),
+        ("regex unique par ligne", line_regex_rewrite_vmt_lines, (lines, NEW_PATH)),
+        ("tokenizer KeyValues", vmt_engine._rewrite_vmt_text, (text, NEW_PATH)),
+        ("décodage + 2 regex", _decode_then_rewrite, (raw, NEW_PATH, legacy_rewrite_vmt_lines)),
+        ("décodage + regex unique", _decode_then_rewrite, (raw, NEW_PATH, line_regex_rewrite_vmt_lines)),
+        ("décodage + tokenizer", _decode_then_rewrite_text, (raw, NEW_PATH)),
+    ]
+    print(f"Corpus synthétique : {n_lines} lignes")
+    reference = None
+    for label, func, args in runs:
+        elapsed, (output, _) = _time_call(func, *args)
+        output = output if isinstance(output, str) else ''.join(output)
+        if reference is None:
+            reference = output
+        status = "identique" if output == reference else "DIFFÉRENT"
+        print(f"  {label:<36} {n_lines / elapsed:>12,.0f} lignes/s  ({elapsed:.2f}s, sortie {status})")
+
+
+def bench_rules(n_lines, NEW_PATH="models/bench/new"):
+    """Débit du tokenizer avec une table VMTRewriteRules de taille croissante : doit rester à peu près constant"""
+    text = ''.join(make_vmt_corpus(n_lines))
+    rng = random.Random(1)
+    # Les vrais dossiers du corpus, noyés parmi des préfixes qui ne correspondent à rien
+    real_prefixes = ["models/props_c17", "models/player/items", "models/weapons", "effects", "nature"]
+    print(f"Corpus synthétique : {n_lines} lignes")
+    elapsed, _ = _time_call(vmt_engine._rewrite_vmt_text, text, NEW_PATH)
+    print(f"  {'NEW_PATH simple':<24} {n_lines / elapsed:>12,.0f} lignes/s")
+    for n_rules in (10, 100, 1000, 10000):
+        rules = [(prefix, f"remap/{i}", None) for i, prefix in enumerate(real_prefixes)]
+        rules += [(f"pack{rng.randrange(10 ** 6)}/dir{i}", f"remap/x{i}", None) for i in range(n_rules - len(rules))]
+        table = vmt_engine.VMTRewriteRules(rules)
+        elapsed, _ = _time_call(vmt_engine._rewrite_vmt_text, text, table)
+        print(f"  {f'{n_rules} règles':<24} {n_lines / elapsed:>12,.0f} lignes/s")
+
+
+# Encodages rencontrés dans les VMT réels ; utf-8-sig et utf-16 écrivent un BOM
+TREE_ENCODINGS = ("utf-8", "cp1252", "utf-8-sig", "utf-16")
+
+
+def make_materials_tree(root, n_vmt, depth=3, fanout=4, encodings=TREE_ENCODINGS, comment_density=0.1,
+                        vtf_size=(1024, 65536), seed=0):
+    """Crée une arborescence materials réaliste et reproductible (même graine, mêmes fichiers).
+
+    Les VMT sont répartis dans fanout ** depth dossiers ; chacun a un .vtf de taille aléatoire
+    dans vtf_size. comment_density est la proportion de lignes de commentaire.
+    Retourne le nombre de dossiers, de fichiers et d'octets écrits.
+    """
+    rng = random.Random(seed)
+    dirs = [""]
+    for _ in range(depth):
+        dirs = [os.path.join(parent, f"d{i}") for parent in dirs for i in range(fanout)]
+    texture_keys = ["$basetexture", "$bumpmap", "$envmapmask", "$detail", "$phongexponenttexture"]
+    total_bytes = 0
+    for i in range(n_vmt):
+        directory = os.path.join(root, dirs[i % len(dirs)])
+        if i < len(dirs):
+            os.makedirs(directory, exist_ok=True)
+        rel_dir = dirs[i % len(dirs)].replace(os.sep, "/")
+        lines = ['"VertexLitGeneric"\n', '{\n']
+        for _ in range(rng.randrange(3, 12)):
+            if rng.random() < comment_density:
+                lines.append("\t// matériau généré, ancien chemin : models/old/tex\n")
+            else:
+                sep = rng.choice(("/", "\\"))
+                lines.append(f'\t"{rng.choice(texture_keys)}" "models{sep}{rel_dir}{sep}tex_{i}"\n')
+        lines.append('\t"$surfaceprop" "metal"\n')
+        lines.append('}\n')
+        encoding = encodings[i % len(encodings)]
+        data = ''.join(lines).encode(encoding)
+        with open(os.path.join(directory, f"mat_{i}.vmt"), "wb") as f:
+            f.write(data)
+        vtf = rng.randbytes(rng.randrange(*vtf_size))
+        with open(os.path.join(directory, f"tex_{i}.vtf"), "wb") as f:
+            f.write(vtf)
+        total_bytes += len(data) + len(vtf)
+    return {"dirs": min(len(dirs), n_vmt), "files": 2 * n_vmt, "bytes": total_bytes}
+
+
+class _CountingLog:
+    """log_widget des benchmarks : compte les lignes et les erreurs sans rien afficher"""
+
+    def __init__(self):
+        self.lines = 0
+        self.errors = 0
+
+    def append(self, text):
+        self.lines += 1
+        if text.startswith("[ERREUR"):
+            self.errors += 1
+
+
+def _peak_rss_bytes():
+    """Pic de mémoire résidente du processus et de ses processus fils terminés, ou None.
+
+    C'est un maximum sur toute la vie du processus : après plusieurs étapes, il couvre aussi les précédentes.
+    """
+    try:
+        import resource
+    except ImportError:
+        resource = None
+    if resource is not None:
+        peak = max(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+                   resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
+        # ru_maxrss est en octets sous macOS, en Kio ailleurs
+        return peak if sys.platform == "darwin" else peak * 1024
+    if sys.platform == "win32":
+        import ctypes
+        from ctypes import wintypes
+
+        class PROCESS_MEMORY_COUNTERS(ctypes.Structure):
+            _fields_ = [("cb", wintypes.DWORD), ("PageFaultCount", wintypes.DWORD),
+                        ("PeakWorkingSetSize", ctypes.c_size_t), ("WorkingSetSize", ctypes.c_size_t),
+                        ("QuotaPeakPagedPoolUsage", ctypes.c_size_t), ("QuotaPagedPoolUsage", ctypes.c_size_t),
+                        ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t), ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+                        ("PagefileUsage", ctypes.c_size_t), ("PeakPagefileUsage", ctypes.c_size_t)]
+        counters = PROCESS_MEMORY_COUNTERS()
+        counters.cb = ctypes.sizeof(counters)
+        process = ctypes.windll.kernel32.GetCurrentProcess()
+        if ctypes.windll.psapi.GetProcessMemoryInfo(process, ctypes.byref(counters), counters.cb):
+            return counters.PeakWorkingSetSize
+    return None
+
+
+def _stage(results, name, func, *args, **kwargs):
+    """Exécute une étape avec un VMTJob neuf et enregistre temps, débits et pic mémoire cumulé"""
+    job = vmt_engine.VMTJob()
+    log = _CountingLog()
+    start = time.perf_counter()
+    value = func(*args, log_widget=log, job=job, **kwargs)
+    elapsed = time.perf_counter() - start
+    files = job.files_rewritten or job.files_scanned
+    peak = _peak_rss_bytes()
+    results[name] = {
+        "seconds": round(elapsed, 4),
+        "files": files,
+        "bytes": job.bytes_processed,
+        "files_per_s": round(files / elapsed, 1) if elapsed else None,
+        "mb_per_s": round(job.bytes_processed / elapsed / (1024 * 1024), 2) if elapsed else None,
+        # Pic depuis le début du benchmark (génération et étapes précédentes comprises)
+        "cumulative_peak_rss_mb": round(peak / (1024 * 1024), 1) if peak is not None else None,
+        "errors": log.errors,
+    }
+    print(f"  {name:<12} {elapsed:>8.3f}s {results[name]['files_per_s'] or 0:>12,.0f} éléments/s "
+          f"{results[name]['mb_per_s'] or 0:>9.1f} Mo/s  pic cumulé {results[name]['cumulative_peak_rss_mb']} Mo")
+    return value
+
+
+def _scan_stage(MATERIALS_DIR, log_widget, job):
+    path_index = vmt_engine.MaterialsPathIndex.build(MATERIALS_DIR, job=job)
+    for _, vmt_entries, vtf_entries in path_index.iter_dirs():
+        job.add_scanned(len(vmt_entries) + len(vtf_entries))
+    return path_index
+
+
+def _local_version():
+    """Version déclarée dans version.txt, sans importer aa (et donc PyQt5) dans le processus mesuré"""
+    try:
+        with open(os.path.join(os.path.dirname(os.path.abspath(__file__)), "version.txt"), encoding="utf-8") as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+
+def bench_pipeline(args):
+    """Chronomètre chaque étape du pipeline sur une arborescence générée et écrit les résultats en JSON"""
+    params = {"vmt": args.vmt, "depth": args.depth, "fanout": args.fanout, "seed": args.seed,
+              "comment_density": args.comment_density, "encodings": list(args.encodings),
+              "vtf_size": list(args.vtf_size), "workers": args.workers}
+    report = {"version": _local_version(), "python": sys.version.split()[0], "platform": sys.platform,
+              "date": time.strftime("%Y-%m-%dT%H:%M:%S"), "params": params, "stages": {}}
+    stages = report["stages"]
+    with tempfile.TemporaryDirectory(prefix="vmtbench") as work:
+        materials = os.path.join(work, "materials")
+        start = time.perf_counter()
+        tree = make_materials_tree(materials, args.vmt, depth=args.depth, fanout=args.fanout,
+                                   encodings=args.encodings, comment_density=args.comment_density,
+                                   vtf_size=tuple(args.vtf_size), seed=args.seed)
+        report["tree"] = tree
+        print(f"Arborescence : {tree['files']} fichiers, {tree['dirs']} dossiers, "
+              f"{tree['bytes'] / (1024 * 1024):.1f} Mo ({time.perf_counter() - start:.1f}s)")
+        path_index = _stage(stages, "scan", _scan_stage, materials)
+        _, plan = _stage(stages, "analyse", vmt_engine.replace_paths_in_vmt, materials, "models/bench/new",
+                         workers=args.workers, path_index=path_index)
+        try:
+            _stage(stages, "écriture", vmt_engine.apply_vmt_changes, plan.iter_changes())
+        finally:
+            plan.close()
+        top_dirs = sorted(os.path.join(materials, name) for name in os.listdir(materials))
+        _stage(stages, "renommage", vmt_engine.apply_dirs_changes, [(d, d) for d in top_dirs], prefix_suffix="bench_")
+        # Déplacement (apply_move_vmt_vtf) des dossiers les plus profonds vers un autre dossier
+        leaf_dirs = vmt_engine.MaterialsPathIndex.build(materials).vmt_dirs()
+        _stage(stages, "déplacement", vmt_engine.move_vmt_vtf, leaf_dirs, os.path.join(work, "moved"))
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"Résultats : {args.json}")
+    if args.baseline:
+        _compare_pipeline(report, args.baseline)
+    return report
+
+
+def _compare_pipeline(report, baseline_path):
+    """Écart de chaque étape par rapport à un résultat précédent (autre version, autre machine)"""
+    with open(baseline_path, "r", encoding="utf-8") as f:
+        baseline = json.load(f)
+    print(f"Comparaison avec {baseline.get('version')} ({baseline_path}) :")
+    if baseline.get("params") != report["params"]:
+        print("  attention : paramètres différents, comparaison indicative")
+    for name, stage in report["stages"].items():
+        before = baseline.get("stages", {}).get(name)
+        if not before or not before.get("seconds"):
+            continue
+        delta = (stage["seconds"] - before["seconds"]) / before["seconds"] * 100
+        flag = "  <-- régression" if delta > 10 else ""
+        print(f"  {name:<12} {before['seconds']:>8.3f}s -> {stage['seconds']:>8.3f}s ({delta:+.0f} %){flag}")
+
+
+# Budget de démarrage à froid jusqu'au premier affichage de la fenêtre
+STARTUP_BUDGET_S = 1.0
+
+# Script enfant : importe aa, construit la fenêtre principale et s'arrête au premier tour de boucle
+# (donc après le premier affichage). La vérification de mise à jour, en arrière-plan, est neutralisée
+# pour ne pas mesurer le réseau.
+_FIRST_PAINT_SCRIPT = """
+import sys, time
+t0 = time.perf_counter()
+sys.path.insert(0, {root!r})
+import aa
+t_import = time.perf_counter() - t0
+aa.check_update = lambda silent=False: (aa.VERSION, True, "")
+from PyQt5.QtWidgets import QApplication
+from PyQt5.QtCore import QTimer
+app = QApplication(sys.argv)
+window = aa.VMTPathRenamer()
+window.show()
+def done():
+    print(t_import, time.perf_counter() - t0)
+    app.quit()
+QTimer.singleShot(0, done)
+app.exec_()
+"""
+
+
+def _child_env():
+    env = dict(os.environ)
+    if sys.platform.startswith("linux") and not env.get("DISPLAY") and not env.get("WAYLAND_DISPLAY"):
+        env.setdefault("QT_QPA_PLATFORM", "offscreen")
+    return env
+
+
+def _timed_run(cmd, env):
+    start = time.perf_counter()
+    proc = subprocess.run(cmd, env=env, capture_output=True, text=True)
+    elapsed = time.perf_counter() - start
+    if proc.returncode != 0:
+        raise RuntimeError(f"{' '.join(cmd)} -> code {proc.returncode}\n{proc.stderr[-2000:]}")
+    return elapsed, proc
+
+
+def _import_profile(env, top=10):
+    """Imports les plus coûteux de "import aa" (temps cumulé, -X importtime)"""
+    root = os.path.dirname(os.path.abspath(__file__))
+    _, proc = _timed_run([sys.executable, "-X", "importtime", "-c",
+                          f"import sys; sys.path.insert(0, {root!r}); import aa"], env)
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        # "import time:  self_us | cumulative_us | nom"
+        _, cumulative_us, name = line[len("import time:"):].split("|")
+        rows.append((int(cumulative_us), name.strip()))
+    rows.sort(reverse=True)
+    return rows[:top]
+
+
+def bench_startup(repeat):
+    root = os.path.dirname(os.path.abspath(__file__))
+    env = _child_env()
+    print("Imports les plus coûteux (cumulé) :")
+    for cumulative_us, name in _import_profile(env):
+        print(f"  {cumulative_us / 1000:>8.1f} ms  {name}")
+    with tempfile.TemporaryDirectory() as empty_dir:
+        cli_cmd = [sys.executable, os.path.join(root, "aa.py"), "vmt", "scan", "--quiet", empty_dir]
+        cli_times = [_timed_run(cli_cmd, env)[0] for _ in range(repeat)]
+    paint_cmd = [sys.executable, "-c", _FIRST_PAINT_SCRIPT.format(root=root)]
+    import_times, paint_times, wall_times = [], [], []
+    for _ in range(repeat):
+        wall, proc = _timed_run(paint_cmd, env)
+        t_import, t_paint = map(float, proc.stdout.split()[-2:])
+        import_times.append(t_import)
+        paint_times.append(t_paint)
+        wall_times.append(wall)
+    print(f"Démarrage ({repeat} exécutions, meilleur temps) :")
+    print(f"  {'aa.py vmt scan (sans interface)':<38} {min(cli_times):.3f}s")
+    print(f"  {'import aa':<38} {min(import_times):.3f}s")
+    print(f"  {'premier affichage (dans le script)':<38} {min(paint_times):.3f}s")
+    best_wall = min(wall_times)
+    status = "OK" if best_wall < STARTUP_BUDGET_S else "DÉPASSÉ"
+    print(f"  {'premier affichage (processus complet)':<38} {best_wall:.3f}s  budget {STARTUP_BUDGET_S:.1f}s : {status}")
+
+
+def _encodings_arg(value):
+    encodings = tuple(name.strip() for name in value.split(",") if name.strip())
+    if not encodings:
+        raise argparse.ArgumentTypeError("au moins un encodage attendu")
+    for name in encodings:
+        try:
+            "".encode(name)
+        except LookupError:
+            raise argparse.ArgumentTypeError(f"encodage inconnu : {name}")
+    return encodings
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks du moteur VMT")
+    sub = parser.add_subparsers(dest="bench", required=True)
+    rewriter = sub.add_parser("rewriter", help="Micro-benchmark de la boucle de réécriture des lignes")
+    rewriter.add_argument("--lines", type=int, default=1_000_000)
+    startup = sub.add_parser("startup", help="Temps d'import et de démarrage à froid (CLI et fenêtre)")
+    startup.add_argument("--repeat", type=int, default=5)
+    rules = sub.add_parser("rules", help="Débit de la réécriture selon le nombre de règles")
+    rules.add_argument("--lines", type=int, default=300_000)
+    pipeline = sub.add_parser("pipeline", help="Analyse, écriture, renommage et déplacement sur une arborescence générée")
+    pipeline.add_argument("--vmt", type=int, default=20_000, help="Nombre de VMT (autant de VTF)")
+    pipeline.add_argument("--depth", type=int, default=3)
+    pipeline.add_argument("--fanout", type=int, default=4)
+    pipeline.add_argument("--comment-density", type=float, default=0.1)
+    pipeline.add_argument("--encodings", type=_encodings_arg, default=TREE_ENCODINGS,
+                          help="Encodages des VMT générés, séparés par des virgules (attribués tour à tour)")
+    pipeline.add_argument("--vtf-size", type=int, nargs=2, metavar=("MIN", "MAX"), default=(1024, 65536),
+                          help="Taille des VTF générés en octets (MIN inclus, MAX exclu)")
+    pipeline.add_argument("--seed", type=int, default=0)
+    pipeline.add_argument("--workers", type=int, default=None, help="Processus du moteur (0 = automatique, 1 = série)")
+    pipeline.add_argument("--json", help="Écrire les résultats dans ce fichier JSON")
+    pipeline.add_argument("--baseline", help="Résultats JSON d'une version précédente à comparer")
+    args = parser.parse_args(argv)
+    if args.bench == "pipeline" and not 0 <= args.vtf_size[0] < args.vtf_size[1]:
+        parser.error("--vtf-size : MIN doit être positif et inférieur à MAX")
+    if args.bench == "rewriter":
+        bench_rewriter(args.lines)
+    elif args.bench == "startup":
+        bench_startup(args.repeat)
+    elif args.bench == "rules":
+        bench_rules(args.lines)
+    elif args.bench == "pipeline":
+        bench_pipeline(args)
+
+
+if __name__ == "__main__":
+    main()
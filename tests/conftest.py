@@ -0,0 +1,25 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+class ListLog:
+    """log_widget des tests : garde les lignes journalisées"""
+
+    def __init__(self):
+        self.lines = []
+
+    def append(self, text):
+        self.lines.append(text)
+
+    @property
+    def errors(self):
+        return [line for line in self.lines if line.startswith("[ERREUR")]
+
+
+@pytest.fixture
+def log():
+    return ListLog()
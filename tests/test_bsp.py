@@ -0,0 +1,80 @@
+import io
+import struct
+import zipfile
+
+import pytest
+
+import vmt_engine
+
+VMT = '"LightmappedGeneric"\r\n{\r\n"$basetexture" "old/dir/brick"\r\n}\r\n'
+VTF = bytes(range(256)) * 20
+MAP_REVISION = 77
+
+
+def _pakfile():
+    data = io.BytesIO()
+    with zipfile.ZipFile(data, "w", zipfile.ZIP_STORED) as z:
+        z.writestr("materials/maps/x/a.vmt", VMT)
+        z.writestr("materials/maps/x/a.vtf", VTF)
+        z.writestr("materials/maps/x/ok.vmt", '"UnlitGeneric" { "$basetexture" "new/p/ok" }')
+    return data.getvalue()
+
+
+def _build_bsp(path, pak_last):
+    """Carte minimale : quelques lumps de données et le lump pakfile, en dernier ou au milieu"""
+    lumps = {i: bytes([i]) * (100 + i) for i in (0, 1, 5, 35)}
+    lumps[vmt_engine.BSP_PAKFILE_LUMP] = _pakfile()
+    order = [0, 1, 5, 35, 40] if pak_last else [0, 1, 5, 40, 35]
+    data = bytearray(vmt_engine.BSP_IDENT + struct.pack("<i", 20) + b"\0" * (16 * vmt_engine.BSP_LUMP_COUNT))
+    data += struct.pack("<i", MAP_REVISION)
+    for i in order:
+        data += b"\0" * (-len(data) % 4)
+        struct.pack_into("<iii", data, 8 + 16 * i, len(data), len(lumps[i]), i)
+        data += lumps[i]
+    path.write_bytes(data)
+    return lumps
+
+
+def _read_lumps(path):
+    data = path.read_bytes()
+    lumps = {}
+    for i in range(vmt_engine.BSP_LUMP_COUNT):
+        offset, length = struct.unpack_from("<ii", data, 8 + 16 * i)
+        if length:
+            lumps[i] = data[offset:offset + length]
+    return lumps, struct.unpack_from("<i", data, vmt_engine.BSP_HEADER_SIZE - 4)[0]
+
+
+@pytest.mark.parametrize("pak_last", [True, False], ids=["pakfile-dernier", "pakfile-milieu"])
+def test_rewrite_keeps_other_lumps(tmp_path, log, pak_last):
+    bsp_path = tmp_path / "map.bsp"
+    original = _build_bsp(bsp_path, pak_last)
+    assert vmt_engine.rewrite_bsp_maps([str(tmp_path)], "new/p", log, workers=1) == (1, 1)
+    lumps, revision = _read_lumps(bsp_path)
+    assert revision == MAP_REVISION
+    assert {i: lumps[i] for i in (0, 1, 5, 35)} == {i: original[i] for i in (0, 1, 5, 35)}
+    with zipfile.ZipFile(io.BytesIO(lumps[vmt_engine.BSP_PAKFILE_LUMP])) as z:
+        assert z.testzip() is None
+        assert z.read("materials/maps/x/a.vmt").decode() == VMT.replace("old/dir/brick", "new/p/brick")
+        assert z.read("materials/maps/x/a.vtf") == VTF
+        assert z.read("materials/maps/x/ok.vmt") == b'"UnlitGeneric" { "$basetexture" "new/p/ok" }'
+    assert not log.errors
+
+
+def test_output_dir_and_dry_run(tmp_path, log):
+    maps = tmp_path / "maps"
+    maps.mkdir()
+    _build_bsp(maps / "map.bsp", True)
+    before = (maps / "map.bsp").read_bytes()
+    assert vmt_engine.rewrite_bsp_maps([str(maps)], "new/p", log, workers=1, dry_run=True) == (1, 1)
+    out = tmp_path / "out"
+    assert vmt_engine.rewrite_bsp_maps([str(maps)], "new/p", log, output_dir=str(out), workers=1) == (1, 1)
+    assert (maps / "map.bsp").read_bytes() == before
+    assert _read_lumps(out / "map.bsp")[0][0] == _read_lumps(maps / "map.bsp")[0][0]
+
+
+def test_invalid_map_is_reported(tmp_path, log):
+    (tmp_path / "bad.bsp").write_bytes(b"nope")
+    assert vmt_engine.rewrite_bsp_maps([str(tmp_path / "bad.bsp")], "new/p", log, workers=1) == (1, 0)
+    assert len(log.errors) == 1 and log.errors[0].startswith("[ERREUR BSP]")
+    assert (tmp_path / "bad.bsp").read_bytes() == b"nope"
@@ -0,0 +1,74 @@
+import json
+import os
+import subprocess
+import sys
+
+import vmt_engine
+
+VMT = '"VertexLitGeneric"\n{\n\t"$basetexture" "models/old/d%d/tex_%d"\n\t"$surfaceprop" "metal"\n}\n'
+
+
+def _make_tree(root, count):
+    for i in range(count):
+        path = root / f"d{i % 5}" / f"m{i}.vmt"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(VMT % (i % 5, i), encoding="utf-8")
+
+
+def _tree(root):
+    out = {}
+    for dirpath, _, filenames in os.walk(root):
+        for name in filenames:
+            with open(os.path.join(dirpath, name), "r", encoding="utf-8") as f:
+                out[os.path.relpath(os.path.join(dirpath, name), root)] = f.read()
+    return out
+
+
+def _run_cli(*args):
+    """Exécute le moteur comme en ligne de commande ; rend (code, lignes JSON, lignes de log)"""
+    proc = subprocess.run([sys.executable, vmt_engine.__file__, *args], capture_output=True, text=True,
+                          encoding="utf-8", timeout=120)
+    return proc.returncode, [json.loads(line) for line in proc.stdout.splitlines()], proc.stderr.splitlines()
+
+
+def test_rewrite_dry_run_writes_nothing(tmp_path):
+    materials = tmp_path / "materials"
+    _make_tree(materials, 10)
+    before = _tree(materials)
+    code, stats, logs = _run_cli("rewrite", "--dry-run", "--diff", "--no-validate", "--new-path", "new/p",
+                                 str(materials))
+    assert code == 0
+    root_stats, summary = stats
+    assert (root_stats["status"], root_stats["planned"], root_stats["files_rewritten"]) == ("ok", 10, 0)
+    assert summary["summary"]["roots"] == 1 and summary["summary"]["failed"] == 0
+    assert _tree(materials) == before
+    assert "[SIMULATION] 10 fichiers VMT seraient modifiés, aucun fichier écrit" in logs
+    with open(vmt_engine.vmt_diff_path(str(materials)), "r", encoding="utf-8") as f:
+        assert f.read().count("\n+\t\"$basetexture\" \"new/p/tex_") == 10
+
+
+def test_missing_root_fails(tmp_path):
+    code, stats, _ = _run_cli("rewrite", "--new-path", "new/p", "--quiet", str(tmp_path / "absent"))
+    assert code == 1
+    assert stats[0]["status"] == "error" and stats[-1]["summary"]["failed"] == 1
+
+
+def test_parallel_and_serial_output_match(tmp_path):
+    count = vmt_engine.VMT_PARALLEL_MIN_FILES * 2
+    results = {}
+    for workers in ("1", "4"):
+        materials = tmp_path / f"w{workers}" / "materials"
+        _make_tree(materials, count)
+        code, stats, logs = _run_cli("rewrite", "--new-path", "new/p", "--workers", workers, str(materials))
+        assert code == 0
+        for line in stats:
+            line = line.get("summary", line)
+            line.pop("elapsed")
+            line.pop("root", None)
+        # Mêmes lignes dans le même ordre, au chemin du dossier et aux temps mesurés près
+        logs = [line.replace(str(materials), "<materials>") for line in logs if not line.startswith("[PROFIL]")]
+        results[workers] = (stats, logs, _tree(materials))
+    assert results["1"] == results["4"]
+    stats, logs, tree = results["1"]
+    assert stats[0]["files_rewritten"] == count
+    assert len(tree) == count and all("new/p/tex_" in content for content in tree.values())
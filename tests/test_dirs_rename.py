@@ -0,0 +1,143 @@
+import os
+
+import pytest
+
+import vmt_engine
+
+
+def _make(root, files):
+    for name, content in files.items():
+        path = root / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content, encoding="utf-8")
+
+
+def _tree(root):
+    out = {}
+    for dirpath, _, filenames in os.walk(root):
+        for name in filenames:
+            path = os.path.join(dirpath, name)
+            with open(path, "r", encoding="utf-8") as f:
+                out[os.path.relpath(path, root).replace(os.sep, "/")] = f.read()
+    return out
+
+
+def _pairs(root, *names):
+    return [(str(root / name), str(root / name)) for name in names]
+
+
+def test_nested_renames_child_first(tmp_path, log):
+    _make(tmp_path, {"d/a.vmt": "1", "d/s/b.vmt": "2"})
+    plan = vmt_engine.plan_dirs_changes(_pairs(tmp_path, "d", "d/s"), prefix_suffix="p_")
+    assert not plan.conflicts
+    assert [[os.path.basename(op.old) for op in level] for level in plan.levels] == [["s"], ["d"]]
+    vmt_engine.apply_dirs_changes(_pairs(tmp_path, "d", "d/s"), log, prefix_suffix="p_")
+    assert _tree(tmp_path) == {"p_d/a.vmt": "1", "p_d/p_s/b.vmt": "2"}
+    assert not log.errors
+
+
+def test_merge_into_existing_directory(tmp_path, log):
+    _make(tmp_path, {"d/a.vmt": "1", "d/s/b.vmt": "2", "p_d/c.vmt": "ancien"})
+    plan = vmt_engine.apply_dirs_changes(_pairs(tmp_path, "d"), log, prefix_suffix="p_")
+    op, = plan.iter_ops()
+    assert op.merge and op.status == "fusionné"
+    assert _tree(tmp_path) == {"p_d/a.vmt": "1", "p_d/s/b.vmt": "2", "p_d/c.vmt": "ancien"}
+    assert not os.path.exists(tmp_path / "d")
+
+
+def test_vacated_target_is_a_plain_rename(tmp_path, log):
+    _make(tmp_path, {"d/a": "1", "p_d/b": "2"})
+    plan = vmt_engine.apply_dirs_changes(_pairs(tmp_path, "d", "p_d"), log, prefix_suffix="p_")
+    assert not any(op.merge for op in plan.iter_ops())
+    assert _tree(tmp_path) == {"p_d/a": "1", "p_p_d/b": "2"}
+
+
+def test_file_collision_moves_nothing(tmp_path, log):
+    files = {"d/a.vmt": "1", "p_d/a.vmt": "ancien", "e/z": "z"}
+    _make(tmp_path, files)
+    plan = vmt_engine.apply_dirs_changes(_pairs(tmp_path, "e", "d"), log, prefix_suffix="p_")
+    assert len(plan.conflicts) == 1 and "existe déjà" in plan.conflicts[0]
+    assert _tree(tmp_path) == files
+    assert log.errors
+
+
+def test_same_target_and_cycle_conflicts(tmp_path):
+    _make(tmp_path, {"a/x": "1", "b/y": "2", "c/z": "3"})
+    same = vmt_engine.plan_dirs_changes([(str(tmp_path / "a"), str(tmp_path / "t")),
+                                         (str(tmp_path / "c"), str(tmp_path / "t"))])
+    assert any("même cible" in conflict for conflict in same.conflicts)
+    cycle = vmt_engine.plan_dirs_changes([(str(tmp_path / "a"), str(tmp_path / "b")),
+                                          (str(tmp_path / "b"), str(tmp_path / "a"))])
+    assert any(conflict.startswith("cycle") for conflict in cycle.conflicts)
+
+
+def test_target_is_a_file(tmp_path):
+    _make(tmp_path, {"d/s/a": "1", "p_d/s": "fichier"})
+    plan = vmt_engine.plan_dirs_changes(_pairs(tmp_path, "d"), prefix_suffix="p_")
+    assert any("n'est pas un dossier" in conflict for conflict in plan.conflicts)
+
+
+def test_missing_source(tmp_path, log):
+    _make(tmp_path, {"d/a": "1"})
+    plan = vmt_engine.apply_dirs_changes(_pairs(tmp_path, "d", "absent"), log, prefix_suffix="p_")
+    assert any("introuvable" in conflict for conflict in plan.conflicts)
+    assert len(plan) == 1
+    assert _tree(tmp_path) == {"d/a": "1"}
+
+
+def test_already_named_is_skipped(tmp_path):
+    _make(tmp_path, {"d/a": "1"})
+    plan = vmt_engine.plan_dirs_changes(_pairs(tmp_path, "d"))
+    assert len(plan) == 0 and len(plan.skipped) == 1 and not plan.conflicts
+
+
+def _cross_device(monkeypatch):
+    monkeypatch.setattr(vmt_engine, "_same_device", lambda path, target: False)
+
+
+def test_cross_device_copy_then_remove_source(tmp_path, log, monkeypatch):
+    _cross_device(monkeypatch)
+    files = {"d/a.vmt": "1", "d/s/b.vtf": "vtf" * 1000, "e/c.vmt": "3"}
+    _make(tmp_path, files)
+    _make(tmp_path, {"p_e/old.vmt": "ancien"})
+    job = vmt_engine.VMTJob()
+    plan = vmt_engine.apply_dirs_changes(_pairs(tmp_path, "d", "e"), log, prefix_suffix="p_", job=job, threads=2)
+    assert [op.status for op in plan.iter_ops()] == ["renommé", "fusionné"]
+    assert _tree(tmp_path) == {"p_d/a.vmt": "1", "p_d/s/b.vtf": "vtf" * 1000, "p_e/c.vmt": "3",
+                               "p_e/old.vmt": "ancien"}
+    assert not os.path.exists(tmp_path / "d") and not os.path.exists(tmp_path / "e")
+    assert job.bytes_processed == sum(len(content) for content in files.values())
+    assert job.files_rewritten == 2
+    assert any(line.startswith("[COPIE] 2 dossiers") for line in log.lines)
+    assert not log.errors
+
+
+def test_cross_device_short_copy_keeps_source(tmp_path, log, monkeypatch):
+    _cross_device(monkeypatch)
+    _make(tmp_path, {"d/a.vmt": "contenu"})
+    copy_range = vmt_engine._copy_file_range
+    monkeypatch.setattr(vmt_engine, "_copy_file_range",
+                        lambda src, dst, offset, length: copy_range(src, dst, offset, length - 1))
+    plan = vmt_engine.apply_dirs_changes(_pairs(tmp_path, "d"), log, prefix_suffix="p_")
+    op, = plan.iter_ops()
+    assert op.status == "échec"
+    assert (tmp_path / "d" / "a.vmt").read_text(encoding="utf-8") == "contenu"
+    assert any("octets copiés sur" in line for line in log.errors)
+
+
+def test_cross_device_keeps_symlinks(tmp_path, log, monkeypatch):
+    _cross_device(monkeypatch)
+    _make(tmp_path, {"d/a.vmt": "1", "shared/t.vtf": "vtf"})
+    try:
+        os.symlink(os.path.join("..", "shared"), tmp_path / "d" / "link_dir", target_is_directory=True)
+        os.symlink("a.vmt", tmp_path / "d" / "link_file.vmt")
+    except OSError:
+        pytest.skip("liens symboliques non autorisés")
+    vmt_engine.apply_dirs_changes(_pairs(tmp_path, "d"), log, prefix_suffix="p_")
+    moved = tmp_path / "p_d"
+    assert os.readlink(moved / "link_dir") == os.path.join("..", "shared")
+    assert os.readlink(moved / "link_file.vmt") == "a.vmt"
+    assert (moved / "link_dir" / "t.vtf").read_text(encoding="utf-8") == "vtf"
+    assert (tmp_path / "shared" / "t.vtf").exists()
+    assert not os.path.exists(tmp_path / "d")
+    assert not log.errors
@@ -0,0 +1,89 @@
+import struct
+import zlib
+
+import vmt_engine
+
+VMT = b'"VertexLitGeneric"\r\n{\r\n "$basetexture" "models/foo/a"\r\n}\r\n'
+
+FILES = [
+    ("materials/models/foo/a.vmt", VMT),
+    ("materials/models/foo/a.vtf", bytes(range(256)) * 40),
+    ("materials/models/foo/sub/b.vmt", b'"UnlitGeneric" { $basetexture models/foo/sub/b }'),
+    ("materials/models/bar/c.vtf", b"VTFc"),
+    ("lua/autorun/x.lua", b"print(1)"),
+]
+
+
+def _build_gma(path, files):
+    data = bytearray(vmt_engine.GMA_IDENT + bytes([3]) + struct.pack("<QQ", 7, 8) + b"\0")
+    data += b"addon\0description\0auteur\0" + struct.pack("<i", 1)
+    for number, (name, content) in enumerate(files, 1):
+        data += struct.pack("<I", number) + name.encode() + b"\0" + struct.pack("<qI", len(content), zlib.crc32(content))
+    data += struct.pack("<I", 0)
+    for _, content in files:
+        data += content
+    data += struct.pack("<I", zlib.crc32(data))
+    path.write_bytes(data)
+    return str(path)
+
+
+def _read_gma(path):
+    """Contenu d'un addon, dans l'ordre de sa table, après vérification des crc"""
+    with open(path, "rb") as f:
+        raw = f.read()
+    assert struct.unpack("<I", raw[-4:])[0] == zlib.crc32(raw[:-4])
+    archive = vmt_engine.GMAArchive(path)
+    try:
+        contents = []
+        for entry in archive.entries:
+            data = bytes(archive.read(entry))
+            assert zlib.crc32(data) == entry.crc, entry.name
+            contents.append((entry.name, data))
+        assert archive.entries[-1].offset + archive.entries[-1].size == len(raw) - 4
+        return contents
+    finally:
+        archive.close()
+
+
+def test_write_unchanged_is_identical(tmp_path):
+    gma_path = _build_gma(tmp_path / "addon.gma", FILES)
+    before = (tmp_path / "addon.gma").read_bytes()
+    vmt_engine.write_gma(vmt_engine.GMAArchive(gma_path), str(tmp_path / "copy.gma"))
+    assert (tmp_path / "copy.gma").read_bytes() == before
+
+
+def test_rewrite_changes_only_vmts(tmp_path, log):
+    gma_path = _build_gma(tmp_path / "addon.gma", FILES)
+    assert vmt_engine.rewrite_gma(gma_path, "new/p", log, workers=1) == 2
+    contents = dict(_read_gma(gma_path))
+    assert contents["materials/models/foo/a.vmt"] == VMT.replace(b"models/foo/a", b"new/p/a")
+    assert contents["materials/models/foo/sub/b.vmt"] == b'"UnlitGeneric" { $basetexture new/p/b }'
+    for name, data in FILES:
+        if not name.endswith(".vmt"):
+            assert contents[name] == data
+    assert not log.errors
+
+
+def test_rename_then_move(tmp_path, log):
+    gma_path = _build_gma(tmp_path / "addon.gma", FILES)
+    vmt_engine.rename_gma_dirs(gma_path, ["materials/models/foo"], log, prefix_suffix="x_")
+    assert [name for name, _ in _read_gma(gma_path)] == [
+        "materials/models/x_foo/a.vmt", "materials/models/x_foo/a.vtf", "materials/models/x_foo/sub/b.vmt",
+        "materials/models/bar/c.vtf", "lua/autorun/x.lua"]
+    vmt_engine.move_gma_vmt_vtf(gma_path, ["materials/models/x_foo", "materials/models/bar/"], "materials/new", log,
+                                prefix_suffix="p_")
+    contents = _read_gma(gma_path)
+    assert [name for name, _ in contents] == [
+        "materials/new/p_x_foo/a.vmt", "materials/new/p_x_foo/a.vtf", "materials/models/x_foo/sub/b.vmt",
+        "materials/new/p_bar/c.vtf", "lua/autorun/x.lua"]
+    assert [data for _, data in contents] == [data for _, data in FILES]
+    assert not log.errors
+
+
+def test_rename_refuses_overwrite(tmp_path, log):
+    gma_path = _build_gma(tmp_path / "addon.gma", FILES + [("materials/models/x_foo/a.vmt", b"autre")])
+    accepted = vmt_engine.rename_gma_dirs(gma_path, ["materials/models/foo"], log, prefix_suffix="x_")
+    assert "materials/models/foo/a.vmt" not in accepted
+    names = [name for name, _ in _read_gma(gma_path)]
+    assert "materials/models/foo/a.vmt" in names and "materials/models/x_foo/a.vtf" in names
+    assert len(log.errors) == 1
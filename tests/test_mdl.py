@@ -0,0 +1,74 @@
+import struct
+
+import vmt_engine
+
+HEADER_SIZE = 240
+LONG_DIR = b"models\\old\\long_folder_name\\"
+SHORT_DIR = b"m/"
+
+
+def _build_mdl(path, cdmaterials):
+    """.mdl minimal : en-tête, table des offsets $cdmaterials puis les chaînes"""
+    data = bytearray(vmt_engine.MDL_IDENT + b"\0" * (HEADER_SIZE - 4))
+    table = len(data)
+    data += b"\0" * (4 * len(cdmaterials))
+    for i, value in enumerate(cdmaterials):
+        struct.pack_into("<i", data, table + 4 * i, len(data))
+        data += value + b"\0"
+    struct.pack_into("<ii", data, vmt_engine.MDL_TEXTUREDIR_OFFSET, len(cdmaterials), table)
+    struct.pack_into("<i", data, vmt_engine.MDL_LENGTH_OFFSET, len(data))
+    path.write_bytes(data)
+    return bytes(data)
+
+
+def _cdmaterials(data):
+    count, table = struct.unpack_from("<ii", data, vmt_engine.MDL_TEXTUREDIR_OFFSET)
+    values = []
+    for i in range(count):
+        (start,) = struct.unpack_from("<i", data, table + 4 * i)
+        values.append((start, data[start:data.index(b"\0", start)]))
+    return values
+
+
+def test_patch_in_place_and_appended(tmp_path):
+    path = tmp_path / "a.mdl"
+    original = _build_mdl(path, [LONG_DIR, SHORT_DIR])
+    (long_start, _), (short_start, _) = _cdmaterials(original)
+    result = vmt_engine._patch_mdl_file(str(path), "models/new_folder")
+    assert result["error"] is None
+    assert result["changes"] == [(LONG_DIR.decode(), "models\\new_folder\\"), (SHORT_DIR.decode(), "models/new_folder/")]
+    data = result["data"]
+    (new_long_start, new_long), (new_short_start, new_short) = _cdmaterials(data)
+    # Plus court : réécrit à la même place, complété par des zéros
+    assert (new_long_start, new_long) == (long_start, b"models\\new_folder\\")
+    assert data[long_start:long_start + len(LONG_DIR) + 1] == b"models\\new_folder\\".ljust(len(LONG_DIR) + 1, b"\0")
+    # Plus long : ajouté en fin de fichier, offset et longueur corrigés
+    assert (new_short_start, new_short) == (len(original), b"models/new_folder/")
+    assert data[short_start:short_start + 3] == SHORT_DIR + b"\0"
+    assert len(data) == len(original) + len(b"models/new_folder/") + 1
+    assert struct.unpack_from("<i", data, vmt_engine.MDL_LENGTH_OFFSET)[0] == len(data)
+    # Le reste de l'en-tête (dont la somme de contrôle) ne bouge pas
+    length_end = vmt_engine.MDL_LENGTH_OFFSET + 4
+    assert data[:vmt_engine.MDL_LENGTH_OFFSET] == original[:vmt_engine.MDL_LENGTH_OFFSET]
+    assert data[length_end:HEADER_SIZE] == original[length_end:HEADER_SIZE]
+
+
+def test_unchanged_and_invalid_models(tmp_path):
+    path = tmp_path / "ok.mdl"
+    _build_mdl(path, [b"models/new_folder/"])
+    result = vmt_engine._patch_mdl_file(str(path), "models/new_folder")
+    assert result["data"] is None and result["changes"] == []
+    (tmp_path / "bad.mdl").write_bytes(b"IDSTshort")
+    assert vmt_engine._patch_mdl_file(str(tmp_path / "bad.mdl"), "models/x")["error"] == "en-tête MDL invalide"
+
+
+def test_patch_tree_writes_and_dry_run(tmp_path, log):
+    models = tmp_path / "models"
+    models.mkdir()
+    original = _build_mdl(models / "a.mdl", [SHORT_DIR])
+    assert vmt_engine.patch_mdl_tree(str(models), "models/new_folder", log, workers=1, dry_run=True) == 1
+    assert (models / "a.mdl").read_bytes() == original
+    assert vmt_engine.patch_mdl_tree(str(models), "models/new_folder", log, workers=1) == 1
+    assert _cdmaterials((models / "a.mdl").read_bytes())[0][1] == b"models/new_folder/"
+    assert vmt_engine.patch_mdl_tree(str(models), "models/new_folder", log, workers=1) == 0
+    assert not log.errors
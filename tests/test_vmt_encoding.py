@@ -0,0 +1,70 @@
+import os
+
+import pytest
+
+import vmt_engine
+
+TEXT = '"VertexLitGeneric"\n{\n\t// matériau : %s\n\t"$basetexture" "models/old/tex"\n}\n'
+REWRITTEN = '"VertexLitGeneric"\n{\n\t// matériau : %s\n\t"$basetexture" "new/p/tex"\n}\n'
+
+# (identifiant, préfixe d'octets, encodage d'écriture, encodage détecté, caractère propre à l'encodage)
+ENCODINGS = [
+    ("utf-8", b"", "utf-8", "utf-8", "ü"),
+    ("utf-8-bom", b"\xef\xbb\xbf", "utf-8", "utf-8", "ü"),
+    ("utf-16-le", b"\xff\xfe", "utf-16-le", "utf-16-le", "ü"),
+    ("utf-16-be", b"\xfe\xff", "utf-16-be", "utf-16-be", "ü"),
+    ("cp1252", b"", "cp1252", "cp1252", "€"),
+    # 0x81 n'existe pas en cp1252 : dernier repli
+    ("latin-1", b"", "latin-1", "latin-1", "\x81"),
+]
+
+
+def _encode(text, bom, enc):
+    return bom + text.replace("\n", os.linesep).encode(enc)
+
+
+@pytest.mark.parametrize("bom, write_enc, detected, char", [case[1:] for case in ENCODINGS],
+                         ids=[case[0] for case in ENCODINGS])
+def test_detect_encoding(bom, write_enc, detected, char):
+    raw = bom + (TEXT % char).encode(write_enc)
+    content, enc = vmt_engine.detect_encoding(raw)
+    assert enc == detected
+    assert content == ("\ufeff" if bom else "") + TEXT % char
+
+
+@pytest.mark.parametrize("bom, write_enc, detected, char", [case[1:] for case in ENCODINGS],
+                         ids=[case[0] for case in ENCODINGS])
+def test_rewrite_round_trip_is_byte_exact(tmp_path, log, bom, write_enc, detected, char):
+    materials = tmp_path / "materials"
+    materials.mkdir()
+    path = materials / "a.vmt"
+    path.write_bytes(_encode(TEXT % char, bom, write_enc))
+    _, plan = vmt_engine.rewrite_vmt_tree(str(materials), "new/p", log, workers=1, use_index=False, validate=False)
+    plan.close()
+    assert path.read_bytes() == _encode(REWRITTEN % char, bom, write_enc)
+    assert not log.errors
+
+
+@pytest.mark.parametrize("bom, write_enc, detected, char", [case[1:] for case in ENCODINGS],
+                         ids=[case[0] for case in ENCODINGS])
+def test_stage_unchanged_content_is_identical(tmp_path, bom, write_enc, detected, char):
+    path = tmp_path / "a.vmt"
+    raw = _encode(TEXT % char, bom, write_enc)
+    path.write_bytes(raw)
+    content, enc = vmt_engine.read_file(str(path))
+    _, nbytes, tmp, backup = vmt_engine._stage_vmt_file(str(path), content.splitlines(keepends=True), enc, False)
+    with open(tmp, "rb") as f:
+        assert f.read() == raw
+    assert nbytes == len(raw) and backup is None
+    os.remove(tmp)
+
+
+def test_wrong_hint_falls_back():
+    raw = (TEXT % "€").encode("cp1252")
+    assert vmt_engine.detect_encoding(raw, encoding_hint="utf-8")[1] == "cp1252"
+    assert vmt_engine.detect_encoding(raw, encoding_hint="cp1252")[1] == "cp1252"
+
+
+def test_crlf_is_normalised_on_read():
+    content, _ = vmt_engine.detect_encoding(b'"a"\r\n{\r\n}\r')
+    assert content == '"a"\n{\n}\n'
@@ -0,0 +1,70 @@
+import os
+
+import vmt_engine
+
+VMT = '"VertexLitGeneric"\n{{\n\t"$basetexture" "{}/tex"\n}}\n'
+
+
+def _make_tree(tmp_path):
+    materials = tmp_path / "materials"
+    for name, folder in (("a", "models/old"), ("b", "models/old"), ("c", "models/new")):
+        path = materials / name / f"{name}.vmt"
+        path.parent.mkdir(parents=True)
+        path.write_text(VMT.format(folder), encoding="utf-8")
+    return materials
+
+
+def _run(materials, log, NEW_PATH="models/new"):
+    """Analyse et réécriture en série ; rend le job pour compter les octets réellement lus"""
+    job = vmt_engine.VMTJob()
+    _, plan = vmt_engine.rewrite_vmt_tree(str(materials), NEW_PATH, log, workers=1, job=job, validate=False)
+    plan.close()
+    return job
+
+
+def test_second_run_skips_clean_files(tmp_path, log):
+    materials = _make_tree(tmp_path)
+    first = _run(materials, log)
+    assert first.files_rewritten == 2
+    assert os.path.exists(vmt_engine.VMTIndex.path_for(str(materials)))
+    second = _run(materials, log)
+    assert (second.files_scanned, second.files_rewritten, second.bytes_processed) == (3, 0, 0)
+    assert "[INDEX] 3 fichiers VMT inchangés ignorés" in log.lines
+    assert not log.errors
+
+
+def test_mtime_or_size_change_invalidates_entry(tmp_path, log):
+    materials = _make_tree(tmp_path)
+    _run(materials, log)
+    touched = materials / "a" / "a.vmt"
+    st = touched.stat()
+    os.utime(touched, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+    assert _run(materials, log).bytes_processed == st.st_size
+
+    grown = materials / "b" / "b.vmt"
+    st = grown.stat()
+    with open(grown, "a", encoding="utf-8") as f:
+        f.write("// fin\n")
+    os.utime(grown, ns=(st.st_atime_ns, st.st_mtime_ns))
+    assert _run(materials, log).bytes_processed == st.st_size + len("// fin\n")
+
+
+def test_new_target_invalidates_every_entry(tmp_path, log):
+    materials = _make_tree(tmp_path)
+    _run(materials, log)
+    job = _run(materials, log, NEW_PATH="models/other")
+    assert job.files_rewritten == 3
+    assert (materials / "c" / "c.vmt").read_text(encoding="utf-8") == VMT.format("models/other")
+    assert _run(materials, log, NEW_PATH="models/other").bytes_processed == 0
+
+
+def test_deleted_file_is_pruned(tmp_path, log):
+    materials = _make_tree(tmp_path)
+    _run(materials, log)
+    os.remove(materials / "a" / "a.vmt")
+    assert _run(materials, log).files_scanned == 2
+    index = vmt_engine.VMTIndex(vmt_engine.VMTIndex.path_for(str(materials)), str(materials))
+    try:
+        assert sorted(index._fingerprints) == ["b/b.vmt", "c/c.vmt"]
+    finally:
+        index.close()
@@ -0,0 +1,91 @@
+import os
+
+import pytest
+
+import vmt_engine
+
+ORIGINAL = '"VertexLitGeneric"\n{\n\t"$basetexture" "models/old/a"\n}\n'
+REWRITTEN = '"VertexLitGeneric"\n{\n\t"$basetexture" "models/new/a"\n}\n'
+
+
+def _read(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return f.read()
+
+
+def _interrupted_pass(tmp_path):
+    """Passe d'écriture interrompue : a.vmt déjà remplacé, b.vmt seulement préparé"""
+    materials = tmp_path / "materials"
+    materials.mkdir()
+    paths = []
+    for name in ("a.vmt", "b.vmt"):
+        path = materials / name
+        path.write_text(ORIGINAL, encoding="utf-8")
+        paths.append(str(path))
+    journal_path = vmt_engine.vmt_journal_path(str(materials))
+    journal = vmt_engine.VMTWriteJournal(journal_path)
+    staged = []
+    for path in paths:
+        _, _, tmp, backup = vmt_engine._stage_vmt_file(path, REWRITTEN.splitlines(keepends=True), "utf-8", True)
+        staged.append((path, tmp, backup))
+    journal.staged(staged)
+    replaced, tmp, _ = staged[0]
+    os.replace(tmp, replaced)
+    journal.replaced([replaced])
+    journal.close()
+    return materials, journal_path, paths
+
+
+def test_resume_finishes_staged_files(tmp_path, log):
+    materials, journal_path, paths = _interrupted_pass(tmp_path)
+    assert vmt_engine.recover_vmt_journal(journal_path, log, mode="resume") == 2
+    assert [_read(path) for path in paths] == [REWRITTEN, REWRITTEN]
+    assert sorted(os.listdir(materials)) == ["a.vmt", "b.vmt"]
+    assert not os.path.exists(journal_path)
+    assert not log.errors
+
+
+def test_rollback_restores_originals(tmp_path, log):
+    materials, journal_path, paths = _interrupted_pass(tmp_path)
+    assert vmt_engine.recover_vmt_journal(journal_path, log, mode="rollback") == 2
+    assert [_read(path) for path in paths] == [ORIGINAL, ORIGINAL]
+    assert sorted(os.listdir(materials)) == ["a.vmt", "b.vmt"]
+    assert not os.path.exists(journal_path)
+    assert log.lines == [f"[RESTAURÉ] {paths[0]}"]
+
+
+def test_truncated_last_line_is_ignored(tmp_path, log):
+    materials, journal_path, paths = _interrupted_pass(tmp_path)
+    with open(journal_path, "a", encoding="utf-8") as f:
+        f.write('{"op": "staged", "pa')
+    vmt_engine.recover_vmt_journal(journal_path, log, mode="rollback")
+    assert [_read(path) for path in paths] == [ORIGINAL, ORIGINAL]
+
+
+def test_cancelled_pass_keeps_journal_for_rollback(tmp_path, log, monkeypatch):
+    materials = tmp_path / "materials"
+    materials.mkdir()
+    paths = []
+    for name in ("a.vmt", "b.vmt", "c.vmt"):
+        path = materials / name
+        path.write_text(ORIGINAL, encoding="utf-8")
+        paths.append(str(path))
+    monkeypatch.setattr(vmt_engine, "VMT_WRITE_BATCH", 1)
+    job = vmt_engine.VMTJob()
+    log_append = log.append
+
+    def cancel_after_first(text):
+        log_append(text)
+        if text.startswith("[MODIFIÉ]"):
+            job.cancel()
+    monkeypatch.setattr(log, "append", cancel_after_first)
+    journal_path = vmt_engine.vmt_journal_path(str(materials))
+    changes = [(path, REWRITTEN.splitlines(keepends=True), "utf-8", None) for path in paths]
+    with pytest.raises(vmt_engine.VMTJobCancelled):
+        vmt_engine.apply_vmt_changes(changes, log, job=job, journal_path=journal_path)
+    assert [_read(path) for path in paths] == [REWRITTEN, ORIGINAL, ORIGINAL]
+    assert os.path.exists(journal_path)
+    assert vmt_engine.recover_vmt_journal(journal_path, log, mode="rollback") == 1
+    assert [_read(path) for path in paths] == [ORIGINAL, ORIGINAL, ORIGINAL]
+    assert sorted(os.listdir(materials)) == ["a.vmt", "b.vmt", "c.vmt"]
+    assert not os.path.exists(journal_path)
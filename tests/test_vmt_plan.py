@@ -0,0 +1,68 @@
+import vmt_engine
+
+VMT = '"VertexLitGeneric"\n{\n\t"$basetexture" "models/old/%s"\n\t"$surfaceprop" "metal"\n}\n'
+
+
+def _analyse(tmp_path, log, names=("a", "b")):
+    materials = tmp_path / "materials"
+    for name in names:
+        path = materials / name / f"{name}.vmt"
+        path.parent.mkdir(parents=True)
+        path.write_text(VMT % name, encoding="utf-8")
+    (materials / "a" / "clean.vmt").write_text(VMT.replace("models/old", "new/p") % "c", encoding="utf-8")
+    _, plan = vmt_engine.replace_paths_in_vmt(str(materials), "new/p", log, workers=1)
+    return materials, plan
+
+
+def test_write_diff(tmp_path, log):
+    materials, plan = _analyse(tmp_path, log)
+    try:
+        assert len(plan) == 2
+        diff_path = tmp_path / "plan.diff"
+        assert plan.write_diff(str(diff_path), root=str(materials), log_widget=log) == 2
+    finally:
+        plan.close()
+    # Un bloc par fichier, dans l'ordre du parcours
+    blocks = ["--- " + block for block in diff_path.read_text(encoding="utf-8").split("--- ") if block]
+    assert sorted(blocks) == [
+        "--- a/%s/%s.vmt\n+++ b/%s/%s.vmt\n@@ -1,5 +1,5 @@\n"
+        ' "VertexLitGeneric"\n {\n-\t"$basetexture" "models/old/%s"\n+\t"$basetexture" "new/p/%s"\n'
+        ' \t"$surfaceprop" "metal"\n }\n' % ((name,) * 6) for name in ("a", "b")]
+
+
+def test_diff_marks_missing_final_newline(tmp_path, log):
+    materials = tmp_path / "materials"
+    materials.mkdir()
+    (materials / "a.vmt").write_text('"UnlitGeneric" { "$basetexture" "models/old/a" }', encoding="utf-8")
+    _, plan = vmt_engine.replace_paths_in_vmt(str(materials), "new/p", log, workers=1)
+    try:
+        plan.write_diff(str(tmp_path / "plan.diff"), root=str(materials))
+    finally:
+        plan.close()
+    assert (tmp_path / "plan.diff").read_text(encoding="utf-8").endswith(
+        '+"UnlitGeneric" { "$basetexture" "new/p/a" }\n\\ No newline at end of file\n')
+
+
+def test_source_changed_since_analysis_is_skipped(tmp_path, log):
+    materials, plan = _analyse(tmp_path, log)
+    edited = materials / "b" / "b.vmt"
+    edited.write_text(VMT % "b" + "// modifié à la main\n", encoding="utf-8")
+    try:
+        changes = list(plan.iter_changes(log))
+        assert [fullpath for fullpath, *_ in changes] == [str(materials / "a" / "a.vmt")]
+        assert log.lines[-1] == f"[IGNORÉ] {edited} a changé depuis l'analyse"
+        vmt_engine.apply_vmt_changes(plan.iter_changes(log), log)
+    finally:
+        plan.close()
+    assert (materials / "a" / "a.vmt").read_text(encoding="utf-8") == VMT.replace("models/old", "new/p") % "a"
+    assert edited.read_text(encoding="utf-8") == VMT % "b" + "// modifié à la main\n"
+
+
+def test_deleted_source_is_reported(tmp_path, log):
+    materials, plan = _analyse(tmp_path, log)
+    (materials / "a" / "a.vmt").unlink()
+    try:
+        assert len(list(plan.iter_changes(log))) == 1
+    finally:
+        plan.close()
+    assert log.errors == [f"[ERREUR LECTURE] {materials / 'a' / 'a.vmt'} -> Impossible de lire {materials / 'a' / 'a.vmt'}"]
@@ -0,0 +1,37 @@
+import os
+
+import vmt_engine
+
+VMT = ('"VertexLitGeneric"\n{\n\t"$basetexture" "models/A/Tex"\n\t"$bumpmap" "materials/models/a/missing_n.vtf"\n'
+       '\t"$surfaceprop" "metal"\n\t"$envmap" "env_cubemap"\n}\n')
+
+
+def _make_tree(tmp_path):
+    materials = tmp_path / "materials"
+    for name, content in (("models/a/a.vmt", VMT), ("models/a/tex.vtf", "VTF"), ("models/a/orphan.vtf", "VTF"),
+                          ("models/b/TEX.vtf", "VTF")):
+        path = materials / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content, encoding="utf-8")
+    return materials
+
+
+def test_missing_and_orphans(tmp_path, log):
+    materials = _make_tree(tmp_path)
+    vmt_path = str(materials / "models" / "a" / "a.vmt")
+    graph = vmt_engine.report_vmt_references(str(materials), log, workers=1)
+    # La casse ne compte pas : models/A/Tex désigne models/a/tex.vtf ; env_cubemap n'est pas un fichier
+    assert graph.missing() == [(vmt_path, "$bumpmap", "materials/models/a/missing_n.vtf")]
+    assert graph.orphans() == sorted([str(materials / "models" / "a" / "orphan.vtf"),
+                                      str(materials / "models" / "b" / "TEX.vtf")])
+    assert graph.referenced_vtfs() == {os.path.normcase(str(materials / "models" / "a" / "tex.vtf"))}
+    assert log.lines[-1] == "[RÉFÉRENCES] 1 VMT, 3 VTF, 1 textures manquantes, 2 orphelines"
+    assert f"[MANQUANTE] {vmt_path} -> $bumpmap materials/models/a/missing_n.vtf" in log.lines
+
+
+def test_graph_from_index_matches_fresh_scan(tmp_path, log):
+    materials = _make_tree(tmp_path)
+    first = vmt_engine.build_vmt_reference_graph(str(materials), log, workers=1)
+    second = vmt_engine.build_vmt_reference_graph(str(materials), log, workers=1)
+    assert second.vmt_refs == first.vmt_refs
+    assert any(line.startswith("[INDEX] 1 VMT inchangés") for line in log.lines)
@@ -0,0 +1,87 @@
+import pytest
+
+import vmt_engine
+
+CASES = {
+    "commentaire-bloc": (
+        '"VertexLitGeneric"\n{\n\t/* ancien :\n\t"$basetexture" "models/old/a"\n\t*/\n\t"$basetexture" "models/old/b"\n}\n',
+        '"VertexLitGeneric"\n{\n\t/* ancien :\n\t"$basetexture" "models/old/a"\n\t*/\n\t"$basetexture" "new/p/b"\n}\n',
+        [("$basetexture", "models/old/b", "new/p/b")],
+    ),
+    "commentaire-ligne": (
+        '"VertexLitGeneric"\n{\n\t"$basetexture" "models/old/a" // models/old/c\n}\n',
+        '"VertexLitGeneric"\n{\n\t"$basetexture" "new/p/a" // models/old/c\n}\n',
+        [("$basetexture", "models/old/a", "new/p/a")],
+    ),
+    "sans-guillemets": (
+        "VertexLitGeneric\n{\n\t$basetexture models\\old\\a\n\t$bumpmap 'models/old/n'\n}\n",
+        "VertexLitGeneric\n{\n\t$basetexture new/p/a\n\t$bumpmap 'new/p/n'\n}\n",
+        [("$basetexture", "models/old/a", "new/p/a"), ("$bumpmap", "models/old/n", "new/p/n")],
+    ),
+    "clé-valeur-sur-deux-lignes": (
+        '"VertexLitGeneric"\n{\n\t"$basetexture"\n\t"models/old/a"\n}\n',
+        '"VertexLitGeneric"\n{\n\t"$basetexture"\n\t"new/p/a"\n}\n',
+        [("$basetexture", "models/old/a", "new/p/a")],
+    ),
+    "proxies": (
+        '"VertexLitGeneric"\n{\n\t"$basetexture" "models/old/a"\n\t"Proxies"\n\t{\n\t\t"AnimatedTexture"\n\t\t{\n'
+        '\t\t\t"animatedtexturevar" "$basetexture"\n\t\t}\n\t}\n\t"$detail" "models/old/d"\n}\n',
+        '"VertexLitGeneric"\n{\n\t"$basetexture" "new/p/a"\n\t"Proxies"\n\t{\n\t\t"AnimatedTexture"\n\t\t{\n'
+        '\t\t\t"animatedtexturevar" "$basetexture"\n\t\t}\n\t}\n\t"$detail" "new/p/d"\n}\n',
+        [("$basetexture", "models/old/a", "new/p/a"), ("$detail", "models/old/d", "new/p/d")],
+    ),
+    "conditions": (
+        '"VertexLitGeneric"\n{\n\t"$basetexture" "models/old/a" [$WIN32]\n'
+        '\t"$basetexture" "models/old/x" [!$WIN32]\n\t"$envmap" "env_cubemap"\n}\n',
+        '"VertexLitGeneric"\n{\n\t"$basetexture" "new/p/a" [$WIN32]\n'
+        '\t"$basetexture" "new/p/x" [!$WIN32]\n\t"$envmap" "env_cubemap"\n}\n',
+        [("$basetexture", "models/old/a", "new/p/a"), ("$basetexture", "models/old/x", "new/p/x")],
+    ),
+    "guillemet-non-fermé": (
+        '"VertexLitGeneric"\n{\n\t"$basetexture" "models/old/a\n\t"$bumpmap" "models/old/n"\n}\n',
+        '"VertexLitGeneric"\n{\n\t"$basetexture" "new/p/a\n\t"$bumpmap" "new/p/n"\n}\n',
+        [("$basetexture", "models/old/a", "new/p/a"), ("$bumpmap", "models/old/n", "new/p/n")],
+    ),
+}
+
+
+@pytest.mark.parametrize("text, expected, changes", CASES.values(), ids=CASES.keys())
+def test_rewrite(text, expected, changes):
+    assert vmt_engine._rewrite_vmt_text(text, "new/p") == (expected, changes)
+
+
+def test_rewrite_keeps_line_count():
+    for text, _, _ in CASES.values():
+        new_lines, _ = vmt_engine._rewrite_vmt_lines(text.splitlines(keepends=True), "new/p")
+        assert len(new_lines) == len(text.splitlines())
+
+
+def test_unchanged_text_is_returned_as_is():
+    text = '"UnlitGeneric"\n{\n\t"$basetexture" "new/p/a"\n}\n'
+    assert vmt_engine._rewrite_vmt_text(text, "new/p")[0] is text
+
+
+def _tokens(text):
+    return [(kind, text[start:end]) for kind, start, end in vmt_engine.tokenize_keyvalues(text)]
+
+
+def test_tokens_nested_blocks_and_conditionals():
+    text = CASES["proxies"][0]
+    assert _tokens(text) == [
+        (vmt_engine.KV_KEY, "VertexLitGeneric"), (vmt_engine.KV_OPEN, "{"),
+        (vmt_engine.KV_KEY, "$basetexture"), (vmt_engine.KV_VALUE, "models/old/a"),
+        (vmt_engine.KV_KEY, "Proxies"), (vmt_engine.KV_OPEN, "{"),
+        (vmt_engine.KV_KEY, "AnimatedTexture"), (vmt_engine.KV_OPEN, "{"),
+        (vmt_engine.KV_KEY, "animatedtexturevar"), (vmt_engine.KV_VALUE, "$basetexture"),
+        (vmt_engine.KV_CLOSE, "}"), (vmt_engine.KV_CLOSE, "}"),
+        (vmt_engine.KV_KEY, "$detail"), (vmt_engine.KV_VALUE, "models/old/d"), (vmt_engine.KV_CLOSE, "}"),
+    ]
+    assert (vmt_engine.KV_CONDITIONAL, "[!$WIN32]") in _tokens(CASES["conditions"][0])
+
+
+def test_tokens_skip_comments_and_stop_quotes_at_line_end():
+    assert _tokens(CASES["commentaire-bloc"][0])[2:4] == [
+        (vmt_engine.KV_KEY, "$basetexture"), (vmt_engine.KV_VALUE, "models/old/b")]
+    assert _tokens(CASES["guillemet-non-fermé"][0])[2:6] == [
+        (vmt_engine.KV_KEY, "$basetexture"), (vmt_engine.KV_VALUE, "models/old/a"),
+        (vmt_engine.KV_KEY, "$bumpmap"), (vmt_engine.KV_VALUE, "models/old/n")]
@@ -0,0 +1,66 @@
+import pytest
+
+import vmt_engine
+
+
+def test_longest_prefix_wins():
+    rules = vmt_engine.VMTRewriteRules([("models", "props", None), ("models/old", "models/new", None),
+                                        ("models/old/pack", "packs", None)])
+    assert rules.rewrite("$basetexture", "models/x/a") == "props/x/a"
+    assert rules.rewrite("$basetexture", "models/old/x/a") == "models/new/x/a"
+    assert rules.rewrite("$basetexture", "models/old/pack/a") == "packs/a"
+    # Un préfixe correspond dossier par dossier, pas caractère par caractère
+    assert rules.rewrite("$basetexture", "models/older/a") == "props/older/a"
+    assert rules.rewrite("$basetexture", "other/a") is None
+
+
+def test_key_rule_overrides_general_rule():
+    rules = vmt_engine.VMTRewriteRules([("models/old", "models/new", None),
+                                        ("models/old", "models/bump", ["$bumpmap", "$normalmap"])])
+    assert rules.rewrite("$basetexture", "models/old/a") == "models/new/a"
+    assert rules.rewrite("$BumpMap", "models/old/a") == "models/bump/a"
+    # Une règle filtrée plus longue passe avant une règle générale plus courte, pour ses clés seulement
+    rules = vmt_engine.VMTRewriteRules([("models", "general", None), ("models/old", "filtered", ["$detail"])])
+    assert rules.rewrite("$detail", "models/old/a") == "filtered/a"
+    assert rules.rewrite("$basetexture", "models/old/a") == "general/old/a"
+
+
+def test_matching_is_case_insensitive_and_keeps_the_rest():
+    rules = vmt_engine.VMTRewriteRules([("Models\\Old\\", "/models/New/", None)])
+    assert rules.rewrite("$basetexture", "MODELS/old/Sub/Tex") == "models/New/Sub/Tex"
+    assert rules.rewrite("$basetexture", "models//old/tex") == "models/New/tex"
+    assert rules.rewrite("$basetexture", "models/old") == "models/New"
+
+
+def test_empty_new_prefix_strips_the_folder():
+    rules = vmt_engine.VMTRewriteRules([("materials", "", None)])
+    assert rules.rewrite("$basetexture", "materials/models/a") == "models/a"
+
+
+def test_from_file(tmp_path):
+    path = tmp_path / "rules.txt"
+    path.write_text("\ufeff# règles\n\n// commentaire\nmodels/old -> models/new\n"
+                    "models/old -> models/bump | $bumpmap, $normalmap\n", encoding="utf-8")
+    rules = vmt_engine.VMTRewriteRules.from_file(str(path))
+    assert rules.count == 2
+    assert rules.rewrite("$normalmap", "models/old/a") == "models/bump/a"
+    assert rules.rewrite("$basetexture", "models/old/a") == "models/new/a"
+    # Même table, même signature pour l'index incrémental
+    assert rules.signature == vmt_engine.VMTRewriteRules.from_file(str(path)).signature
+    assert rules.signature != vmt_engine.VMTRewriteRules([("models/old", "models/new", None)]).signature
+
+
+@pytest.mark.parametrize("line", ["models/old models/new", " -> models/new"])
+def test_from_file_rejects_malformed_rule(tmp_path, line):
+    path = tmp_path / "rules.txt"
+    path.write_text(f"models/a -> models/b\n{line}\n", encoding="utf-8")
+    with pytest.raises(Exception, match="ligne 2"):
+        vmt_engine.VMTRewriteRules.from_file(str(path))
+
+
+def test_rules_in_rewrite_keep_unmatched_values():
+    rules = vmt_engine.VMTRewriteRules([("models/old", "models/new", None)])
+    text = '"VertexLitGeneric"\n{\n\t"$basetexture" "models/old/a"\n\t"$detail" "detail/noise"\n}\n'
+    assert vmt_engine._rewrite_vmt_text(text, rules) == (
+        '"VertexLitGeneric"\n{\n\t"$basetexture" "models/new/a"\n\t"$detail" "detail/noise"\n}\n',
+        [("$basetexture", "models/old/a", "models/new/a"), ("$detail", "detail/noise", "detail/noise")])
@@ -0,0 +1,39 @@
+import vmt_engine
+
+VMT = ('"VertexLitGeneric"\n{\n\t"$basetexture" "models/A/Tex"\n\t"$bumpmap" "materials/models/a/missing_n.vtf"\n'
+       '\t"$surfaceprop" "metal"\n\t"$envmap" "env_cubemap"\n}\n')
+
+
+def _make_tree(tmp_path):
+    materials = tmp_path / "materials"
+    for name, content in (("models/a/a.vmt", VMT), ("models/a/tex.vtf", "VTF"), ("models/a/orphan.vtf", "VTF"),
+                          ("models/b/TEX.vtf", "VTF")):
+        path = materials / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content, encoding="utf-8")
+    return materials
+
+
+def test_validation_reports_unresolved_paths(tmp_path, log):
+    materials = _make_tree(tmp_path)
+    vmt_path = str(materials / "models" / "a" / "a.vmt")
+    _, plan = vmt_engine.rewrite_vmt_tree(str(materials), "models/b", log, workers=1, use_index=False, dry_run=True)
+    try:
+        # models/b/Tex est trouvée malgré la casse, models/b/missing_n non
+        assert plan.unresolved == {"models/b/missing_n.vtf": [vmt_path]}
+    finally:
+        plan.close()
+    assert f"[NON RÉSOLUE] models/b/missing_n.vtf (1 VMT, ex. {vmt_path})" in log.lines
+    assert f"[VALIDATION] 2 références vérifiées dans {materials}, 1 chemins non résolus" in log.lines
+
+
+def test_validation_against_other_tree(tmp_path, log):
+    materials = _make_tree(tmp_path)
+    target = tmp_path / "target"
+    (target / "models" / "b").mkdir(parents=True)
+    for name in ("tex.vtf", "missing_n.vtf"):
+        (target / "models" / "b" / name).write_text("VTF", encoding="utf-8")
+    _, plan = vmt_engine.rewrite_vmt_tree(str(materials), "models/b", log, workers=1, use_index=False, dry_run=True,
+                                          validate_root=str(target))
+    plan.close()
+    assert plan.unresolved == {}
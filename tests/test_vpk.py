@@ -0,0 +1,98 @@
+import struct
+import zlib
+
+import vmt_engine
+
+VMT = b'"VertexLitGeneric"\r\n{\r\n\t"$basetexture" "old/dir/tex"\r\n\t"$surfaceprop" "metal"\r\n}\r\n'
+
+# nom -> (contenu, octets préchargés, index d'archive)
+FILES = {
+    "materials/a/dir.vmt": (VMT, 0, vmt_engine.VPK_DIR_ARCHIVE),
+    "materials/a/preload.vmt": (VMT, 8, 0),
+    "materials/b/archive.vmt": (VMT, 0, 0),
+    "materials/b/ok.vmt": (b'"UnlitGeneric" { "$basetexture" "new/p/ok" }', 0, 0),
+    "materials/b/archive.vtf": (bytes(range(256)) * 20, 16, 0),
+    "materials/a/dir.vtf": (b"VTF" * 300, 0, vmt_engine.VPK_DIR_ARCHIVE),
+    "readme": (b"hello", 5, 0),
+}
+
+
+def _build_vpk(directory):
+    """Écrit pak_dir.vpk (version 2) et pak_000.vpk à partir de FILES"""
+    tree = {}
+    dir_data = bytearray()
+    archive = bytearray()
+    for name, (data, preload_size, archive_index) in FILES.items():
+        path, _, filename = name.rpartition("/")
+        filename, _, ext = filename.partition(".")
+        preload, rest = data[:preload_size], data[preload_size:]
+        section = dir_data if archive_index == vmt_engine.VPK_DIR_ARCHIVE else archive
+        offset = len(section)
+        section += rest
+        tree.setdefault(ext or " ", {}).setdefault(path or " ", []).append(
+            (filename, zlib.crc32(data), preload, archive_index, offset, len(rest)))
+    out = bytearray()
+    for ext, paths in tree.items():
+        out += ext.encode() + b"\0"
+        for path, items in paths.items():
+            out += path.encode() + b"\0"
+            for filename, crc, preload, archive_index, offset, length in items:
+                out += filename.encode() + b"\0"
+                out += struct.pack("<IHHIIH", crc, len(preload), archive_index, offset, length, 0xFFFF) + preload
+            out += b"\0"
+        out += b"\0"
+    out += b"\0"
+    header = struct.pack("<IIIIIII", vmt_engine.VPK_SIGNATURE, 2, len(out), len(dir_data), 0, 0, 0)
+    dir_path = directory / "pak_dir.vpk"
+    dir_path.write_bytes(header + out + dir_data)
+    (directory / "pak_000.vpk").write_bytes(archive)
+    return str(dir_path)
+
+
+def _read_all(dir_path):
+    archive = vmt_engine.VPKArchive(dir_path)
+    try:
+        contents = {}
+        for name, entry in archive.entries.items():
+            data = archive.read(entry)
+            assert zlib.crc32(data) == entry.crc, name
+            contents[name] = data
+        return contents
+    finally:
+        archive.close()
+
+
+def test_read_matches_source(tmp_path):
+    dir_path = _build_vpk(tmp_path)
+    assert _read_all(dir_path) == {name: data for name, (data, _, _) in FILES.items()}
+
+
+def test_rewrite_to_output_keeps_other_entries(tmp_path, log):
+    dir_path = _build_vpk(tmp_path)
+    out_path = str(tmp_path / "out_dir.vpk")
+    assert vmt_engine.rewrite_vpk(dir_path, "new/p", log, output_path=out_path, workers=1) == 3
+    rewritten = _read_all(out_path)
+    expected = VMT.replace(b"old/dir/tex", b"new/p/tex")
+    for name, (data, _, _) in FILES.items():
+        changed = name.endswith(".vmt") and name != "materials/b/ok.vmt"
+        assert rewritten[name] == (expected if changed else data), name
+    # Archive source intacte
+    assert _read_all(dir_path) == {name: data for name, (data, _, _) in FILES.items()}
+    assert not log.errors
+
+
+def test_rewrite_in_place_then_noop(tmp_path, log):
+    dir_path = _build_vpk(tmp_path)
+    archive_before = (tmp_path / "pak_000.vpk").read_bytes()
+    assert vmt_engine.rewrite_vpk(dir_path, "new/p", log, workers=1) == 3
+    assert (tmp_path / "pak_000.vpk").read_bytes() == archive_before
+    first = _read_all(dir_path)
+    assert vmt_engine.rewrite_vpk(dir_path, "new/p", log, workers=1) == 0
+    assert _read_all(dir_path) == first
+
+
+def test_dry_run_writes_nothing(tmp_path, log):
+    dir_path = _build_vpk(tmp_path)
+    before = (tmp_path / "pak_dir.vpk").read_bytes()
+    assert vmt_engine.rewrite_vpk(dir_path, "new/p", log, workers=1, dry_run=True) == 3
+    assert (tmp_path / "pak_dir.vpk").read_bytes() == before
@@ -0,0 +1,3019 @@
+"""Moteur VMT de aa.py : réécriture des chemins, index, archives (VPK, GMA, BSP), modèles et CLI.
+
+N'importe ni PyQt5 ni requests : les processus du pool (spawn) et le mode sans interface
+ne chargent que ce module.
+"""
+import hashlib
+
+import os
+
+import re
+
+import shutil
+
+import sys
+
+import threading
+
+import time
+
+
+# ------------------ Fonctions VMT/Dossier ------------------
+
+# Ordre d'essai des encodages quand le fichier n'a pas de BOM
+VMT_FALLBACK_ENCODINGS = ('utf-8', 'cp1252', 'latin-1')
+
+# Le BOM est conservé dans le texte décodé pour être réécrit tel quel
+_BOM_ENCODINGS = (
+    (b'\xef\xbb\xbf', 'utf-8'),
+    (b'\xff\xfe', 'utf-16-le'),
+    (b'\xfe\xff', 'utf-16-be'),
+)
+
+
+def detect_encoding(raw, encoding_hint=None):
+    """Décode des octets déjà lus : indice connu, puis BOM, puis UTF-8 strict, puis repli 8 bits.
+
+    Retourne (texte, encodage). Le fichier n'est jamais relu pour essayer l'encodage suivant.
+    """
+    candidates = []
+    if encoding_hint:
+        candidates.append(encoding_hint)
+    for bom, enc in _BOM_ENCODINGS:
+        if raw.startswith(bom):
+            candidates.append(enc)
+            break
+    candidates.extend(VMT_FALLBACK_ENCODINGS)
+    for enc in candidates:
+        try:
+            content = raw.decode(enc)
+        except (UnicodeDecodeError, LookupError):
+            continue
+        # Même normalisation des fins de ligne qu'une lecture en mode texte
+        if '\r' in content:
+            content = content.replace('\r\n', '\n').replace('\r', '\n')
+        return content, enc
+    raise UnicodeDecodeError(candidates[-1], raw, 0, len(raw), "aucun encodage ne convient")
+
+
+def read_file(path, encoding_hint=None):
+    try:
+        with open(path, 'rb') as f:
+            raw = f.read()
+    except OSError:
+        raise Exception(f"Impossible de lire {path}")
+    return detect_encoding(raw, encoding_hint)
+
+
+# Nombre de processus du moteur VMT (0 = automatique selon les coeurs, 1 = série)
+VMT_WORKERS = 0
+
+# En dessous de ce nombre de fichiers, le pool coûte plus cher qu'il ne rapporte
+VMT_PARALLEL_MIN_FILES = 64
+
+# Nombre maximal de fichiers envoyés à un processus en une seule fois
+VMT_CHUNK_SIZE = 64
+
+
+class VMTJobCancelled(Exception):
+    """Levée quand l'utilisateur annule une opération VMT en cours"""
+
+
+class VMTJob:
+    """Compteurs et annulation partagés entre une opération VMT et le thread qui l'exécute"""
+
+    def __init__(self):
+        self.files_scanned = 0
+        self.files_rewritten = 0
+        self.bytes_processed = 0
+        self._cancel_event = threading.Event()
+        # Plusieurs étapes peuvent compter en même temps (VMT et modèles)
+        self._counters_lock = threading.Lock()
+
+    def cancel(self):
+        self._cancel_event.set()
+
+    def is_cancelled(self):
+        return self._cancel_event.is_set()
+
+    def check_cancelled(self):
+        if self._cancel_event.is_set():
+            raise VMTJobCancelled("Opération annulée")
+
+    def add_scanned(self, count=1, nbytes=0):
+        with self._counters_lock:
+            self.files_scanned += count
+            self.bytes_processed += nbytes
+
+    def add_rewritten(self, count=1, nbytes=0):
+        with self._counters_lock:
+            self.files_rewritten += count
+            self.bytes_processed += nbytes
+
+
+# Suffixe du fichier d'index incrémental, créé à côté du dossier materials
+VMT_INDEX_SUFFIX = ".vmtindex.sqlite"
+
+
+class VMTIndex:
+    """Index SQLite des VMT déjà analysés : empreinte mtime/taille, hash, encodage et références.
+
+    Un fichier dont l'empreinte n'a pas bougé et qui est déjà à jour pour NEW_PATH
+    n'est plus relu lors des exécutions suivantes.
+    """
+
+    # 2 : références extraites par tokenize_keyvalues (toutes les clés, valeurs sans guillemets)
+    SCHEMA_VERSION = 2
+
+    def __init__(self, db_path, materials_dir):
+        import sqlite3
+        self.db_path = db_path
+        self.root = os.path.abspath(materials_dir)
+        self.conn = sqlite3.connect(db_path)
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        version = self.conn.execute("PRAGMA user_version").fetchone()[0]
+        if version != self.SCHEMA_VERSION:
+            self.conn.execute("DROP TABLE IF EXISTS vmt_files")
+            self.conn.execute("DROP TABLE IF EXISTS vmt_texture_refs")
+            self.conn.execute(f"PRAGMA user_version={self.SCHEMA_VERSION}")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS vmt_files ("
+            " path TEXT PRIMARY KEY, mtime_ns INTEGER, size INTEGER, sha1 TEXT,"
+            " encoding TEXT, refs TEXT, clean_for TEXT)"
+        )
+        # Références de textures du graphe VMT -> VTF, avec leur propre empreinte
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS vmt_texture_refs ("
+            " path TEXT PRIMARY KEY, mtime_ns INTEGER, size INTEGER, refs TEXT)"
+        )
+        self._texture_refs = None
+        # Empreintes chargées en une requête : pas d'aller-retour SQLite par fichier
+        self._fingerprints = {
+            path: (mtime_ns, size, clean_for, encoding)
+            for path, mtime_ns, size, clean_for, encoding in self.conn.execute(
+                "SELECT path, mtime_ns, size, clean_for, encoding FROM vmt_files"
+            )
+        }
+        self._pending_writes = {}
+        self._seen = set()
+
+    @staticmethod
+    def path_for(materials_dir):
+        root = os.path.abspath(materials_dir).rstrip("\\/")
+        return os.path.join(os.path.dirname(root), "." + os.path.basename(root) + VMT_INDEX_SUFFIX)
+
+    @classmethod
+    def open_for(cls, materials_dir, log_widget):
+        """Ouvre l'index du dossier, ou retourne None si son emplacement n'est pas accessible en écriture"""
+        db_path = cls.path_for(materials_dir)
+        try:
+            return cls(db_path, materials_dir)
+        except Exception as e:
+            log_widget.append(f"[INFO] Index VMT indisponible ({db_path}): {e}")
+            return None
+
+    def _key(self, fullpath):
+        return os.path.relpath(fullpath, self.root).replace('\\', '/')
+
+    def is_clean(self, fullpath, st, NEW_PATH):
+        """Vrai si le fichier n'a pas changé depuis la dernière analyse et ne demande aucune réécriture"""
+        key = self._key(fullpath)
+        self._seen.add(key)
+        return self._fingerprints.get(key, ())[:3] == (st.st_mtime_ns, st.st_size, vmt_target_id(NEW_PATH))
+
+    def encoding_hint(self, fullpath, st):
+        """Encodage détecté lors de la dernière lecture, si le fichier n'a pas changé depuis"""
+        row = self._fingerprints.get(self._key(fullpath))
+        if row and row[:2] == (st.st_mtime_ns, st.st_size):
+            return row[3]
+        return None
+
+    def _store(self, key, mtime_ns, size, sha1, encoding, refs, clean_for):
+        import json
+        self.conn.execute(
+            "INSERT OR REPLACE INTO vmt_files (path, mtime_ns, size, sha1, encoding, refs, clean_for)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (key, mtime_ns, size, sha1, encoding, json.dumps(refs), clean_for),
+        )
+        self._fingerprints[key] = (mtime_ns, size, clean_for, encoding)
+
+    def record(self, st, result, NEW_PATH):
+        """Enregistre le résultat d'analyse d'un fichier lu avec l'empreinte st"""
+        key = self._key(result["path"])
+        clean_for = None if result["changed"] else vmt_target_id(NEW_PATH)
+        self._store(key, st.st_mtime_ns, st.st_size, result["sha1"], result["encoding"], result["refs"], clean_for)
+        if result["changed"]:
+            self._pending_writes[result["path"]] = (result["encoding"], result["refs"], vmt_target_id(NEW_PATH) if result["stable"] else None)
+
+    def record_written(self, fullpath, content):
+        """Met à jour l'empreinte d'un fichier que apply_vmt_changes vient de réécrire"""
+        pending = self._pending_writes.pop(fullpath, None)
+        if pending is None:
+            return
+        encoding, refs, clean_for = pending
+        st = os.stat(fullpath)
+        sha1 = hashlib.sha1(content.encode("utf-8", "surrogatepass")).hexdigest()
+        self._store(self._key(fullpath), st.st_mtime_ns, st.st_size, sha1, encoding, refs, clean_for)
+
+    def cached_texture_refs(self, fullpath, st):
+        """Références de textures déjà extraites de ce fichier, ou None s'il a changé depuis"""
+        import json
+        if self._texture_refs is None:
+            self._texture_refs = {
+                path: (mtime_ns, size, refs)
+                for path, mtime_ns, size, refs in self.conn.execute(
+                    "SELECT path, mtime_ns, size, refs FROM vmt_texture_refs"
+                )
+            }
+        row = self._texture_refs.get(self._key(fullpath))
+        if row and row[:2] == (st.st_mtime_ns, st.st_size):
+            return json.loads(row[2])
+        return None
+
+    def record_texture_refs(self, fullpath, st, refs):
+        import json
+        self.conn.execute(
+            "INSERT OR REPLACE INTO vmt_texture_refs (path, mtime_ns, size, refs) VALUES (?, ?, ?, ?)",
+            (self._key(fullpath), st.st_mtime_ns, st.st_size, json.dumps(refs)),
+        )
+
+    def prune_texture_refs(self, seen_paths):
+        """Retire les références des VMT qui n'existent plus (après un parcours complet)"""
+        seen = {self._key(fullpath) for fullpath in seen_paths}
+        known = self._texture_refs or {}
+        self.conn.executemany("DELETE FROM vmt_texture_refs WHERE path = ?",
+                              [(key,) for key in known if key not in seen])
+
+    def prune_unseen(self):
+        """Retire de l'index les fichiers qui n'existent plus (après un parcours complet)"""
+        gone = [(key,) for key in self._fingerprints if key not in self._seen]
+        self.conn.executemany("DELETE FROM vmt_files WHERE path = ?", gone)
+        for (key,) in gone:
+            del self._fingerprints[key]
+
+    def close(self):
+        self.conn.commit()
+        self.conn.close()
+
+
+def vmt_worker_count(workers=None):
+    """Retourne le nombre de processus à utiliser pour le moteur VMT"""
+    if workers is None:
+        workers = VMT_WORKERS
+    if workers <= 0:
+        workers = os.cpu_count() or 1
+    return max(1, workers)
+
+
+# Types de jetons rendus par tokenize_keyvalues
+KV_KEY, KV_VALUE, KV_OPEN, KV_CLOSE, KV_CONDITIONAL = range(5)
+
+# Caractères que str.splitlines considère comme fins de ligne : aucun jeton ne les traverse,
+# ce qui garde la correspondance ligne à ligne utilisée par le plan de modifications
+_KV_LINE_BREAKS = '\n\r\v\f\x1c\x1d\x1e\x85\u2028\u2029'
+
+# Une chaîne entre guillemets (sans échappement, comme dans les VMT) ou une valeur sans guillemets
+_KV_STRING = rf'(?:"([^"{_KV_LINE_BREAKS}]*)"?|(?!//|/\*|\[)([^\s"{{}}]+))'
+
+# Grammaire KeyValues des VMT. Les blancs entre jetons sont sautés par finditer.
+#   1 commentaire // ou /* */ (même sur plusieurs lignes)   2 accolade   3 condition [$X360]
+#   4/5 chaîne, suivie sur la même ligne de 6/7 chaîne : une paire clé valeur est lue en une seule correspondance
+_KV_TOKEN_PATTERN = re.compile(
+    r'(//[^\n]*|/\*.*?(?:\*/|\Z))'
+    r'|([{}])'
+    rf'|(\[[^\]{_KV_LINE_BREAKS}]*\]?)'
+    rf'|{_KV_STRING}(?:[ \t]+{_KV_STRING})?',
+    re.DOTALL,
+)
+
+
+def tokenize_keyvalues(text):
+    """Découpe un texte KeyValues en une seule passe linéaire.
+
+    Rend des tuples (type, début, fin) : type vaut KV_KEY, KV_VALUE, KV_OPEN, KV_CLOSE ou
+    KV_CONDITIONAL, et text[début:fin] est le contenu du jeton sans ses guillemets.
+    Les commentaires ne produisent aucun jeton.
+    """
+    expect_value = False
+    for m in _KV_TOKEN_PATTERN.finditer(text):
+        group = m.lastindex
+        if group == 1:
+            continue
+        if group == 2:
+            # "clé" { ... } : l'accolade remplace la valeur
+            expect_value = False
+            yield (KV_OPEN if m.group(2) == '{' else KV_CLOSE), m.start(), m.end()
+        elif group == 3:
+            yield KV_CONDITIONAL, m.start(), m.end()
+        else:
+            strings = [m.span(4 if m.start(4) >= 0 else 5)]
+            if group >= 6:
+                strings.append(m.span(group))
+            for start, end in strings:
+                yield (KV_VALUE if expect_value else KV_KEY), start, end
+                expect_value = not expect_value
+
+
+# Une valeur sans guillemets qui contiendrait ces caractères doit être réécrite entre guillemets
+_KV_NEEDS_QUOTES = re.compile(r'[\s"{}]')
+
+
+class VMTRewriteRules:
+    """Table de règles "ancien préfixe -> nouveau préfixe", compilée en arbre de préfixes par dossier.
+
+    Un chemin est comparé en un seul parcours de ses dossiers, quel que soit le nombre de règles :
+    le plus long préfixe qui correspond gagne, la suite du chemin est conservée. Une règle peut
+    être limitée à certaines clés ($basetexture, $bumpmap...) ; à préfixe égal elle passe avant
+    la règle sans filtre. S'utilise partout à la place de NEW_PATH.
+
+    Format du fichier, une règle par ligne (# pour les commentaires) :
+        models/old_pack -> models/new_pack
+        models/props_c17 -> models/props/c17 | $basetexture $bumpmap
+    """
+
+    def __init__(self, rules):
+        # Noeud : (enfants par nom de dossier en minuscules, règles [(clés ou None, nouveau préfixe)])
+        self._root = ({}, [])
+        normalized = []
+        for old_prefix, new_prefix, keys in rules:
+            old_prefix = old_prefix.replace('\\', '/').strip('/')
+            new_prefix = new_prefix.replace('\\', '/').strip('/')
+            keys = frozenset(key.lower() for key in keys) if keys else None
+            node = self._root
+            for part in old_prefix.lower().split('/'):
+                node = node[0].setdefault(part, ({}, []))
+            node[1].append((keys, new_prefix))
+            # Les règles filtrées par clé sont essayées avant la règle générale du même préfixe
+            node[1].sort(key=lambda rule: rule[0] is None)
+            normalized.append(f"{old_prefix.lower()}\t{new_prefix}\t{' '.join(sorted(keys or ()))}")
+        self.count = len(normalized)
+        # Identifie la table dans l'index incrémental, comme NEW_PATH en mode simple
+        self.signature = "rules:" + hashlib.sha1("\n".join(normalized).encode("utf-8")).hexdigest()
+
+    @classmethod
+    def from_file(cls, path):
+        rules = []
+        with open(path, "r", encoding="utf-8-sig") as f:
+            for lineno, line in enumerate(f, 1):
+                line = line.strip()
+                if not line or line.startswith(("#", "//")):
+                    continue
+                line, _, keys = line.partition("|")
+                old_prefix, sep, new_prefix = line.partition("->")
+                if not sep or not old_prefix.strip():
+                    raise Exception(f"Règle invalide ligne {lineno} de {path} : {line!r}")
+                rules.append((old_prefix.strip(), new_prefix.strip(), keys.replace(",", " ").split()))
+        return cls(rules)
+
+    def rewrite(self, key, pathval):
+        """Nouveau chemin pour pathval (séparateurs '/'), ou None si aucune règle ne s'applique"""
+        # Les séparateurs doublés ("models//x") ne comptent pas comme un dossier vide
+        parts = [part for part in pathval.split('/') if part]
+        node = self._root
+        key = key.lower()
+        best = None
+        for depth, part in enumerate(parts, 1):
+            node = node[0].get(part.lower())
+            if node is None:
+                break
+            for keys, new_prefix in node[1]:
+                if keys is None or key in keys:
+                    best = (depth, new_prefix)
+                    break
+        if best is None:
+            return None
+        depth, new_prefix = best
+        rest = '/'.join(parts[depth:])
+        if not new_prefix:
+            return rest
+        return new_prefix + '/' + rest if rest else new_prefix
+
+
+def vmt_target_id(NEW_PATH):
+    """Identifiant texte de la cible (NEW_PATH ou table de règles), utilisé par l'index incrémental"""
+    return getattr(NEW_PATH, "signature", NEW_PATH)
+
+
+def _rewrite_vmt_text(text, NEW_PATH):
+    """Remplace le dossier de chaque valeur contenant un chemin, par découpage du texte aux positions des jetons.
+
+    NEW_PATH est soit un dossier (tous les chemins deviennent NEW_PATH/nom), soit un VMTRewriteRules.
+    Même lecture que tokenize_keyvalues, déroulée ici car c'est la boucle la plus chaude du moteur.
+    Retourne (nouveau texte, file_changes) ; le texte d'origine est rendu tel quel s'il n'y a rien à changer.
+    """
+    # Sans séparateur de chemin, aucune valeur ne peut être concernée
+    if '/' not in text and '\\' not in text:
+        return text, []
+    rules = NEW_PATH if isinstance(NEW_PATH, VMTRewriteRules) else None
+    prefix = NEW_PATH + '/' if rules is None else None
+    pieces = []
+    file_changes = []
+    pos = 0
+    key = ''
+    expect_value = False
+    for m in _KV_TOKEN_PATTERN.finditer(text):
+        group = m.lastindex
+        if group <= 3:
+            if group == 2:
+                expect_value = False
+            continue
+        first = 4 if m.start(4) >= 0 else 5
+        value_key = key
+        if group >= 6:
+            if expect_value:
+                # Valeur d'une clé précédente, puis une nouvelle clé qui attend sa valeur
+                value_group = first
+                key = m.group(group)
+            else:
+                value_key = key = m.group(first)
+                value_group = group
+        elif expect_value:
+            value_group = group
+            expect_value = False
+        else:
+            key = m.group(group)
+            expect_value = True
+            continue
+        start, end = m.span(value_group)
+        value = text[start:end]
+        if '/' not in value and '\\' not in value:
+            continue
+        quoted = value_group == 4 or value_group == 6
+        apostrophes = not quoted and len(value) > 1 and value[0] == value[-1] == "'"
+        if apostrophes:
+            # 'chemin' : les apostrophes ne délimitent rien en KeyValues mais sont conservées
+            value = value[1:-1]
+        pathval = value.replace('\\', '/')
+        if rules is None:
+            newpath = prefix + pathval[pathval.rfind('/') + 1:]
+        else:
+            newpath = rules.rewrite(value_key, pathval)
+            if newpath is None:
+                # Aucune règle : la référence est gardée telle quelle (et reste connue de l'index)
+                file_changes.append((value_key, pathval, pathval))
+                continue
+        file_changes.append((value_key, pathval, newpath))
+        if newpath == value:
+            continue
+        if not quoted and _KV_NEEDS_QUOTES.search(newpath):
+            newpath = '"' + newpath + '"'
+        elif apostrophes:
+            start += 1
+            end -= 1
+        pieces.append(text[pos:start])
+        pieces.append(newpath)
+        pos = end
+    if not pieces:
+        return text, file_changes
+    pieces.append(text[pos:])
+    return ''.join(pieces), file_changes
+
+
+def _rewrite_vmt_lines(lines, NEW_PATH):
+    """Réécrit une liste de lignes VMT et retourne (new_lines, file_changes)"""
+    text = ''.join(lines)
+    new_text, file_changes = _rewrite_vmt_text(text, NEW_PATH)
+    if new_text is text:
+        return list(lines), file_changes
+    return new_text.splitlines(keepends=True), file_changes
+
+
+def _rewrite_vmt_file(fullpath, NEW_PATH, encoding_hint=None):
+    """Réécrit les chemins d'un VMT. Exécutée dans les processus du pool, elle ne touche pas à l'interface.
+
+    Les durées de lecture, décodage et réécriture sont mesurées ici pour VMTProfile.
+    """
+    t_start = time.perf_counter()
+    try:
+        # read_file déroulé pour chronométrer séparément la lecture et le décodage
+        try:
+            with open(fullpath, 'rb') as f:
+                raw = f.read()
+        except OSError:
+            raise Exception(f"Impossible de lire {fullpath}")
+        t_read = time.perf_counter()
+        content, enc = detect_encoding(raw, encoding_hint)
+    except Exception as e:
+        return {"path": fullpath, "error": str(e), "nbytes": 0}
+    t_decode = time.perf_counter()
+    new_content, file_changes = _rewrite_vmt_text(content, NEW_PATH)
+    t_rewrite = time.perf_counter()
+    changed = new_content != content
+    edits = []
+    if changed:
+        # Seules les lignes modifiées repartent du processus : (numéro de ligne, ancienne, nouvelle)
+        edits = [(i, old, new) for i, (old, new)
+                 in enumerate(zip(content.splitlines(keepends=True), new_content.splitlines(keepends=True)))
+                 if old != new]
+    return {
+        "path": fullpath,
+        "error": None,
+        "nbytes": len(content),
+        "encoding": enc,
+        "edits": edits,
+        "file_changes": file_changes,
+        "sha1": hashlib.sha1(content.encode("utf-8", "surrogatepass")).hexdigest(),
+        "refs": [[key, pathval] for key, pathval, _ in file_changes],
+        "changed": changed,
+        # Une seconde passe ne change plus rien : le fichier écrit sera déjà à jour pour NEW_PATH
+        "stable": not changed or _rewrite_vmt_text(new_content, NEW_PATH)[0] == new_content,
+        "timings": (t_read - t_start, t_decode - t_read, t_rewrite - t_decode),
+        "lines": content.count('\n'),
+        "substitutions": sum(1 for _, old, new in file_changes if old != new),
+    }
+
+
+def _iter_vmt_pool(func, vmt_files, NEW_PATH, workers, log_widget, encoding_hints=None):
+    """Applique func(fichier, NEW_PATH, indice d'encodage) dans les processus et rend les résultats dans l'ordre de vmt_files"""
+    if encoding_hints is None:
+        encoding_hints = [None] * len(vmt_files)
+    done = 0
+    if workers > 1 and len(vmt_files) >= VMT_PARALLEL_MIN_FILES:
+        from concurrent.futures import ProcessPoolExecutor
+        from concurrent.futures.process import BrokenProcessPool
+        from itertools import repeat
+        workers = min(workers, len(vmt_files))
+        chunksize = max(1, min(VMT_CHUNK_SIZE, len(vmt_files) // (workers * 4)))
+        try:
+            pool = ProcessPoolExecutor(max_workers=workers)
+            try:
+                # map() rend les résultats dans l'ordre d'entrée : fusion déterministe
+                for result in pool.map(func, vmt_files, repeat(NEW_PATH), encoding_hints, chunksize=chunksize):
+                    done += 1
+                    yield result
+                return
+            finally:
+                # En cas d'annulation, ne pas attendre les paquets encore en file
+                pool.shutdown(wait=True, cancel_futures=True)
+        except BrokenProcessPool as e:
+            # Un processus mort au démarrage ou en cours : l'exécution ne pourra jamais être parallèle,
+            # ce n'est pas une exécution normale
+            cause = f" ; cause : {e.__cause__}" if e.__cause__ is not None else ""
+            log_widget.append(f"[ERREUR POOL] Pool de processus cassé ({e}{cause}), traitement en série")
+        except OSError as e:
+            log_widget.append(f"[INFO] Pool de processus indisponible ({e}), traitement en série")
+    for fullpath, encoding_hint in zip(vmt_files[done:], encoding_hints[done:]):
+        yield func(fullpath, NEW_PATH, encoding_hint)
+
+
+def _scan_material_dir(path):
+    """Liste un dossier en un seul os.scandir et retourne (sous-dossiers, entrées .vmt, entrées .vtf)"""
+    subdirs = []
+    vmt_entries = []
+    vtf_entries = []
+    with os.scandir(path) as it:
+        for entry in it:
+            try:
+                is_dir = entry.is_dir()
+            except OSError:
+                is_dir = False
+            if is_dir:
+                # Comme os.walk : les liens symboliques vers des dossiers ne sont pas suivis
+                if not entry.is_symlink():
+                    subdirs.append(entry.path)
+                continue
+            name = entry.name.lower()
+            if name.endswith(".vmt"):
+                vmt_entries.append(entry)
+            elif name.endswith(".vtf"):
+                vtf_entries.append(entry)
+    return subdirs, vmt_entries, vtf_entries
+
+
+def iter_material_dirs(MATERIALS_DIR, job=None):
+    """Parcourt l'arborescence une seule fois, dans l'ordre de os.walk, et rend (dossier, vmt, vtf) par dossier.
+
+    Les entrées sont des os.DirEntry : leur stat() est mis en cache et gratuit sous Windows,
+    ce qui évite un aller-retour réseau par fichier sur les partages.
+    """
+    stack = [MATERIALS_DIR]
+    while stack:
+        if job:
+            job.check_cancelled()
+        dirpath = stack.pop()
+        try:
+            subdirs, vmt_entries, vtf_entries = _scan_material_dir(dirpath)
+        except OSError:
+            continue
+        yield dirpath, vmt_entries, vtf_entries
+        stack.extend(reversed(subdirs))
+
+
+def entries_size(entries):
+    """Taille cumulée d'os.DirEntry ; les fichiers disparus entre-temps comptent pour zéro"""
+    total = 0
+    for entry in entries:
+        try:
+            total += entry.stat().st_size
+        except OSError:
+            pass
+    return total
+
+
+def materials_key(path):
+    """Clé de recherche d'un chemin relatif au dossier materials : minuscules et '/', comme le moteur Source"""
+    return '/'.join(part for part in path.replace('\\', '/').lower().split('/') if part and part != '.')
+
+
+class MaterialsPathIndex:
+    """Index en mémoire d'un dossier materials, construit en un seul parcours par exécution.
+
+    Les chemins relatifs sont indexés sans tenir compte de la casse : résoudre une
+    référence est un accès dictionnaire, sans os.path.exists ni appel système.
+    Les os.DirEntry de chaque dossier sont conservés pour les étapes suivantes.
+    """
+
+    def __init__(self, materials_dir):
+        self.materials_dir = materials_dir
+        # materials_key du fichier -> chemin réel
+        self.files = {}
+        # texture_key -> chemin réel du .vtf
+        self.textures = {}
+        # materials_key du dossier -> (chemin réel, entrées .vmt, entrées .vtf), dans l'ordre du parcours
+        self.dirs = {}
+
+    @classmethod
+    def build(cls, MATERIALS_DIR, job=None):
+        path_index = cls(MATERIALS_DIR)
+        for dirpath, vmt_entries, vtf_entries in iter_material_dirs(MATERIALS_DIR, job=job):
+            dir_key = path_index.relative_key(dirpath)
+            path_index.dirs[dir_key] = (dirpath, vmt_entries, vtf_entries)
+            prefix = dir_key + '/' if dir_key else ''
+            for entry in vmt_entries:
+                path_index.files[prefix + entry.name.lower()] = entry.path
+            for entry in vtf_entries:
+                key = prefix + entry.name.lower()
+                path_index.files[key] = entry.path
+                path_index.textures[texture_key(key)] = entry.path
+        return path_index
+
+    def relative_key(self, path):
+        """materials_key d'un chemin absolu situé sous le dossier materials"""
+        return materials_key(os.path.relpath(path, self.materials_dir))
+
+    def iter_dirs(self):
+        """Rend (dossier, vmt, vtf) comme iter_material_dirs, sans relister le disque"""
+        return iter(self.dirs.values())
+
+    def vmt_dirs(self):
+        return [dirpath for dirpath, vmt_entries, _ in self.dirs.values() if vmt_entries]
+
+    def vmt_dir_records(self):
+        """(dossier, nombre de VMT, nombre de VTF, octets) pour chaque dossier contenant des VMT.
+
+        La taille vient du stat() mis en cache des os.DirEntry : aucun relistage du disque.
+        """
+        return [(dirpath, len(vmt_entries), len(vtf_entries), entries_size(vmt_entries + vtf_entries))
+                for dirpath, vmt_entries, vtf_entries in self.dirs.values() if vmt_entries]
+
+    def resolve(self, relpath):
+        """Chemin réel d'un fichier donné relativement au dossier materials, ou None"""
+        return self.files.get(materials_key(relpath))
+
+    def resolve_texture(self, value):
+        """Chemin réel du .vtf désigné par une valeur de VMT ($basetexture...), ou None"""
+        return self.textures.get(texture_key(value))
+
+    def dir_entries(self, dirpath):
+        """(entrées .vmt, entrées .vtf) d'un dossier indexé, ou None s'il est hors de l'index"""
+        found = self.dirs.get(self.relative_key(dirpath))
+        return None if found is None else found[1:]
+
+
+def scan_vmt_dir_records(MATERIALS_DIR, log_widget, job=None):
+    """Dossiers contenant des VMT avec leurs comptes et leur taille, triés par chemin"""
+    records = sorted(MaterialsPathIndex.build(MATERIALS_DIR, job=job).vmt_dir_records())
+    log_widget.append(f"{len(records)} dossiers détectés et listés.")
+    return records
+
+
+# Suffixe du diff écrit par une simulation, créé à côté du dossier materials comme l'index
+VMT_DIFF_SUFFIX = ".vmtplan.diff"
+
+
+def vmt_diff_path(MATERIALS_DIR):
+    root = os.path.abspath(MATERIALS_DIR).rstrip("\\/")
+    return os.path.join(os.path.dirname(root), "." + os.path.basename(root) + VMT_DIFF_SUFFIX)
+
+
+class VMTChangePlan:
+    """Plan de réécriture des VMT, conservé dans un fichier temporaire plutôt qu'en mémoire.
+
+    Pour chaque fichier on ne garde que le hash du source et les lignes modifiées
+    (numéro, ancienne, nouvelle). Le contenu complet est reconstruit au moment de
+    l'écriture ou du diff en relisant le source, un fichier à la fois : la mémoire
+    reste la même quelle que soit la taille de l'arborescence.
+    """
+
+    def __init__(self):
+        import tempfile
+        self._spool = tempfile.TemporaryFile()
+        self.count = 0
+        # {nouveau chemin: [VMT]} rempli par validate_vmt_changes, None si la validation n'a pas tourné
+        self.unresolved = None
+
+    def __len__(self):
+        return self.count
+
+    def add(self, fullpath, enc, sha1, edits, file_changes):
+        import pickle
+        self._spool.seek(0, os.SEEK_END)
+        pickle.dump((fullpath, enc, sha1, edits, file_changes), self._spool, pickle.HIGHEST_PROTOCOL)
+        self.count += 1
+
+    def _iter_records(self):
+        import pickle
+        self._spool.seek(0)
+        for _ in range(self.count):
+            # Un pickle.load par entrée : un Unpickler partagé garderait toutes les entrées dans son mémo
+            yield pickle.load(self._spool)
+
+    def _iter_sources(self, log_widget=None):
+        """Relit chaque source et rend (entrée, anciennes lignes, nouvelles lignes) ; ignore les fichiers modifiés depuis l'analyse"""
+        for record in self._iter_records():
+            fullpath, enc, sha1, edits, _ = record
+            try:
+                content, _ = read_file(fullpath, enc)
+            except Exception as e:
+                if log_widget is not None:
+                    log_widget.append(f"[ERREUR LECTURE] {fullpath} -> {e}")
+                continue
+            if hashlib.sha1(content.encode("utf-8", "surrogatepass")).hexdigest() != sha1:
+                if log_widget is not None:
+                    log_widget.append(f"[IGNORÉ] {fullpath} a changé depuis l'analyse")
+                continue
+            lines = content.splitlines(keepends=True)
+            new_lines = list(lines)
+            for i, _, new in edits:
+                new_lines[i] = new
+            yield record, lines, new_lines
+
+    def iter_file_changes(self):
+        """Rend (fullpath, file_changes) sans relire les sources"""
+        for fullpath, _, _, _, file_changes in self._iter_records():
+            yield fullpath, file_changes
+
+    def iter_changes(self, log_widget=None):
+        """Rend (fullpath, new_lines, enc, file_changes) comme l'ancienne liste modified_vmt_files"""
+        for (fullpath, enc, _, _, file_changes), _, new_lines in self._iter_sources(log_widget):
+            yield fullpath, new_lines, enc, file_changes
+
+    def __iter__(self):
+        return self.iter_changes()
+
+    def write_diff(self, diff_path, root=None, log_widget=None):
+        """Écrit le plan sous forme de diff unifié (relecture fichier par fichier). Retourne le nombre de fichiers."""
+        import difflib
+        written = 0
+        with open(diff_path, "w", encoding="utf-8", errors="replace", newline="\n") as out:
+            for (fullpath, _, _, _, _), lines, new_lines in self._iter_sources(log_widget):
+                name = os.path.relpath(fullpath, root) if root else fullpath
+                name = name.replace('\\', '/')
+                for diff_line in difflib.unified_diff(lines, new_lines, fromfile="a/" + name, tofile="b/" + name):
+                    if not diff_line.endswith("\n"):
+                        diff_line += "\n\\ No newline at end of file\n"
+                    out.write(diff_line)
+                written += 1
+        return written
+
+    def close(self):
+        self._spool.close()
+
+
+def replace_paths_in_vmt(MATERIALS_DIR, NEW_PATH, log_widget, workers=None, job=None, index=None, path_index=None,
+                         profile=None):
+    """Analyse les VMT et retourne (vmt_dirs, plan). Le plan est un VMTChangePlan qui s'itère comme l'ancienne liste.
+
+    Avec un MaterialsPathIndex, la liste des fichiers vient de l'index au lieu d'un nouveau parcours.
+    """
+    plan = VMTChangePlan()
+    vmt_dirs = set()
+    vmt_files = []
+    encoding_hints = []
+    fingerprints = {}
+    skipped = 0
+    material_dirs = path_index.iter_dirs() if path_index is not None else iter_material_dirs(MATERIALS_DIR, job=job)
+    for root, vmt_entries, _ in material_dirs:
+        if vmt_entries:
+            vmt_dirs.add(root)
+        for entry in vmt_entries:
+            fullpath = entry.path
+            encoding_hint = None
+            if index is not None:
+                try:
+                    # Déjà en cache depuis le listage sous Windows : pas d'appel système en plus
+                    st = entry.stat()
+                except OSError:
+                    st = None
+                if st is not None:
+                    if index.is_clean(fullpath, st, NEW_PATH):
+                        skipped += 1
+                        continue
+                    fingerprints[fullpath] = st
+                    encoding_hint = index.encoding_hint(fullpath, st)
+            vmt_files.append(fullpath)
+            encoding_hints.append(encoding_hint)
+    if job:
+        job.add_scanned(skipped)
+    results = _iter_vmt_pool(_rewrite_vmt_file, vmt_files, NEW_PATH, vmt_worker_count(workers), log_widget, encoding_hints)
+    for result in results:
+        fullpath = result["path"]
+        if job:
+            job.check_cancelled()
+            job.add_scanned(1, result["nbytes"])
+        if result["error"] is not None:
+            log_widget.append(f"[ERREUR LECTURE] {fullpath} -> {result['error']}")
+            continue
+        if profile is not None:
+            profile.add_file(result)
+        if index is not None and fullpath in fingerprints:
+            index.record(fingerprints[fullpath], result, NEW_PATH)
+        # Un fichier déjà à jour n'est pas réécrit à l'identique
+        if result["changed"]:
+            plan.add(fullpath, result["encoding"], result["sha1"], result["edits"], result["file_changes"])
+    if index is not None:
+        index.prune_unseen()
+        if skipped:
+            log_widget.append(f"[INDEX] {skipped} fichiers VMT inchangés ignorés")
+    return vmt_dirs, plan
+
+
+# Nombre de threads d'écriture des VMT (les écritures et fsync libèrent le GIL)
+VMT_WRITE_THREADS = 8
+
+# Nombre de fichiers préparés, synchronisés puis remplacés ensemble
+VMT_WRITE_BATCH = 64
+
+# Suffixe du journal d'écriture, créé à côté du dossier materials comme l'index
+VMT_JOURNAL_SUFFIX = ".vmtjournal.jsonl"
+
+
+def vmt_journal_path(MATERIALS_DIR):
+    root = os.path.abspath(MATERIALS_DIR).rstrip("\\/")
+    return os.path.join(os.path.dirname(root), "." + os.path.basename(root) + VMT_JOURNAL_SUFFIX)
+
+
+class VMTWriteJournal:
+    """Journal JSON lignes d'une passe d'écriture : permet de reprendre ou d'annuler une exécution interrompue.
+
+    Pour chaque fichier on note le fichier temporaire (nouveau contenu) et la sauvegarde
+    (lien dur vers l'original) avant de remplacer quoi que ce soit. Les sauvegardes ne sont
+    supprimées qu'une fois toute la passe terminée.
+    """
+
+    def __init__(self, path):
+        import json
+        self._json = json
+        self.path = path
+        self._file = open(path, "a", encoding="utf-8")
+        self._write({"op": "begin", "time": time.time()})
+        self._sync()
+
+    def _write(self, record):
+        self._file.write(self._json.dumps(record, ensure_ascii=False) + "\n")
+
+    def _sync(self):
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def staged(self, entries):
+        """Note un lot de fichiers préparés (chemin, temporaire, sauvegarde) avant leur remplacement"""
+        for fullpath, tmp_path, backup_path in entries:
+            self._write({"op": "staged", "path": fullpath, "tmp": tmp_path, "backup": backup_path})
+        self._sync()
+
+    def replaced(self, paths):
+        for fullpath in paths:
+            self._write({"op": "replaced", "path": fullpath})
+        self._sync()
+
+    def commit(self):
+        """Fin de passe : les sauvegardes notées dans le journal ne servent plus, le journal est supprimé"""
+        self._file.close()
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                record = self._json.loads(line)
+                if record["op"] == "staged" and record["backup"]:
+                    try:
+                        os.remove(record["backup"])
+                    except OSError:
+                        pass
+        os.remove(self.path)
+
+    def close(self):
+        if not self._file.closed:
+            self._file.close()
+
+
+def recover_vmt_journal(journal_path, log_widget, mode="rollback"):
+    """Traite le journal d'une passe interrompue.
+
+    mode="resume" termine les remplacements préparés, mode="rollback" restaure tous les
+    originaux de la passe. Dans les deux cas les fichiers temporaires et le journal disparaissent.
+    """
+    import json
+    entries = {}
+    with open(journal_path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                # Dernière ligne tronquée par l'interruption
+                continue
+            if record.get("op") == "staged":
+                entries[record["path"]] = record
+    for fullpath, record in entries.items():
+        tmp_path, backup_path = record["tmp"], record["backup"]
+        try:
+            if mode == "resume":
+                if os.path.exists(tmp_path):
+                    os.replace(tmp_path, fullpath)
+                    log_widget.append(f"[REPRIS] {fullpath}")
+                if os.path.exists(backup_path):
+                    os.remove(backup_path)
+            else:
+                if os.path.exists(backup_path):
+                    if os.path.exists(fullpath) and os.path.samefile(backup_path, fullpath):
+                        # Pas encore remplacé : la sauvegarde est un lien vers l'original lui-même
+                        os.remove(backup_path)
+                    else:
+                        os.replace(backup_path, fullpath)
+                        log_widget.append(f"[RESTAURÉ] {fullpath}")
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+        except OSError as e:
+            log_widget.append(f"[ERREUR JOURNAL] {fullpath} -> {e}")
+    os.remove(journal_path)
+    return len(entries)
+
+
+def _stage_vmt_file(fullpath, new_lines, enc, keep_backup):
+    """Écrit le nouveau contenu dans un temporaire du même dossier, synchronisé sur disque"""
+    import tempfile
+    content = ''.join(new_lines)
+    # Même conversion des fins de ligne qu'une écriture en mode texte
+    data = (content.replace('\n', os.linesep) if os.linesep != '\n' else content).encode(enc)
+    directory, name = os.path.split(fullpath)
+    fd, tmp_path = tempfile.mkstemp(prefix=f".{name}.", suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        shutil.copymode(fullpath, tmp_path)
+        backup_path = None
+        if keep_backup:
+            backup_path = os.path.join(directory, f".{name}.bak")
+            if os.path.exists(backup_path):
+                os.remove(backup_path)
+            try:
+                # Un lien dur ne coûte aucune copie ; repli sur une copie si le système de fichiers ne le permet pas
+                os.link(fullpath, backup_path)
+            except OSError:
+                shutil.copy2(fullpath, backup_path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+    return content, len(data), tmp_path, backup_path
+
+
+def _fsync_directories(directories):
+    """Rend les renommages durables (POSIX uniquement, Windows n'ouvre pas les dossiers)"""
+    if os.name != "posix":
+        return
+    for directory in directories:
+        try:
+            fd = os.open(directory, os.O_RDONLY)
+        except OSError:
+            continue
+        try:
+            os.fsync(fd)
+        except OSError:
+            pass
+        finally:
+            os.close(fd)
+
+
+def apply_vmt_changes(modified_vmt_files, log_widget, job=None, index=None, journal_path=None, threads=None):
+    """Écrit les VMT modifiés de façon atomique : temporaire + fsync puis os.replace, par lots et en parallèle.
+
+    Un arrêt brutal laisse chaque fichier soit intact soit entièrement réécrit. Avec journal_path,
+    la passe peut en plus être reprise ou annulée par recover_vmt_journal.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+    from itertools import islice
+    # Consommé par lots : un VMTChangePlan n'est jamais reconstruit en entier en mémoire
+    changes = iter(modified_vmt_files)
+    journal = None
+    try:
+        with ThreadPoolExecutor(max_workers=threads or VMT_WRITE_THREADS) as pool:
+            while True:
+                if job:
+                    job.check_cancelled()
+                batch = list(islice(changes, VMT_WRITE_BATCH))
+                if not batch:
+                    break
+                if journal is None and journal_path:
+                    journal = VMTWriteJournal(journal_path)
+                futures = [pool.submit(_stage_vmt_file, fullpath, new_lines, enc, journal is not None)
+                           for fullpath, new_lines, enc, _ in batch]
+                staged = []
+                for (fullpath, _, _, _), future in zip(batch, futures):
+                    try:
+                        staged.append((fullpath,) + future.result())
+                    except Exception as e:
+                        log_widget.append(f"[ERREUR ÉCRITURE] {fullpath} -> {e}")
+                if journal is not None:
+                    journal.staged([(fullpath, tmp_path, backup_path)
+                                    for fullpath, _, _, tmp_path, backup_path in staged])
+                replaced = []
+                for fullpath, content, nbytes, tmp_path, backup_path in staged:
+                    try:
+                        os.replace(tmp_path, fullpath)
+                    except OSError as e:
+                        log_widget.append(f"[ERREUR ÉCRITURE] {fullpath} -> {e}")
+                        for leftover in (tmp_path, backup_path):
+                            if leftover:
+                                try:
+                                    os.remove(leftover)
+                                except OSError:
+                                    pass
+                        continue
+                    replaced.append(fullpath)
+                    log_widget.append(f"[MODIFIÉ] {fullpath}")
+                    if job:
+                        job.add_rewritten(1, nbytes)
+                    if index is not None:
+                        index.record_written(fullpath, content)
+                _fsync_directories({os.path.dirname(fullpath) for fullpath in replaced})
+                if journal is not None:
+                    journal.replaced(replaced)
+        if journal is not None:
+            journal.commit()
+    except VMTJobCancelled:
+        # Annulation entre deux lots : chaque fichier remplacé est complet, et le journal reste
+        # sur disque pour que recover_vmt_journal puisse reprendre ou annuler la passe
+        if journal is not None:
+            log_widget.append(f"[JOURNAL] Passe annulée, reprise ou restauration possible : {journal_path}")
+        raise
+    finally:
+        # Interrompue ou annulée : le journal reste sur disque pour recover_vmt_journal
+        if journal is not None:
+            journal.close()
+
+
+# Nombre maximal de chemins non résolus détaillés dans le log (les autres sont seulement comptés)
+VMT_VALIDATION_REPORT_LIMIT = 50
+
+
+def validate_vmt_changes(plan, path_index, log_widget, job=None):
+    """Vérifie que chaque texture produite par la réécriture existe dans l'arborescence cible.
+
+    Parcourt les file_changes déjà gardés dans le plan (aucun VMT n'est relu) et résout chaque
+    nouveau chemin dans un MaterialsPathIndex : un accès dictionnaire par référence.
+    Retourne {nouveau chemin: [VMT qui le référencent]} pour les chemins non résolus.
+    """
+    unresolved = {}
+    checked = 0
+    textures = path_index.textures
+    for fullpath, file_changes in plan.iter_file_changes():
+        if job:
+            job.check_cancelled()
+        for key, _, newpath in file_changes:
+            if key.lower() not in VMT_TEXTURE_KEYS:
+                continue
+            checked += 1
+            if texture_key(newpath) not in textures:
+                unresolved.setdefault(newpath, []).append(fullpath)
+    # Rapport compact : une ligne par chemin, les plus référencés d'abord
+    ranked = sorted(unresolved.items(), key=lambda item: (-len(item[1]), item[0]))
+    for newpath, vmt_paths in ranked[:VMT_VALIDATION_REPORT_LIMIT]:
+        log_widget.append(f"[NON RÉSOLUE] {newpath} ({len(vmt_paths)} VMT, ex. {vmt_paths[0]})")
+    if len(ranked) > VMT_VALIDATION_REPORT_LIMIT:
+        log_widget.append(f"[NON RÉSOLUE] ... et {len(ranked) - VMT_VALIDATION_REPORT_LIMIT} autres chemins")
+    log_widget.append(f"[VALIDATION] {checked} références vérifiées dans {path_index.materials_dir}, "
+                      f"{len(unresolved)} chemins non résolus")
+    plan.unresolved = unresolved
+    return unresolved
+
+
+# Suffixes du profil d'exécution (JSON) et du profil cProfile, créés à côté du dossier materials comme l'index
+VMT_PROFILE_SUFFIX = ".vmtprofile.json"
+VMT_CPROFILE_SUFFIX = ".vmtprofile.prof"
+
+# Nombre de fichiers les plus lents gardés dans le profil
+VMT_PROFILE_SLOWEST = 10
+
+
+def vmt_profile_path(MATERIALS_DIR, suffix=VMT_PROFILE_SUFFIX):
+    root = os.path.abspath(MATERIALS_DIR).rstrip("\\/")
+    return os.path.join(os.path.dirname(root), "." + os.path.basename(root) + suffix)
+
+
+class _VMTProfileStage:
+    def __init__(self, profile, name):
+        self.profile = profile
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc):
+        stages = self.profile.stages
+        stages[self.name] = stages.get(self.name, 0.0) + time.perf_counter() - self.start
+
+
+class VMTProfile:
+    """Temps par étape et compteurs d'une exécution de run_vmt.
+
+    Les étapes sont chronométrées dans le processus principal (temps réel) ; lecture,
+    décodage et réécriture sont mesurés dans les processus du pool et additionnés.
+    """
+
+    def __init__(self, slowest=VMT_PROFILE_SLOWEST):
+        # nom de l'étape -> secondes, dans l'ordre d'exécution
+        self.stages = {}
+        self.worker_times = {"lecture": 0.0, "décodage": 0.0, "réécriture": 0.0}
+        self.files = 0
+        self.bytes = 0
+        self.lines = 0
+        self.substitutions = 0
+        self.slowest_count = slowest
+        # tas des (durée, fichier) les plus lents
+        self._slowest = []
+
+    def stage(self, name):
+        return _VMTProfileStage(self, name)
+
+    def add_file(self, result):
+        import heapq
+        timings = result.get("timings")
+        if timings is None:
+            return
+        for name, seconds in zip(self.worker_times, timings):
+            self.worker_times[name] += seconds
+        self.files += 1
+        self.bytes += result["nbytes"]
+        self.lines += result["lines"]
+        self.substitutions += result["substitutions"]
+        item = (sum(timings), result["path"])
+        if len(self._slowest) < self.slowest_count:
+            heapq.heappush(self._slowest, item)
+        elif item > self._slowest[0]:
+            heapq.heapreplace(self._slowest, item)
+
+    def slowest(self):
+        return sorted(self._slowest, reverse=True)
+
+    def to_dict(self):
+        return {
+            "stages": {name: round(seconds, 4) for name, seconds in self.stages.items()},
+            "worker_times": {name: round(seconds, 4) for name, seconds in self.worker_times.items()},
+            "files": self.files,
+            "bytes": self.bytes,
+            "lines": self.lines,
+            "substitutions": self.substitutions,
+            "slowest": [{"path": path, "seconds": round(seconds, 6)} for seconds, path in self.slowest()],
+        }
+
+    def report(self, log_widget):
+        log_widget.append("[PROFIL] " + " | ".join(f"{name} {seconds:.3f}s" for name, seconds in self.stages.items()))
+        log_widget.append(f"[PROFIL] {self.files} VMT analysés, {self.bytes / (1024 * 1024):.1f} Mo, "
+                          f"{self.lines} lignes, {self.substitutions} substitutions ; cumul dans les processus : "
+                          + ", ".join(f"{name} {seconds:.3f}s" for name, seconds in self.worker_times.items()))
+        for seconds, path in self.slowest():
+            log_widget.append(f"[PROFIL] lent : {path} ({seconds * 1000:.1f} ms)")
+
+    def write_json(self, path):
+        import json
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False, indent=2)
+
+
+def rewrite_vmt_tree(MATERIALS_DIR, NEW_PATH, log_widget, workers=None, job=None, use_index=True,
+                     dry_run=False, diff_path=None, path_index=None, validate=True, validate_root=None,
+                     models_dir=None, profile=False, profile_calls=False):
+    """Analyse puis réécrit tous les VMT du dossier (enchaîne les deux étapes de run_vmt).
+
+    Avec diff_path, le plan est d'abord écrit en diff unifié ; avec dry_run, rien n'est modifié.
+    Avec validate, les textures produites sont ensuite cherchées dans validate_root
+    (par défaut MATERIALS_DIR, indexé une seule fois pour l'analyse et la validation).
+    Avec models_dir, les $cdmaterials des .mdl sont corrigés dans un thread en même temps que les VMT.
+    Le résumé VMTProfile est toujours journalisé ; avec profile, il est aussi écrit dans vmt_profile_path.
+    Avec profile_calls, l'exécution passe sous cProfile (analyse en série) et le .prof est écrit à côté.
+    """
+    run_profile = VMTProfile()
+    calls = None
+    if profile_calls:
+        import cProfile
+        if workers != 1:
+            # cProfile ne voit pas les processus du pool
+            log_widget.append("[PROFIL] cProfile actif : analyse en série")
+            workers = 1
+        calls = cProfile.Profile()
+    models_pass = None
+    if models_dir:
+        from concurrent.futures import ThreadPoolExecutor
+
+        def patch_models():
+            with run_profile.stage("modèles"):
+                return patch_mdl_tree(models_dir, NEW_PATH, log_widget, workers=workers, job=job, dry_run=dry_run)
+        models_executor = ThreadPoolExecutor(max_workers=1)
+        models_pass = models_executor.submit(patch_models)
+        models_executor.shutdown(wait=False)
+    try:
+        if calls is not None:
+            calls.enable()
+        try:
+            vmt_dirs, plan = _rewrite_vmt_tree(MATERIALS_DIR, NEW_PATH, log_widget, workers, job, use_index,
+                                               dry_run, diff_path, path_index, validate, validate_root, run_profile)
+        finally:
+            if calls is not None:
+                calls.disable()
+                calls.dump_stats(vmt_profile_path(MATERIALS_DIR, VMT_CPROFILE_SUFFIX))
+                log_widget.append(f"[PROFIL] cProfile -> {vmt_profile_path(MATERIALS_DIR, VMT_CPROFILE_SUFFIX)}")
+    finally:
+        if models_pass is not None:
+            # Attendue même si les VMT ont échoué : pas d'écriture de modèle après le retour
+            models_pass.exception()
+    if models_pass is not None:
+        models_pass.result()
+    run_profile.report(log_widget)
+    if profile:
+        try:
+            run_profile.write_json(vmt_profile_path(MATERIALS_DIR))
+        except OSError as e:
+            log_widget.append(f"[INFO] Profil non écrit ({e})")
+    return vmt_dirs, plan
+
+
+def _rewrite_vmt_tree(MATERIALS_DIR, NEW_PATH, log_widget, workers, job, use_index,
+                      dry_run, diff_path, path_index, validate, validate_root, profile):
+    if path_index is None:
+        with profile.stage("parcours"):
+            path_index = MaterialsPathIndex.build(MATERIALS_DIR, job=job)
+    index = VMTIndex.open_for(MATERIALS_DIR, log_widget) if use_index else None
+    plan = None
+    try:
+        with profile.stage("analyse"):
+            vmt_dirs, plan = replace_paths_in_vmt(MATERIALS_DIR, NEW_PATH, log_widget, workers=workers, job=job,
+                                                  index=index, path_index=path_index, profile=profile)
+        if diff_path:
+            with profile.stage("diff"):
+                count = plan.write_diff(diff_path, root=MATERIALS_DIR, log_widget=log_widget)
+            log_widget.append(f"[DIFF] {count} fichiers -> {diff_path}")
+        if dry_run:
+            log_widget.append(f"[SIMULATION] {len(plan)} fichiers VMT seraient modifiés, aucun fichier écrit")
+        else:
+            with profile.stage("écriture"):
+                apply_vmt_changes(plan.iter_changes(log_widget), log_widget, job=job, index=index,
+                                  journal_path=vmt_journal_path(MATERIALS_DIR))
+        if validate:
+            with profile.stage("validation"):
+                target_index = MaterialsPathIndex.build(validate_root, job=job) if validate_root else path_index
+                validate_vmt_changes(plan, target_index, log_widget, job=job)
+    except BaseException:
+        # Le plan n'est rendu qu'en cas de succès : son fichier temporaire est libéré ici sinon
+        if plan is not None:
+            plan.close()
+        raise
+    finally:
+        if index is not None:
+            index.close()
+    return vmt_dirs, plan
+
+
+# Paramètres de VMT dont la valeur est une texture (.vtf relative au dossier materials)
+VMT_TEXTURE_KEYS = frozenset((
+    "$basetexture", "$basetexture2", "$basetexture3", "$basetexture4", "$bumpmap", "$bumpmap2",
+    "$normalmap", "$normalmap2", "$basenormalmap", "$basenormalmap2", "$envmap", "$envmapmask",
+    "$envmapmask2", "$detail", "$detail2", "$phongexponenttexture", "$phongwarptexture",
+    "$lightwarptexture", "$selfillummask", "$selfillumtexture", "$blendmodulatetexture",
+    "$tintmasktexture", "$ambientoccltexture", "$iris", "$corneatexture", "$dudvmap",
+    "$refracttexture", "$reflecttexture", "$texture2", "$hdrbasetexture", "$hdrcompressedtexture",
+    "$emissiveblendtexture", "$emissiveblendbasetexture", "$emissiveblendflowtexture",
+    "$fleshinteriortexture", "$fleshinteriornoisetexture", "$fleshbordertexture1d",
+    "$fleshnormaltexture", "$fleshsubsurfacetexture", "$fleshcubetexture", "$maskstexture",
+    "$flowmap", "$flow_noise_texture", "$displacementmap", "$bumpmask", "$envmapmaskframe",
+))
+
+
+def texture_key(path):
+    """Forme canonique d'un chemin de texture : minuscules, '/', sans 'materials/' ni extension .vtf"""
+    path = path.replace('\\', '/').strip('/').lower()
+    if path.startswith("materials/"):
+        path = path[len("materials/"):]
+    if path.endswith(".vtf"):
+        path = path[:-len(".vtf")]
+    return path
+
+
+def _extract_vmt_texture_refs(fullpath, _NEW_PATH=None, encoding_hint=None):
+    """Liste [clé, valeur] des textures référencées par un VMT. Exécutée dans les processus du pool."""
+    try:
+        content, enc = read_file(fullpath, encoding_hint)
+    except Exception as e:
+        return {"path": fullpath, "error": str(e), "nbytes": 0}
+    refs = []
+    key = ''
+    for kind, start, end in tokenize_keyvalues(content):
+        if kind == KV_KEY:
+            key = content[start:end]
+        elif kind == KV_VALUE and key.lower() in VMT_TEXTURE_KEYS:
+            value = content[start:end].strip()
+            # Textures générées par le moteur : cubemap de la carte, cibles de rendu
+            if value and value.lower() != "env_cubemap" and not value.lower().startswith("_rt_"):
+                refs.append([key, value])
+    return {"path": fullpath, "error": None, "nbytes": len(content), "refs": refs}
+
+
+class VMTReferenceGraph:
+    """Graphe des références VMT -> VTF d'un dossier materials, résolues sans tenir compte de la casse"""
+
+    def __init__(self, materials_dir, vmt_refs, path_index):
+        self.materials_dir = materials_dir
+        # chemin du VMT -> [[clé, valeur], ...]
+        self.vmt_refs = vmt_refs
+        self.path_index = path_index
+        # texture_key -> chemin du .vtf sur disque
+        self.vtf_files = path_index.textures
+
+    def missing(self):
+        """Références sans .vtf correspondant : [(vmt, clé, valeur)]"""
+        return [(vmt_path, key, value)
+                for vmt_path, refs in self.vmt_refs.items()
+                for key, value in refs
+                if texture_key(value) not in self.vtf_files]
+
+    def referenced_vtfs(self):
+        """Chemins normalisés (os.path.normcase) des .vtf référencés par au moins un VMT"""
+        referenced = set()
+        for refs in self.vmt_refs.values():
+            for _, value in refs:
+                vtf_path = self.vtf_files.get(texture_key(value))
+                if vtf_path is not None:
+                    referenced.add(os.path.normcase(os.path.abspath(vtf_path)))
+        return referenced
+
+    def orphans(self):
+        """.vtf qu'aucun VMT du dossier ne référence (ils peuvent encore servir à un modèle ou une carte)"""
+        referenced = self.referenced_vtfs()
+        return sorted(path for path in self.vtf_files.values()
+                      if os.path.normcase(os.path.abspath(path)) not in referenced)
+
+    def report(self, log_widget):
+        missing = self.missing()
+        orphans = self.orphans()
+        for vmt_path, key, value in missing:
+            log_widget.append(f"[MANQUANTE] {vmt_path} -> {key} {value}")
+        for vtf_path in orphans:
+            log_widget.append(f"[ORPHELINE] {vtf_path}")
+        log_widget.append(f"[RÉFÉRENCES] {len(self.vmt_refs)} VMT, {len(self.vtf_files)} VTF, "
+                          f"{len(missing)} textures manquantes, {len(orphans)} orphelines")
+        return missing, orphans
+
+
+def build_vmt_reference_graph(MATERIALS_DIR, log_widget, workers=None, job=None, use_index=True, path_index=None):
+    """Construit le graphe VMT -> VTF en un seul parcours ; les VMT inchangés reprennent leurs références de l'index"""
+    if path_index is None:
+        path_index = MaterialsPathIndex.build(MATERIALS_DIR, job=job)
+    index = VMTIndex.open_for(MATERIALS_DIR, log_widget) if use_index else None
+    try:
+        vmt_refs = {}
+        vmt_files = []
+        encoding_hints = []
+        fingerprints = {}
+        for _, vmt_entries, _ in path_index.iter_dirs():
+            for entry in vmt_entries:
+                fullpath = entry.path
+                # Ordre du parcours conservé : les résultats en cache sont remplacés au fil du pool
+                vmt_refs[fullpath] = []
+                encoding_hint = None
+                if index is not None:
+                    try:
+                        st = entry.stat()
+                    except OSError:
+                        st = None
+                    if st is not None:
+                        refs = index.cached_texture_refs(fullpath, st)
+                        if refs is not None:
+                            vmt_refs[fullpath] = refs
+                            if job:
+                                job.add_scanned(1)
+                            continue
+                        fingerprints[fullpath] = st
+                        encoding_hint = index.encoding_hint(fullpath, st)
+                vmt_files.append(fullpath)
+                encoding_hints.append(encoding_hint)
+        results = _iter_vmt_pool(_extract_vmt_texture_refs, vmt_files, None, vmt_worker_count(workers),
+                                 log_widget, encoding_hints)
+        for result in results:
+            fullpath = result["path"]
+            if job:
+                job.check_cancelled()
+                job.add_scanned(1, result["nbytes"])
+            if result["error"] is not None:
+                log_widget.append(f"[ERREUR LECTURE] {fullpath} -> {result['error']}")
+                continue
+            vmt_refs[fullpath] = result["refs"]
+            if fullpath in fingerprints:
+                index.record_texture_refs(fullpath, fingerprints[fullpath], result["refs"])
+        if index is not None:
+            index.prune_texture_refs(vmt_refs)
+            if len(vmt_files) < len(vmt_refs):
+                log_widget.append(f"[INDEX] {len(vmt_refs) - len(vmt_files)} VMT inchangés repris de l'index")
+    finally:
+        if index is not None:
+            index.close()
+    return VMTReferenceGraph(MATERIALS_DIR, vmt_refs, path_index)
+
+
+def report_vmt_references(MATERIALS_DIR, log_widget, workers=None, job=None):
+    """Construit le graphe et journalise les textures manquantes et orphelines"""
+    graph = build_vmt_reference_graph(MATERIALS_DIR, log_widget, workers=workers, job=job)
+    graph.report(log_widget)
+    return graph
+
+
+# Threads de copie des déplacements entre volumes : plusieurs fichiers en vol pour occuper le disque
+DIR_COPY_THREADS = 8
+
+
+def _same_device(path, target):
+    """True si target (ou son plus proche parent existant) est sur le même volume que path.
+
+    Lève OSError si path n'existe pas : une source absente n'est pas un déplacement entre volumes.
+    """
+    device = os.stat(path).st_dev
+    probe = target
+    while not os.path.exists(probe):
+        parent = os.path.dirname(probe)
+        if parent == probe:
+            break
+        probe = parent
+    try:
+        return device == os.stat(probe).st_dev
+    except OSError:
+        return False
+
+
+def _plan_tree_copy(src_dir, dst_dir):
+    """Crée l'arborescence de dst_dir et rend les fichiers à copier : [(source, destination, taille)].
+
+    Les liens symboliques (vers des fichiers ou des dossiers) sont recréés tels quels dans dst_dir,
+    sans suivre leur cible : la suppression de la source ne doit rien perdre. Lève OSError si un
+    lien ne peut pas être recréé.
+    """
+    if not os.path.isdir(src_dir):
+        raise NotADirectoryError(f"Dossier source introuvable : {src_dir}")
+    copies = []
+    for dirpath, dirnames, filenames in os.walk(src_dir):
+        target = os.path.join(dst_dir, os.path.relpath(dirpath, src_dir))
+        os.makedirs(target, exist_ok=True)
+        # os.walk ne descend pas dans les liens vers des dossiers : ils sont recréés comme les autres liens
+        for name in [name for name in dirnames if os.path.islink(os.path.join(dirpath, name))] + filenames:
+            src = os.path.join(dirpath, name)
+            if os.path.islink(src):
+                os.symlink(os.readlink(src), os.path.join(target, name),
+                           target_is_directory=os.path.isdir(src))
+                continue
+            copies.append((src, os.path.join(target, name), os.path.getsize(src)))
+    return copies
+
+
+def _copy_file_verified(src, dst, size, job=None):
+    """Copie un fichier par le noyau, vérifie la taille écrite puis reprend dates et droits"""
+    if job:
+        job.check_cancelled()
+    with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+        _copy_file_range(fsrc, fdst, 0, size)
+    written = os.path.getsize(dst)
+    if written != size:
+        raise Exception(f"{written} octets copiés sur {size}")
+    shutil.copystat(src, dst)
+    if job:
+        job.add_rewritten(0, size)
+
+
+def _move_dirs_across_devices(moves, log_widget, job=None, threads=None):
+    """Copie en parallèle les dossiers qui changent de volume, puis supprime chaque source entièrement copiée.
+
+    Tous les fichiers de tous les dossiers passent par le même pool : les petits dossiers
+    ne laissent pas le disque inactif. Une source n'est supprimée que si chacun de ses
+    fichiers a été copié et vérifié.
+    Retourne l'ensemble des sources dont le déplacement a échoué.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+    plans = []
+    failed_dirs = set()
+    for old, new_name, merged in moves:
+        try:
+            plans.append((old, new_name, merged, _plan_tree_copy(old, new_name)))
+        except OSError as e:
+            failed_dirs.add(old)
+            log_widget.append(f"[ERREUR RENOMMAGE] {old} -> {new_name} : {e}")
+    total = sum(size for *_, copies in plans for _, _, size in copies)
+    log_widget.append(f"[COPIE] {len(plans)} dossiers vers un autre volume ({total / (1024 * 1024):.1f} Mo)")
+    with ThreadPoolExecutor(max_workers=threads or DIR_COPY_THREADS) as pool:
+        futures = [[pool.submit(_copy_file_verified, src, dst, size, job) for src, dst, size in copies]
+                   for *_, copies in plans]
+        for (old, new_name, merged, copies), dir_futures in zip(plans, futures):
+            failed = 0
+            for (src, _, _), future in zip(copies, dir_futures):
+                try:
+                    future.result()
+                except VMTJobCancelled:
+                    raise
+                except Exception as e:
+                    failed += 1
+                    log_widget.append(f"[ERREUR COPIE] {src} -> {e}")
+            if failed:
+                failed_dirs.add(old)
+                log_widget.append(f"[ERREUR RENOMMAGE] {old} -> {new_name} : {failed} fichiers non copiés, source conservée")
+                continue
+            try:
+                shutil.rmtree(old)
+            except OSError as e:
+                # Copie complète mais source encore en place : le déplacement n'est pas terminé
+                failed_dirs.add(old)
+                log_widget.append(f"[ERREUR SUPPRESSION] {old} : {e}")
+                continue
+            log_widget.append(f"[DOSSIER {'FUSIONNÉ' if merged else 'RENOMMÉ'}] {old} -> {new_name}")
+            if job:
+                job.add_rewritten(1)
+    return failed_dirs
+
+
+# Nombre de conflits détaillés dans le journal avant l'abandon d'un renommage
+DIRS_CONFLICT_REPORT_LIMIT = 50
+
+
+def _path_key(path):
+    return os.path.normcase(os.path.abspath(path))
+
+
+def _ancestor_keys(key):
+    """Clés des dossiers parents de key, du plus proche au plus lointain"""
+    parent = os.path.dirname(key)
+    while parent != key:
+        yield parent
+        key, parent = parent, os.path.dirname(parent)
+
+
+class DirRenameOp:
+    """Une opération du plan : renommage simple, ou fusion fichier par fichier dans un dossier existant"""
+    __slots__ = ("old", "new_name", "old_key", "new_key", "merge", "files", "dirs", "after", "status")
+
+    def __init__(self, old, new_name):
+        self.old = old
+        self.new_name = new_name
+        self.old_key = _path_key(old)
+        self.new_key = _path_key(new_name)
+        self.merge = False
+        # Fusion seulement : [(source, destination)] et dossiers à créer, sources déjà déplacées
+        # par les opérations précédentes
+        self.files = []
+        self.dirs = []
+        # Opérations à exécuter avant celle-ci
+        self.after = set()
+        # Résultat de l'exécution : None (pas exécutée), "renommé", "fusionné" ou "échec"
+        self.status = None
+
+
+class DirsRenamePlan:
+    """Plan complet d'un renommage de dossiers, vérifié avant de déplacer quoi que ce soit.
+
+    Les opérations sont rangées par niveaux : celles d'un même niveau sont indépendantes,
+    chaque niveau ne dépend que des précédents. conflicts liste les collisions de fichiers,
+    de types et les cycles ; un plan en conflit n'est pas exécuté.
+    """
+
+    def __init__(self):
+        self.levels = []
+        self.conflicts = []
+        self.skipped = []
+
+    def __len__(self):
+        return sum(len(level) for level in self.levels)
+
+    def iter_ops(self):
+        for level in self.levels:
+            yield from level
+
+
+def plan_dirs_changes(dirs_to_rename, prefix_suffix="", job=None):
+    """Construit le DirsRenamePlan de dirs_to_rename : cibles, dépendances, cartes de fusion et conflits.
+
+    Une opération passe avant une autre si sa source est sous la cible de l'autre (elle libère la
+    place) ou sous sa source (l'enfant d'abord, tant que son chemin est encore valide). Les fusions
+    sont vérifiées fichier par fichier contre le disque et contre les cibles des autres opérations.
+    """
+    plan = DirsRenamePlan()
+    ops = []
+    sources = {}
+    for old, new in dirs_to_rename:
+        new_name = os.path.join(os.path.dirname(new), f"{prefix_suffix}{os.path.basename(new)}")
+        op = DirRenameOp(old, new_name)
+        if op.old_key == op.new_key:
+            plan.skipped.append(f"{old} (déjà nommé ainsi)")
+            continue
+        if op.old_key in sources:
+            continue
+        if not os.path.isdir(old):
+            plan.conflicts.append(f"{old} : dossier source introuvable")
+            continue
+        sources[op.old_key] = op
+        ops.append(op)
+    targets = {}
+    for op in ops:
+        if op.new_key in targets:
+            plan.conflicts.append(f"{op.old} et {targets[op.new_key].old} -> même cible {op.new_name}")
+            continue
+        targets[op.new_key] = op
+        # Une cible libérée par une autre opération est un simple renommage
+        op.merge = os.path.lexists(op.new_name) and op.new_key not in sources
+        if op.merge and not os.path.isdir(op.new_name):
+            plan.conflicts.append(f"{op.new_name} existe et n'est pas un dossier ({op.old})")
+    for op in ops:
+        if op.old_key in targets and targets[op.old_key] is not op:
+            targets[op.old_key].after.add(op)
+        for parent in _ancestor_keys(op.old_key):
+            if parent in sources:
+                sources[parent].after.add(op)
+            if parent in targets:
+                targets[parent].after.add(op)
+
+    # Niveaux topologiques ; ce qui reste est pris dans un cycle
+    remaining = {op: len(op.after) for op in ops}
+    dependents = {}
+    for op in ops:
+        for before in op.after:
+            dependents.setdefault(before, []).append(op)
+    level = [op for op in ops if not op.after]
+    while level:
+        plan.levels.append(level)
+        next_level = []
+        for op in level:
+            del remaining[op]
+            for dependent in dependents.get(op, ()):
+                remaining[dependent] -= 1
+                if not remaining[dependent]:
+                    next_level.append(dependent)
+        level = next_level
+    for op in remaining:
+        plan.conflicts.append(f"cycle : {op.old} -> {op.new_name} attend une opération qui l'attend")
+
+    # Chemins réservés par les renommages : rien d'une fusion ne doit tomber dedans
+    claimed = {op.new_key: op for op in ops if not op.merge}
+    for op in plan.iter_ops():
+        if op.merge:
+            _plan_dir_merge(op, sources, claimed, plan.conflicts, job=job)
+    return plan
+
+
+def _plan_dir_merge(op, sources, claimed, conflicts, job=None):
+    """Remplit op.files/op.dirs : où chaque fichier de la source arrive, vu l'état laissé par les opérations précédentes"""
+    for dirpath, dirnames, filenames in os.walk(op.old):
+        if job:
+            job.check_cancelled()
+        # Les liens vers des dossiers ne sont pas parcourus : ils sont déplacés comme des fichiers
+        filenames += [name for name in dirnames if os.path.islink(os.path.join(dirpath, name))]
+        current = _planned_location(dirpath, op, sources)
+        rel = os.path.relpath(current, op.old)
+        dst_dir = os.path.normpath(os.path.join(op.new_name, rel))
+        if rel != os.curdir:
+            if os.path.lexists(dst_dir) and not os.path.isdir(dst_dir) and not _vacated(dst_dir, op, sources):
+                conflicts.append(f"{dst_dir} existe et n'est pas un dossier ({dirpath})")
+            op.dirs.append(dst_dir)
+        for name in filenames:
+            src = os.path.join(current, name)
+            dst = os.path.join(dst_dir, name)
+            dst_key = _path_key(dst)
+            owner = claimed.get(dst_key) or next((claimed[parent] for parent in _ancestor_keys(dst_key)
+                                                  if parent in claimed), None)
+            if owner is not None and owner is not op:
+                conflicts.append(f"{src} -> {dst} : déjà visé par {owner.old}")
+            elif os.path.lexists(dst) and not _vacated(dst, op, sources):
+                conflicts.append(f"{src} -> {dst} : existe déjà")
+            claimed[dst_key] = op
+            op.files.append((src, dst))
+
+
+def _planned_location(path, op, sources):
+    """Emplacement de path (sous op.old) quand op s'exécute : les sources imbriquées ont déjà été déplacées"""
+    current = ancestor = path
+    while len(_path_key(ancestor)) > len(op.old_key):
+        moved = sources.get(_path_key(ancestor))
+        if moved is not None and moved is not op:
+            # La cible est dans le même parent : le reste du chemin ne change pas
+            current = moved.new_name + current[len(ancestor):]
+            ancestor = moved.new_name
+        ancestor = os.path.dirname(ancestor)
+    return current
+
+
+def _vacated(path, op, sources):
+    """True si path est déplacé ailleurs avant que op n'écrive dans sa cible"""
+    key = _path_key(path)
+    for candidate in (key, *_ancestor_keys(key)):
+        if len(candidate) <= len(op.new_key):
+            return False
+        moved = sources.get(candidate)
+        if moved is not None and moved is not op:
+            return True
+    return False
+
+
+def _merge_dir(op):
+    """Exécute une fusion sur un même volume : un os.rename par fichier, puis retrait des dossiers vidés"""
+    for dst_dir in op.dirs:
+        os.makedirs(dst_dir, exist_ok=True)
+    for src, dst in op.files:
+        os.rename(src, dst)
+    for dirpath, _, _ in os.walk(op.old, topdown=False):
+        try:
+            os.rmdir(dirpath)
+        except OSError:
+            pass
+
+
+def apply_dirs_changes(dirs_to_rename, log_widget, prefix_suffix="", job=None, threads=None):
+    """Renomme (ou fusionne dans un dossier existant) chaque dossier en <préfixe><nom>.
+
+    Le plan complet est vérifié d'abord par plan_dirs_changes : en cas de conflit, rien n'est
+    déplacé. Sur un même volume, un dossier ne coûte qu'un os.rename ; ceux qui changent de
+    volume sont copiés par _move_dirs_across_devices, niveau par niveau.
+    Retourne le DirsRenamePlan.
+    """
+    plan = plan_dirs_changes(dirs_to_rename, prefix_suffix=prefix_suffix, job=job)
+    for skipped in plan.skipped:
+        log_widget.append(f"[IGNORÉ] {skipped}")
+    merges = [op for op in plan.iter_ops() if op.merge]
+    log_widget.append(f"[PLAN] {len(plan)} dossiers : {len(plan) - len(merges)} renommages, {len(merges)} fusions "
+                      f"({sum(len(op.files) for op in merges)} fichiers), {len(plan.levels)} niveaux")
+    if plan.conflicts:
+        for conflict in plan.conflicts[:DIRS_CONFLICT_REPORT_LIMIT]:
+            log_widget.append(f"[CONFLIT] {conflict}")
+        if len(plan.conflicts) > DIRS_CONFLICT_REPORT_LIMIT:
+            log_widget.append(f"[CONFLIT] ... et {len(plan.conflicts) - DIRS_CONFLICT_REPORT_LIMIT} autres")
+        log_widget.append(f"[ERREUR RENOMMAGE] {len(plan.conflicts)} conflits : aucun dossier déplacé")
+        return plan
+    failed = set()
+    for level in plan.levels:
+        cross_device = []
+        for op in level:
+            if job:
+                job.check_cancelled()
+            if op.after & failed:
+                failed.add(op)
+                op.status = "échec"
+                log_widget.append(f"[IGNORÉ] {op.old} -> {op.new_name} : une opération préalable a échoué")
+                continue
+            try:
+                os.makedirs(os.path.dirname(op.new_name), exist_ok=True)
+                if not _same_device(op.old, op.new_name):
+                    cross_device.append(op)
+                    continue
+                if op.merge:
+                    _merge_dir(op)
+                    op.status = "fusionné"
+                else:
+                    os.rename(op.old, op.new_name)
+                    op.status = "renommé"
+                log_widget.append(f"[DOSSIER {op.status.upper()}] {op.old} -> {op.new_name}")
+                if job:
+                    job.add_rewritten(1)
+            except Exception as e:
+                failed.add(op)
+                op.status = "échec"
+                log_widget.append(f"[ERREUR RENOMMAGE] {op.old} -> {op.new_name} : {e}")
+        if cross_device:
+            failed_dirs = _move_dirs_across_devices([(op.old, op.new_name, op.merge) for op in cross_device],
+                                                    log_widget, job=job, threads=threads)
+            for op in cross_device:
+                if op.old in failed_dirs:
+                    failed.add(op)
+                    op.status = "échec"
+                else:
+                    op.status = "fusionné" if op.merge else "renommé"
+    return plan
+
+
+def move_vmt_vtf(dirs, target_dir, log_widget, prefix_suffix="", job=None, graph=None, path_index=None):
+    """Déplace les .vmt/.vtf de chaque dossier listé vers target_dir/<préfixe><nom du dossier>.
+
+    Avec un VMTReferenceGraph, seuls les .vtf référencés par un VMT sont déplacés.
+    Les dossiers présents dans le MaterialsPathIndex (celui du graphe par défaut) ne sont pas relistés.
+    """
+    if path_index is None and graph is not None:
+        path_index = graph.path_index
+    referenced = graph.referenced_vtfs() if graph is not None else None
+    for old_dir in dirs:
+        if job:
+            job.check_cancelled()
+        if not old_dir:
+            continue
+        found = path_index.dir_entries(old_dir) if path_index is not None else None
+        if found is not None:
+            vmt_entries, vtf_entries = found
+        else:
+            try:
+                # Un seul listage par dossier pour les deux extensions
+                _, vmt_entries, vtf_entries = _scan_material_dir(old_dir)
+            except OSError:
+                continue
+        base_name = os.path.basename(old_dir)
+        dest_dir = os.path.join(target_dir, f"{prefix_suffix}{base_name}" if prefix_suffix else base_name)
+        os.makedirs(dest_dir, exist_ok=True)
+        if referenced is not None:
+            kept = []
+            for entry in vtf_entries:
+                if os.path.normcase(os.path.abspath(entry.path)) in referenced:
+                    kept.append(entry)
+                else:
+                    log_widget.append(f"[IGNORÉ] {entry.path} (texture non référencée)")
+            vtf_entries = kept
+        for entry in vmt_entries + vtf_entries:
+            src = entry.path
+            dst = os.path.join(dest_dir, entry.name)
+            if job:
+                job.add_rewritten(1, entry.stat().st_size)
+            shutil.move(src, dst)
+            log_widget.append(f"[DÉPLACÉ] {src} -> {dst}")
+
+
+def move_referenced_vmt_vtf(MATERIALS_DIR, dirs, target_dir, log_widget, prefix_suffix="", job=None):
+    """move_vmt_vtf limité aux textures référencées par les VMT de MATERIALS_DIR (un seul parcours pour les deux étapes)"""
+    graph = build_vmt_reference_graph(MATERIALS_DIR, log_widget, job=job)
+    move_vmt_vtf(dirs, target_dir, log_widget, prefix_suffix=prefix_suffix, job=job, graph=graph)
+
+
+# ------------------ Archives VPK ------------------
+
+VPK_SIGNATURE = 0x55AA1234
+
+# Index d'archive des données rangées dans le fichier _dir.vpk lui-même, après l'arbre
+VPK_DIR_ARCHIVE = 0x7FFF
+
+VPK_ENTRY_TERMINATOR = 0xFFFF
+
+# crc, octets de préchargement, index d'archive, offset, longueur, terminateur
+_VPK_ENTRY_FORMAT = '<IHHIIH'
+
+# index d'archive, offset, nombre d'octets, md5
+_VPK_ARCHIVE_MD5_FORMAT = '<III16s'
+
+
+def vpk_archive_path(dir_path, archive_index):
+    """Chemin du fichier de données n° archive_index d'un xxx_dir.vpk (xxx_000.vpk, xxx_001.vpk...)"""
+    if not dir_path.lower().endswith("_dir.vpk"):
+        raise Exception(f"{dir_path} : seules les archives xxx_dir.vpk ont des fichiers de données séparés")
+    return f"{dir_path[:-len('_dir.vpk')]}_{archive_index:03d}.vpk"
+
+
+class VPKEntry:
+    """Une entrée de l'arbre d'un VPK, telle qu'elle est écrite dans le fichier _dir"""
+    __slots__ = ("ext", "path", "filename", "crc", "preload", "archive_index", "offset", "length")
+
+    def __init__(self, ext, path, filename, crc, preload, archive_index, offset, length):
+        self.ext = ext
+        self.path = path
+        self.filename = filename
+        self.crc = crc
+        self.preload = preload
+        self.archive_index = archive_index
+        self.offset = offset
+        self.length = length
+
+    @property
+    def name(self):
+        # " " désigne la racine pour le dossier et l'absence d'extension
+        name = self.filename if self.ext == " " else f"{self.filename}.{self.ext}"
+        return name if self.path == " " else f"{self.path}/{name}"
+
+
+class VPKArchive:
+    """Archive VPK (versions 1 et 2) ouverte en lecture.
+
+    L'arbre du fichier _dir est lu une seule fois ; les données sont lues par mmap,
+    sans extraction, dans le fichier _dir ou dans les fichiers _NNN.vpk.
+    """
+
+    def __init__(self, dir_path):
+        import mmap
+        import struct
+        self.dir_path = dir_path
+        self._maps = {}
+        # nom complet ('materials/x/y.vmt') -> VPKEntry, dans l'ordre de l'arbre
+        self.entries = {}
+        self.archive_md5 = b""
+        with open(dir_path, "rb") as f:
+            self._dir = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            signature, self.version, tree_size = struct.unpack_from('<III', self._dir, 0)
+            if signature != VPK_SIGNATURE:
+                raise Exception(f"{dir_path} n'est pas une archive VPK")
+            if self.version == 1:
+                header_size = 12
+                data_size = archive_md5_size = 0
+            elif self.version == 2:
+                header_size = 28
+                data_size, archive_md5_size, _, _ = struct.unpack_from('<IIII', self._dir, 12)
+            else:
+                raise Exception(f"{dir_path} : version VPK {self.version} non prise en charge")
+            self.data_offset = header_size + tree_size
+            self._read_tree(header_size, self.data_offset)
+            if archive_md5_size:
+                start = self.data_offset + data_size
+                self.archive_md5 = self._dir[start:start + archive_md5_size]
+        except BaseException:
+            self.close()
+            raise
+
+    def _read_string(self, pos):
+        end = self._dir.find(b"\0", pos)
+        if end < 0:
+            raise Exception(f"{self.dir_path} : arbre VPK tronqué")
+        return self._dir[pos:end].decode("utf-8", "surrogateescape"), end + 1
+
+    def _read_tree(self, pos, tree_end):
+        import struct
+        entry_size = struct.calcsize(_VPK_ENTRY_FORMAT)
+        while True:
+            ext, pos = self._read_string(pos)
+            if not ext:
+                break
+            while True:
+                path, pos = self._read_string(pos)
+                if not path:
+                    break
+                while True:
+                    filename, pos = self._read_string(pos)
+                    if not filename:
+                        break
+                    crc, preload_size, archive_index, offset, length, terminator = struct.unpack_from(
+                        _VPK_ENTRY_FORMAT, self._dir, pos)
+                    if terminator != VPK_ENTRY_TERMINATOR:
+                        raise Exception(f"{self.dir_path} : entrée VPK invalide à l'octet {pos}")
+                    pos += entry_size
+                    preload = self._dir[pos:pos + preload_size]
+                    pos += preload_size
+                    entry = VPKEntry(ext, path, filename, crc, preload, archive_index, offset, length)
+                    self.entries[entry.name] = entry
+        if pos > tree_end:
+            raise Exception(f"{self.dir_path} : arbre VPK plus long que l'en-tête ne l'indique")
+
+    def _archive_map(self, archive_index):
+        import mmap
+        archive = self._maps.get(archive_index)
+        if archive is None:
+            with open(vpk_archive_path(self.dir_path, archive_index), "rb") as f:
+                archive = self._maps[archive_index] = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return archive
+
+    def data_location(self, entry):
+        """(fichier, offset absolu) des données d'une entrée hors préchargement"""
+        if entry.archive_index == VPK_DIR_ARCHIVE:
+            return self.dir_path, self.data_offset + entry.offset
+        return vpk_archive_path(self.dir_path, entry.archive_index), entry.offset
+
+    def read(self, entry):
+        """Contenu complet d'une entrée : préchargement puis données"""
+        if not entry.length:
+            return entry.preload
+        if entry.archive_index == VPK_DIR_ARCHIVE:
+            data, start = self._dir, self.data_offset + entry.offset
+        else:
+            data, start = self._archive_map(entry.archive_index), entry.offset
+        return entry.preload + data[start:start + entry.length]
+
+    def close(self):
+        for archive in self._maps.values():
+            archive.close()
+        self._maps.clear()
+        if not self._dir.closed:
+            self._dir.close()
+
+
+def _vpk_tree_bytes(entries):
+    """Sérialise l'arbre d'un VPK ; entries : [(VPKEntry, crc, preload, index d'archive, offset, longueur)]"""
+    import struct
+    tree = {}
+    for item in entries:
+        entry = item[0]
+        tree.setdefault(entry.ext, {}).setdefault(entry.path, []).append(item)
+    out = bytearray()
+    for ext, paths in tree.items():
+        out += ext.encode("utf-8", "surrogateescape") + b"\0"
+        for path, items in paths.items():
+            out += path.encode("utf-8", "surrogateescape") + b"\0"
+            for entry, crc, preload, archive_index, offset, length in items:
+                out += entry.filename.encode("utf-8", "surrogateescape") + b"\0"
+                out += struct.pack(_VPK_ENTRY_FORMAT, crc, len(preload), archive_index, offset, length,
+                                   VPK_ENTRY_TERMINATOR)
+                out += preload
+            out += b"\0"
+        out += b"\0"
+    out += b"\0"
+    return bytes(out)
+
+
+def write_vpk(archive, out_path, replaced):
+    """Écrit l'archive vers out_path (un _dir.vpk ou un VPK autonome) avec les entrées de replaced remplacées.
+
+    replaced : nom -> nouveau contenu, rangé dans la section de données du fichier _dir.
+    Les entrées inchangées des fichiers _NNN.vpk gardent leur emplacement : ces fichiers sont
+    liés (ou copiés tels quels) si out_path change, et pas touchés du tout sinon. Les entrées
+    inchangées du fichier _dir sont recopiées octet pour octet depuis le mmap.
+    Le remplacement est atomique ; l'archive est fermée à la fin.
+    """
+    import struct
+    import tempfile
+    import zlib
+    entries = []
+    # Section de données du nouveau fichier _dir : (nouvelles données) ou (offset, longueur) dans l'ancien
+    pieces = []
+    data_size = 0
+    archives = set()
+    for name, entry in archive.entries.items():
+        new_data = replaced.get(name)
+        if new_data is not None:
+            entries.append((entry, zlib.crc32(new_data), b"", VPK_DIR_ARCHIVE, data_size, len(new_data)))
+            pieces.append(new_data)
+            data_size += len(new_data)
+        elif entry.archive_index == VPK_DIR_ARCHIVE and entry.length:
+            entries.append((entry, entry.crc, entry.preload, VPK_DIR_ARCHIVE, data_size, entry.length))
+            pieces.append((archive.data_offset + entry.offset, entry.length))
+            data_size += entry.length
+        else:
+            if entry.length:
+                archives.add(entry.archive_index)
+            entries.append((entry, entry.crc, entry.preload, entry.archive_index, entry.offset, entry.length))
+    tree = _vpk_tree_bytes(entries)
+    archive_md5 = b""
+    if archive.version == 2:
+        # Les sommes des fichiers _NNN.vpk restent valables, celles de l'ancien fichier _dir non
+        record_size = struct.calcsize(_VPK_ARCHIVE_MD5_FORMAT)
+        archive_md5 = b"".join(
+            archive.archive_md5[i:i + record_size] for i in range(0, len(archive.archive_md5), record_size)
+            if struct.unpack_from('<I', archive.archive_md5, i)[0] != VPK_DIR_ARCHIVE)
+        header = struct.pack('<IIIIIII', VPK_SIGNATURE, 2, len(tree), data_size, len(archive_md5), 48, 0)
+    else:
+        header = struct.pack('<III', VPK_SIGNATURE, 1, len(tree))
+    directory = os.path.dirname(os.path.abspath(out_path))
+    fd, tmp_path = tempfile.mkstemp(prefix=f".{os.path.basename(out_path)}.", suffix=".tmp", dir=directory)
+    try:
+        whole = hashlib.md5()
+        with os.fdopen(fd, "wb") as f:
+            def write(data):
+                whole.update(data)
+                f.write(data)
+            write(header)
+            write(tree)
+            source = memoryview(archive._dir)
+            try:
+                for piece in pieces:
+                    if isinstance(piece, tuple):
+                        start, length = piece
+                        # Vue relâchée tout de suite : le mmap ne peut pas être fermé tant qu'une vue existe
+                        with source[start:start + length] as view:
+                            write(view)
+                    else:
+                        write(piece)
+            finally:
+                source.release()
+            if archive.version == 2:
+                write(archive_md5)
+                write(hashlib.md5(tree).digest())
+                write(hashlib.md5(archive_md5).digest())
+                write(whole.digest())
+            f.flush()
+            os.fsync(f.fileno())
+        if os.path.normcase(os.path.abspath(out_path)) != os.path.normcase(os.path.abspath(archive.dir_path)):
+            for archive_index in sorted(archives):
+                src = vpk_archive_path(archive.dir_path, archive_index)
+                dst = vpk_archive_path(out_path, archive_index)
+                if os.path.exists(dst):
+                    os.remove(dst)
+                try:
+                    # Un lien dur ne coûte aucune copie
+                    os.link(src, dst)
+                except OSError:
+                    shutil.copyfile(src, dst)
+        # Sous Windows, un fichier projeté en mémoire ne peut pas être remplacé
+        archive.close()
+        os.replace(tmp_path, out_path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+    finally:
+        archive.close()
+
+
+def _rewrite_archive_entry(item, NEW_PATH, encoding_hint=None):
+    """Réécrit un VMT rangé dans une archive (VPK, GMA). Exécutée dans les processus du pool : lit ses octets directement dans l'archive."""
+    name, source_path, offset, length, preload = item
+    try:
+        raw = preload
+        if length:
+            with open(source_path, "rb") as f:
+                f.seek(offset)
+                raw += f.read(length)
+        content, enc = detect_encoding(raw, encoding_hint)
+    except Exception as e:
+        return {"path": name, "error": str(e), "nbytes": 0}
+    new_content, file_changes = _rewrite_vmt_text(content, NEW_PATH)
+    data = None
+    if new_content != content:
+        # Fins de ligne d'origine conservées : le contenu d'une archive ne dépend pas de la plateforme
+        if b"\r\n" in raw:
+            new_content = new_content.replace("\n", "\r\n")
+        data = new_content.encode(enc)
+    return {"path": name, "error": None, "nbytes": len(raw), "data": data, "file_changes": file_changes}
+
+
+def rewrite_vpk(vpk_path, NEW_PATH, log_widget, output_path=None, workers=None, job=None, dry_run=False):
+    """Réécrit les VMT d'une archive VPK sans l'extraire. Retourne le nombre de VMT modifiés.
+
+    Sans output_path, seul le fichier _dir est réécrit (les fichiers _NNN.vpk ne changent pas).
+    """
+    archive = VPKArchive(vpk_path)
+    try:
+        items = []
+        for name, entry in archive.entries.items():
+            if name.lower().endswith(".vmt"):
+                source_path, offset = archive.data_location(entry)
+                items.append((name, source_path, offset, entry.length, entry.preload))
+        replaced = {}
+        for result in _iter_vmt_pool(_rewrite_archive_entry, items, NEW_PATH, vmt_worker_count(workers), log_widget):
+            name = result["path"]
+            if job:
+                job.check_cancelled()
+                job.add_scanned(1, result["nbytes"])
+            if result["error"] is not None:
+                log_widget.append(f"[ERREUR LECTURE] {vpk_path}:{name} -> {result['error']}")
+                continue
+            if result["data"] is not None:
+                replaced[name] = result["data"]
+                log_widget.append(f"[MODIFIÉ] {vpk_path}:{name}")
+        if dry_run:
+            log_widget.append(f"[SIMULATION] {len(replaced)} VMT de {vpk_path} seraient modifiés, aucun fichier écrit")
+        elif replaced or output_path:
+            write_vpk(archive, output_path or vpk_path, replaced)
+            if job:
+                job.add_rewritten(len(replaced), sum(len(data) for data in replaced.values()))
+            log_widget.append(f"[VPK] {len(replaced)} VMT réécrits sur {len(items)} -> {output_path or vpk_path}")
+    finally:
+        archive.close()
+    return len(replaced)
+
+
+# ------------------ Addons GMA (Garry's Mod) ------------------
+
+GMA_IDENT = b"GMAD"
+
+# Taille des blocs recopiés d'une archive à l'autre (mémoire bornée quelle que soit la taille de l'addon)
+GMA_COPY_CHUNK = 1 << 20
+
+
+class GMAEntry:
+    """Un fichier d'un addon GMA : nom, taille, crc et position absolue de ses données"""
+    __slots__ = ("name", "size", "crc", "offset")
+
+    def __init__(self, name, size, crc, offset):
+        self.name = name
+        self.size = size
+        self.crc = crc
+        self.offset = offset
+
+
+class GMAArchive:
+    """Addon .gma ouvert en lecture : la table des fichiers est lue une fois, les données par mmap"""
+
+    def __init__(self, path):
+        import mmap
+        import struct
+        self.path = path
+        with open(path, "rb") as f:
+            self._data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            if self._data[:4] != GMA_IDENT:
+                raise Exception(f"{path} n'est pas un addon GMA")
+            version = self._data[4]
+            pos = 5 + 16  # steamid et date, recopiés tels quels
+            if version > 1:
+                # Contenus requis, liste terminée par une chaîne vide
+                while True:
+                    value, pos = self._read_string(pos)
+                    if not value:
+                        break
+            for _ in range(3):  # nom, description, auteur
+                _, pos = self._read_string(pos)
+            pos += 4  # version de l'addon
+            # Tout ce qui précède la table est recopié tel quel à l'écriture
+            self.header_size = pos
+            self.entries = []
+            table = []
+            while True:
+                (number,) = struct.unpack_from('<I', self._data, pos)
+                pos += 4
+                if number == 0:
+                    break
+                name, pos = self._read_string(pos)
+                size, crc = struct.unpack_from('<qI', self._data, pos)
+                pos += 12
+                table.append((name, size, crc))
+            offset = pos
+            for name, size, crc in table:
+                self.entries.append(GMAEntry(name, size, crc, offset))
+                offset += size
+            if offset > len(self._data):
+                raise Exception(f"{path} : addon GMA tronqué")
+        except BaseException:
+            self.close()
+            raise
+
+    def _read_string(self, pos):
+        end = self._data.find(b"\0", pos)
+        if end < 0:
+            raise Exception(f"{self.path} : addon GMA tronqué")
+        return self._data[pos:end].decode("utf-8", "surrogateescape"), end + 1
+
+    def read(self, entry):
+        return self._data[entry.offset:entry.offset + entry.size]
+
+    def close(self):
+        if not self._data.closed:
+            self._data.close()
+
+
+def write_gma(archive, out_path, replaced=None, renamed=None):
+    """Réécrit l'addon en un seul passage séquentiel vers out_path (remplacement atomique).
+
+    replaced : nom -> nouveau contenu ; renamed : nom -> nouveau nom. Les autres fichiers sont
+    recopiés par blocs de GMA_COPY_CHUNK sans être décodés. L'archive est fermée à la fin.
+    """
+    import struct
+    import tempfile
+    import zlib
+    replaced = replaced or {}
+    renamed = renamed or {}
+    directory = os.path.dirname(os.path.abspath(out_path))
+    fd, tmp_path = tempfile.mkstemp(prefix=f".{os.path.basename(out_path)}.", suffix=".tmp", dir=directory)
+    try:
+        crc = 0
+        with os.fdopen(fd, "wb") as f:
+            def write(data):
+                nonlocal crc
+                crc = zlib.crc32(data, crc)
+                f.write(data)
+            source = memoryview(archive._data)
+            try:
+                with source[:archive.header_size] as view:
+                    write(view)
+                table = bytearray()
+                for number, entry in enumerate(archive.entries, 1):
+                    data = replaced.get(entry.name)
+                    size, entry_crc = (entry.size, entry.crc) if data is None else (len(data), zlib.crc32(data))
+                    table += struct.pack('<I', number)
+                    table += renamed.get(entry.name, entry.name).encode("utf-8", "surrogateescape") + b"\0"
+                    table += struct.pack('<qI', size, entry_crc)
+                table += struct.pack('<I', 0)
+                write(table)
+                for entry in archive.entries:
+                    data = replaced.get(entry.name)
+                    if data is not None:
+                        write(data)
+                        continue
+                    for start in range(entry.offset, entry.offset + entry.size, GMA_COPY_CHUNK):
+                        # Vue relâchée tout de suite : le mmap ne peut pas être fermé tant qu'une vue existe
+                        with source[start:min(start + GMA_COPY_CHUNK, entry.offset + entry.size)] as view:
+                            write(view)
+            finally:
+                source.release()
+            f.write(struct.pack('<I', crc))
+            f.flush()
+            os.fsync(f.fileno())
+        # Sous Windows, un fichier projeté en mémoire ne peut pas être remplacé
+        archive.close()
+        os.replace(tmp_path, out_path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+    finally:
+        archive.close()
+
+
+def rewrite_gma(gma_path, NEW_PATH, log_widget, output_path=None, workers=None, job=None, dry_run=False):
+    """Réécrit les VMT d'un addon GMA sans le décompresser. Retourne le nombre de VMT modifiés."""
+    archive = GMAArchive(gma_path)
+    try:
+        items = [(entry.name, gma_path, entry.offset, entry.size, b"")
+                 for entry in archive.entries if entry.name.lower().endswith(".vmt")]
+        replaced = {}
+        for result in _iter_vmt_pool(_rewrite_archive_entry, items, NEW_PATH, vmt_worker_count(workers), log_widget):
+            name = result["path"]
+            if job:
+                job.check_cancelled()
+                job.add_scanned(1, result["nbytes"])
+            if result["error"] is not None:
+                log_widget.append(f"[ERREUR LECTURE] {gma_path}:{name} -> {result['error']}")
+                continue
+            if result["data"] is not None:
+                replaced[name] = result["data"]
+                log_widget.append(f"[MODIFIÉ] {gma_path}:{name}")
+        if dry_run:
+            log_widget.append(f"[SIMULATION] {len(replaced)} VMT de {gma_path} seraient modifiés, aucun fichier écrit")
+        elif replaced or output_path:
+            write_gma(archive, output_path or gma_path, replaced=replaced)
+            if job:
+                job.add_rewritten(len(replaced), sum(len(data) for data in replaced.values()))
+            log_widget.append(f"[GMA] {len(replaced)} VMT réécrits sur {len(items)} -> {output_path or gma_path}")
+    finally:
+        archive.close()
+    return len(replaced)
+
+
+def _apply_gma_renames(archive, renamed, log_widget, output_path, job):
+    """Écrit les renommages d'un addon en refusant ceux qui écraseraient un fichier existant"""
+    final_names = {entry.name.lower() for entry in archive.entries if entry.name not in renamed}
+    accepted = {}
+    for old, new in renamed.items():
+        if new.lower() in final_names:
+            log_widget.append(f"[ERREUR RENOMMAGE] {archive.path}:{old} -> {new} : le fichier existe déjà")
+            continue
+        final_names.add(new.lower())
+        accepted[old] = new
+    if accepted or output_path:
+        write_gma(archive, output_path or archive.path, renamed=accepted)
+        if job:
+            job.add_rewritten(len(accepted))
+    return accepted
+
+
+def rename_gma_dirs(gma_path, dirs, log_widget, prefix_suffix="", output_path=None, job=None):
+    """apply_dirs_changes dans un addon : préfixe le nom des dossiers listés (chemins internes à l'addon)"""
+    archive = GMAArchive(gma_path)
+    try:
+        # dossier (minuscules) -> nouveau dossier
+        targets = {}
+        for old in dirs:
+            old = old.replace('\\', '/').strip('/')
+            parent, base_name = os.path.split(old) if '/' in old else ('', old)
+            targets[materials_key(old)] = f"{parent}/{prefix_suffix}{base_name}" if parent else f"{prefix_suffix}{base_name}"
+        renamed = {}
+        # fichier -> dossier listé qui le contient
+        owners = {}
+        for entry in archive.entries:
+            if job:
+                job.check_cancelled()
+            parts = entry.name.split('/')
+            # Dossier listé le plus profond contenant le fichier
+            for depth in range(len(parts) - 1, 0, -1):
+                dir_key = materials_key('/'.join(parts[:depth]))
+                new_dir = targets.get(dir_key)
+                if new_dir is not None:
+                    renamed[entry.name] = '/'.join([new_dir] + parts[depth:])
+                    owners[entry.name] = dir_key
+                    break
+        accepted = _apply_gma_renames(archive, renamed, log_widget, output_path, job)
+        done = {owners[name] for name in accepted}
+        for old in dirs:
+            dir_key = materials_key(old.replace('\\', '/').strip('/'))
+            if dir_key in done:
+                log_widget.append(f"[DOSSIER RENOMMÉ] {gma_path}:{old} -> {targets[dir_key]}")
+    finally:
+        archive.close()
+    return accepted
+
+
+def move_gma_vmt_vtf(gma_path, dirs, target_dir, log_widget, prefix_suffix="", output_path=None, job=None):
+    """move_vmt_vtf dans un addon : déplace les .vmt/.vtf des dossiers listés vers target_dir/<préfixe><nom du dossier>"""
+    archive = GMAArchive(gma_path)
+    try:
+        target_dir = target_dir.replace('\\', '/').strip('/')
+        dest_dirs = {}
+        for old_dir in dirs:
+            old_dir = old_dir.replace('\\', '/').strip('/')
+            if old_dir:
+                base_name = old_dir.rsplit('/', 1)[-1]
+                dest_dirs[materials_key(old_dir)] = f"{target_dir}/{prefix_suffix}{base_name}"
+        renamed = {}
+        for entry in archive.entries:
+            if job:
+                job.check_cancelled()
+            parent, _, name = entry.name.rpartition('/')
+            dest_dir = dest_dirs.get(materials_key(parent))
+            if dest_dir is not None and name.lower().endswith((".vmt", ".vtf")):
+                renamed[entry.name] = f"{dest_dir}/{name}"
+        accepted = _apply_gma_renames(archive, renamed, log_widget, output_path, job)
+        for old, new in accepted.items():
+            log_widget.append(f"[DÉPLACÉ] {gma_path}:{old} -> {new}")
+    finally:
+        archive.close()
+    return accepted
+
+
+# ------------------ Modèles MDL ($cdmaterials) ------------------
+
+MDL_IDENT = b"IDST"
+
+# Position dans studiohdr_t de la longueur du fichier et du couple (nombre, offset) de la table $cdmaterials
+MDL_LENGTH_OFFSET = 76
+MDL_TEXTUREDIR_OFFSET = 212
+
+# Clé passée aux règles de réécriture pour les dossiers $cdmaterials
+MDL_CDMATERIALS_KEY = "$cdmaterials"
+
+
+def _patch_mdl_file(fullpath, NEW_PATH, _encoding_hint=None):
+    """Réécrit les dossiers $cdmaterials d'un .mdl. Exécutée dans les processus du pool.
+
+    Une chaîne qui tient dans l'ancienne est modifiée sur place (complétée par des zéros),
+    sinon elle est ajoutée en fin de fichier et son offset, ainsi que la longueur de
+    l'en-tête, sont corrigés. La somme de contrôle qui lie le .mdl aux .vvd/.vtx ne change pas.
+    """
+    import struct
+    try:
+        with open(fullpath, "rb") as f:
+            data = bytearray(f.read())
+    except OSError as e:
+        return {"path": fullpath, "error": str(e), "nbytes": 0}
+    result = {"path": fullpath, "error": None, "nbytes": len(data), "data": None, "changes": []}
+    if data[:4] != MDL_IDENT or len(data) < MDL_TEXTUREDIR_OFFSET + 8:
+        result["error"] = "en-tête MDL invalide"
+        return result
+    rules = NEW_PATH if isinstance(NEW_PATH, VMTRewriteRules) else None
+    count, table = struct.unpack_from('<ii', data, MDL_TEXTUREDIR_OFFSET)
+    try:
+        for i in range(count):
+            (start,) = struct.unpack_from('<i', data, table + 4 * i)
+            end = data.index(b"\0", start)
+            old = data[start:end].decode("latin-1")
+            pathval = old.replace('\\', '/').strip('/')
+            newpath = NEW_PATH if rules is None else rules.rewrite(MDL_CDMATERIALS_KEY, pathval)
+            if newpath is None or newpath.lower() == pathval.lower():
+                continue
+            # Même style que l'original : séparateur et barre finale
+            if '\\' in old:
+                newpath = newpath.replace('/', '\\')
+            if old.endswith(('/', '\\')):
+                newpath += old[-1]
+            encoded = newpath.encode("latin-1")
+            if len(encoded) <= end - start:
+                data[start:end] = encoded.ljust(end - start, b"\0")
+            else:
+                struct.pack_into('<i', data, table + 4 * i, len(data))
+                data += encoded + b"\0"
+                struct.pack_into('<i', data, MDL_LENGTH_OFFSET, len(data))
+            result["changes"].append((old, newpath))
+    except (struct.error, ValueError, UnicodeEncodeError) as e:
+        result["error"] = f"table $cdmaterials illisible ({e})"
+        return result
+    if result["changes"]:
+        result["data"] = bytes(data)
+    return result
+
+
+def _replace_file_atomic(fullpath, data):
+    """Remplace le contenu d'un fichier : temporaire du même dossier, fsync puis os.replace"""
+    import tempfile
+    directory, name = os.path.split(fullpath)
+    fd, tmp_path = tempfile.mkstemp(prefix=f".{name}.", suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        shutil.copymode(fullpath, tmp_path)
+        os.replace(tmp_path, fullpath)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def patch_mdl_tree(MODELS_DIR, NEW_PATH, log_widget, workers=None, job=None, dry_run=False):
+    """Corrige les $cdmaterials de tous les .mdl du dossier avec la même cible que les VMT. Retourne le nombre de modèles modifiés."""
+    mdl_files = []
+    for root, _, files in os.walk(MODELS_DIR):
+        if job:
+            job.check_cancelled()
+        mdl_files.extend(os.path.join(root, name) for name in files if name.lower().endswith(".mdl"))
+    patched = 0
+    for result in _iter_vmt_pool(_patch_mdl_file, mdl_files, NEW_PATH, vmt_worker_count(workers), log_widget):
+        fullpath = result["path"]
+        if job:
+            job.check_cancelled()
+            job.add_scanned(1, result["nbytes"])
+        if result["error"] is not None:
+            log_widget.append(f"[ERREUR MDL] {fullpath} -> {result['error']}")
+            continue
+        if result["data"] is None:
+            continue
+        if not dry_run:
+            try:
+                _replace_file_atomic(fullpath, result["data"])
+            except OSError as e:
+                log_widget.append(f"[ERREUR ÉCRITURE] {fullpath} -> {e}")
+                continue
+            if job:
+                job.add_rewritten(1, len(result["data"]))
+        patched += 1
+        for old, new in result["changes"]:
+            log_widget.append(f"[MDL] {fullpath} : $cdmaterials {old} -> {new}")
+    log_widget.append(f"[MDL] {patched} modèles {'à modifier' if dry_run else 'modifiés'} sur {len(mdl_files)}")
+    return patched
+
+
+# ------------------ Cartes BSP (lump pakfile) ------------------
+
+BSP_IDENT = b"VBSP"
+
+BSP_LUMP_COUNT = 64
+
+# Lump contenant l'archive zip des fichiers embarqués dans la carte
+BSP_PAKFILE_LUMP = 40
+
+# ident, version, 64 x (offset, longueur, version, fourCC), révision de la carte
+BSP_HEADER_SIZE = 8 + 16 * BSP_LUMP_COUNT + 4
+
+# Taille des blocs des copies faites par Python quand le noyau ne copie pas lui-même
+COPY_CHUNK = 1 << 20
+
+
+def _copy_file_range(src, dst, offset, length):
+    """Copie length octets de src à partir de offset, à la position courante de dst.
+
+    os.copy_file_range laisse le noyau copier (sans passer par Python, voire sans copie
+    sur les systèmes de fichiers qui partagent les blocs) ; repli sur une copie par blocs.
+    """
+    dst.flush()
+    position = dst.tell()
+    copied = 0
+    copy_range = getattr(os, "copy_file_range", None)
+    if copy_range is not None:
+        try:
+            while copied < length:
+                count = copy_range(src.fileno(), dst.fileno(), length - copied, offset + copied, position + copied)
+                if count == 0:
+                    break
+                copied += count
+        except OSError:
+            # Systèmes de fichiers différents sur un vieux noyau, ou appel non pris en charge
+            pass
+    if copied < length and sys.platform.startswith("linux"):
+        # sendfile accepte un fichier en sortie sous Linux : la copie reste dans le noyau
+        try:
+            dst.seek(position + copied)
+            while copied < length:
+                count = os.sendfile(dst.fileno(), src.fileno(), offset + copied, length - copied)
+                if count == 0:
+                    break
+                copied += count
+        except OSError:
+            pass
+    if copied < length:
+        src.seek(offset + copied)
+        dst.seek(position + copied)
+        while copied < length:
+            chunk = src.read(min(COPY_CHUNK, length - copied))
+            if not chunk:
+                raise Exception("fichier source tronqué")
+            dst.write(chunk)
+            copied += len(chunk)
+    dst.seek(position + copied)
+
+
+class _FileSlice:
+    """Fenêtre sur une partie d'un fichier ouvert, vue comme un fichier commençant à l'octet 0.
+
+    Permet à zipfile de lire et d'écrire le lump pakfile avec des offsets relatifs au lump.
+    """
+
+    def __init__(self, f, start, length=None):
+        self._f = f
+        self._start = start
+        self._length = length
+        f.seek(start)
+
+    def _end(self):
+        if self._length is not None:
+            return self._length
+        return self._f.seek(0, os.SEEK_END) - self._start
+
+    def seekable(self):
+        return True
+
+    def tell(self):
+        return self._f.tell() - self._start
+
+    def seek(self, offset, whence=os.SEEK_SET):
+        if whence == os.SEEK_CUR:
+            offset += self.tell()
+        elif whence == os.SEEK_END:
+            offset += self._end()
+        self._f.seek(self._start + offset)
+        return offset
+
+    def read(self, size=-1):
+        remaining = self._end() - self.tell() if self._length is not None else None
+        if remaining is not None and (size is None or size < 0 or size > remaining):
+            size = max(0, remaining)
+        return self._f.read(size)
+
+    def write(self, data):
+        return self._f.write(data)
+
+    def flush(self):
+        self._f.flush()
+
+
+def _rewrite_bsp_file(item, NEW_PATH, _encoding_hint=None):
+    """Réécrit les VMT du lump pakfile d'une carte. Exécutée dans les processus du pool, une carte par appel.
+
+    Le nouveau lump est écrit à la place de l'ancien s'il était le dernier, sinon après le
+    dernier lump ; tout le reste du fichier est recopié tel quel par _copy_file_range et
+    seul l'offset du lump pakfile change dans l'en-tête.
+    """
+    import struct
+    import tempfile
+    import zipfile
+    bsp_path, output_path, dry_run = item
+    logs = []
+    result = {"path": bsp_path, "error": None, "nbytes": 0, "logs": logs, "modified": 0}
+    tmp_path = None
+    try:
+        with open(bsp_path, "rb") as f:
+            header = bytearray(f.read(BSP_HEADER_SIZE))
+            if len(header) < BSP_HEADER_SIZE or header[:4] != BSP_IDENT:
+                raise Exception("en-tête BSP invalide")
+            lumps = [struct.unpack_from('<ii', header, 8 + 16 * i) for i in range(BSP_LUMP_COUNT)]
+            pak_offset, pak_length = lumps[BSP_PAKFILE_LUMP]
+            file_size = os.fstat(f.fileno()).st_size
+            result["nbytes"] = file_size
+            if not pak_length:
+                return result
+            replaced = {}
+            with zipfile.ZipFile(_FileSlice(f, pak_offset, pak_length)) as zin:
+                for info in zin.infolist():
+                    if not info.filename.lower().endswith(".vmt"):
+                        continue
+                    raw = zin.read(info)
+                    content, enc = detect_encoding(raw)
+                    new_content, _ = _rewrite_vmt_text(content, NEW_PATH)
+                    if new_content != content:
+                        if b"\r\n" in raw:
+                            new_content = new_content.replace("\n", "\r\n")
+                        replaced[info.filename] = new_content.encode(enc)
+                        logs.append(f"[MODIFIÉ] {bsp_path}:{info.filename}")
+                result["modified"] = len(replaced)
+                if dry_run or not (replaced or output_path):
+                    return result
+                out_path = output_path or bsp_path
+                others_end = max((offset + length for i, (offset, length) in enumerate(lumps)
+                                  if i != BSP_PAKFILE_LUMP and length), default=BSP_HEADER_SIZE)
+                # Lump pakfile en dernier (cas habituel) : réécrit à sa place, sinon ajouté à la fin
+                keep = pak_offset if pak_offset >= others_end else file_size
+                fd, tmp_path = tempfile.mkstemp(prefix=f".{os.path.basename(out_path)}.", suffix=".tmp",
+                                                dir=os.path.dirname(os.path.abspath(out_path)))
+                with os.fdopen(fd, "w+b") as out:
+                    _copy_file_range(f, out, 0, keep)
+                    new_offset = (keep + 3) & ~3
+                    out.write(b"\0" * (new_offset - keep))
+                    with zipfile.ZipFile(_FileSlice(out, new_offset), "w") as zout:
+                        zout.comment = zin.comment
+                        for info in zin.infolist():
+                            new_info = zipfile.ZipInfo(info.filename, info.date_time)
+                            new_info.compress_type = info.compress_type
+                            new_info.external_attr = info.external_attr
+                            new_info.create_system = info.create_system
+                            data = replaced.get(info.filename)
+                            if data is not None:
+                                zout.writestr(new_info, data)
+                                continue
+                            with zin.open(info) as src, zout.open(new_info, "w") as dst:
+                                shutil.copyfileobj(src, dst, COPY_CHUNK)
+                    out.seek(0, os.SEEK_END)
+                    struct.pack_into('<ii', header, 8 + 16 * BSP_PAKFILE_LUMP, new_offset, out.tell() - new_offset)
+                    out.seek(0)
+                    out.write(header)
+                    out.flush()
+                    os.fsync(out.fileno())
+        # Remplacé après fermeture de la source : impossible sous Windows tant qu'elle est ouverte
+        os.replace(tmp_path, out_path)
+        tmp_path = None
+    except Exception as e:
+        result["error"] = str(e)
+    finally:
+        if tmp_path is not None:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+    return result
+
+
+def rewrite_bsp_maps(paths, NEW_PATH, log_widget, output_dir=None, workers=None, job=None, dry_run=False):
+    """Réécrit les VMT embarqués dans des cartes .bsp (fichiers ou dossiers), une carte par processus.
+
+    Sans output_dir, chaque carte est remplacée de façon atomique. Retourne (cartes, VMT modifiés).
+    """
+    bsp_files = []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, files in os.walk(path):
+                bsp_files.extend(os.path.join(root, name) for name in files if name.lower().endswith(".bsp"))
+        else:
+            bsp_files.append(path)
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+    items = [(bsp_path, os.path.join(output_dir, os.path.basename(bsp_path)) if output_dir else None, dry_run)
+             for bsp_path in bsp_files]
+    modified = 0
+    for result in _iter_vmt_pool(_rewrite_bsp_file, items, NEW_PATH, vmt_worker_count(workers), log_widget):
+        bsp_path = result["path"]
+        if job:
+            job.check_cancelled()
+            job.add_scanned(1, result["nbytes"])
+        for message in result["logs"]:
+            log_widget.append(message)
+        if result["error"] is not None:
+            log_widget.append(f"[ERREUR BSP] {bsp_path} -> {result['error']}")
+            continue
+        modified += result["modified"]
+        if result["modified"] and not dry_run and job:
+            job.add_rewritten(1)
+    verb = "seraient modifiés" if dry_run else "modifiés"
+    log_widget.append(f"[BSP] {modified} VMT {verb} dans {len(bsp_files)} cartes")
+    return len(bsp_files), modified
+
+
+# ------------------ Ligne de commande (sans interface) ------------------
+
+class VMTCliLog:
+    """Remplace le widget de log hors interface : écrit sur stderr et compte les erreurs"""
+
+    def __init__(self, stream=None, quiet=False):
+        self.stream = stream if stream is not None else sys.stderr
+        self.quiet = quiet
+        self.errors = 0
+
+    def append(self, text):
+        if text.startswith("[ERREUR"):
+            self.errors += 1
+        if not self.quiet:
+            self.stream.write(text + "\n")
+
+
+def _read_cli_roots(args):
+    """Dossiers passés en argument, plus ceux de --roots-file (un par ligne, "-" pour l'entrée standard)"""
+    roots = list(args.roots)
+    if args.roots_file:
+        stream = sys.stdin if args.roots_file == "-" else open(args.roots_file, "r", encoding="utf-8")
+        try:
+            roots.extend(line.strip() for line in stream if line.strip())
+        finally:
+            if stream is not sys.stdin:
+                stream.close()
+    return roots
+
+
+def _run_cli_root(args, root, log):
+    """Exécute la commande sur un dossier et retourne ses statistiques"""
+    job = VMTJob()
+    stats = {"root": root, "status": "ok"}
+    errors_before = log.errors
+    start = time.perf_counter()
+    try:
+        if args.command == "rewrite" and root.lower().endswith(".gma"):
+            stats["modified"] = rewrite_gma(root, args.target, log, workers=args.workers, job=job, dry_run=args.dry_run)
+        elif args.command == "rewrite":
+            if not os.path.isdir(root):
+                raise Exception(f"Dossier introuvable : {root}")
+            journal_path = vmt_journal_path(root)
+            if os.path.exists(journal_path):
+                if not args.recover:
+                    raise Exception(f"Exécution interrompue à traiter (--recover resume|rollback) : {journal_path}")
+                stats["recovered"] = recover_vmt_journal(journal_path, log, mode=args.recover)
+            diff_path = vmt_diff_path(root) if args.diff else None
+            vmt_dirs, plan = rewrite_vmt_tree(root, args.target, log, workers=args.workers,
+                                              job=job, use_index=not args.no_index,
+                                              dry_run=args.dry_run, diff_path=diff_path,
+                                              validate=not args.no_validate, validate_root=args.validate_against,
+                                              models_dir=args.models, profile=args.profile,
+                                              profile_calls=args.cprofile)
+            stats["vmt_dirs"] = len(vmt_dirs)
+            stats["planned"] = len(plan)
+            if plan.unresolved is not None:
+                stats["unresolved"] = len(plan.unresolved)
+            if diff_path:
+                stats["diff"] = diff_path
+            plan.close()
+        elif args.command == "scan":
+            path_index = MaterialsPathIndex.build(root, job=job)
+            vmt_dirs = sorted(path_index.vmt_dirs())
+            for _, vmt_entries, _ in path_index.iter_dirs():
+                job.add_scanned(len(vmt_entries))
+            stats["vmt_dirs"] = len(vmt_dirs)
+            stats["dirs"] = vmt_dirs
+        elif args.command == "rename" and args.gma:
+            stats["renamed"] = len(rename_gma_dirs(root, args.gma_dirs, log, prefix_suffix=args.prefix, job=job))
+        elif args.command == "move" and args.gma:
+            stats["moved"] = len(move_gma_vmt_vtf(root, args.gma_dirs, args.target, log, prefix_suffix=args.prefix, job=job))
+        elif args.command == "move":
+            if args.referenced_from:
+                move_referenced_vmt_vtf(args.referenced_from, [root], args.target, log, prefix_suffix=args.prefix, job=job)
+            else:
+                move_vmt_vtf([root], args.target, log, prefix_suffix=args.prefix, job=job)
+        elif args.command == "vpk":
+            if args.output and len(args.roots) + bool(args.roots_file) > 1:
+                raise Exception("--output n'accepte qu'une seule archive")
+            stats["modified"] = rewrite_vpk(root, args.target, log, output_path=args.output,
+                                            workers=args.workers, job=job, dry_run=args.dry_run)
+        elif args.command == "bsp":
+            stats["maps"], stats["modified"] = rewrite_bsp_maps([root], args.target, log, output_dir=args.output_dir,
+                                                                workers=args.workers, job=job, dry_run=args.dry_run)
+        elif args.command == "refs":
+            if not os.path.isdir(root):
+                raise Exception(f"Dossier introuvable : {root}")
+            graph = build_vmt_reference_graph(root, log, workers=args.workers, job=job)
+            missing, orphans = graph.report(log)
+            stats["vmt_files"] = len(graph.vmt_refs)
+            stats["vtf_files"] = len(graph.vtf_files)
+            stats["missing"] = len(missing)
+            stats["orphans"] = len(orphans)
+            if args.details:
+                stats["missing_refs"] = [{"vmt": vmt_path, "key": key, "value": value}
+                                         for vmt_path, key, value in missing]
+                stats["orphan_vtfs"] = orphans
+    except Exception as e:
+        log.append(f"[ERREUR] {root} -> {e}")
+    stats["files_scanned"] = job.files_scanned
+    stats["files_rewritten"] = job.files_rewritten
+    stats["bytes_processed"] = job.bytes_processed
+    stats["errors"] = log.errors - errors_before
+    if stats["errors"]:
+        stats["status"] = "error"
+    stats["elapsed"] = round(time.perf_counter() - start, 3)
+    return stats
+
+
+def _run_cli_rename(args, roots, log):
+    """rename sans --gma : un seul plan pour tous les dossiers, puis les statistiques de chacun.
+
+    L'ordre (enfants d'abord, cibles libérées) et les conflits ne se voient que sur l'ensemble :
+    en cas de conflit, aucun dossier n'est déplacé.
+    """
+    job = VMTJob()
+    start = time.perf_counter()
+    plan = None
+    try:
+        plan = apply_dirs_changes([(root, root) for root in roots], log, prefix_suffix=args.prefix, job=job)
+    except Exception as e:
+        log.append(f"[ERREUR] {e}")
+    ops = {op.old_key: op for op in plan.iter_ops()} if plan is not None else {}
+    elapsed = round(time.perf_counter() - start, 3)
+    results = []
+    for root in roots:
+        op = ops.get(_path_key(root))
+        if op is not None:
+            result = op.status
+        else:
+            # Absent du plan : introuvable, déjà nommé ainsi ou listé deux fois
+            result = "ignoré" if os.path.isdir(root) else "introuvable"
+        stats = {"root": root, "status": "ok", "target": op.new_name if op else None, "result": result}
+        if plan is None or plan.conflicts or result in (None, "échec", "introuvable"):
+            stats["status"] = "error"
+        if plan is not None:
+            stats["conflicts"] = len(plan.conflicts)
+        stats["files_scanned"] = 0
+        stats["files_rewritten"] = 1 if stats["result"] in ("renommé", "fusionné") else 0
+        stats["bytes_processed"] = 0
+        stats["elapsed"] = elapsed
+        results.append(stats)
+    return results
+
+
+def vmt_cli_main(argv=None):
+    """Point d'entrée sans interface : python aa.py vmt rewrite|scan|rename|move|vpk|bsp|refs ...
+
+    Une ligne JSON de statistiques par dossier sur stdout, puis une ligne de synthèse.
+    Les logs du moteur vont sur stderr. Code de retour 1 si au moins une erreur.
+    """
+    import argparse
+    import json
+    parser = argparse.ArgumentParser(prog="aa.py vmt", description="Moteur VMT sans interface graphique")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    def add_common(p, roots_help):
+        p.add_argument("roots", nargs="*", help=roots_help)
+        p.add_argument("--roots-file", help='Fichier listant un dossier par ligne ("-" pour stdin)')
+        p.add_argument("--quiet", action="store_true", help="Ne pas écrire les logs sur stderr")
+
+    def add_target(p):
+        target = p.add_mutually_exclusive_group(required=True)
+        target.add_argument("--new-path", help="Chemin cible des textures")
+        target.add_argument("--rules", help='Fichier de règles "ancien préfixe -> nouveau préfixe [| clés]"')
+        p.add_argument("--workers", type=int, default=None, help="Processus du moteur (0 = automatique, 1 = série)")
+
+    rewrite = sub.add_parser("rewrite", help="Remplace les chemins dans les VMT (run_vmt)")
+    add_target(rewrite)
+    rewrite.add_argument("--no-index", action="store_true", help="Ignorer l'index incrémental")
+    rewrite.add_argument("--dry-run", action="store_true", help="Calculer les modifications sans écrire")
+    rewrite.add_argument("--diff", action="store_true", help="Écrire le diff unifié à côté de chaque dossier")
+    rewrite.add_argument("--recover", choices=("resume", "rollback"),
+                         help="Traiter d'abord le journal d'une exécution interrompue")
+    rewrite.add_argument("--no-validate", action="store_true", help="Ne pas vérifier les textures produites")
+    rewrite.add_argument("--models", metavar="MODELS", help="Corriger aussi les $cdmaterials des .mdl de ce dossier")
+    rewrite.add_argument("--profile", action="store_true",
+                         help="Écrire le profil par étape en JSON à côté du dossier materials")
+    rewrite.add_argument("--cprofile", action="store_true",
+                         help="Exécuter sous cProfile (analyse en série) et écrire le .prof à côté du dossier")
+    rewrite.add_argument("--validate-against", metavar="MATERIALS",
+                         help="Dossier materials où chercher les textures produites (par défaut le dossier réécrit)")
+    add_common(rewrite, "Dossiers materials ou addons .gma")
+    scan = sub.add_parser("scan", help="Liste les dossiers contenant des VMT")
+    add_common(scan, "Dossiers materials")
+    rename = sub.add_parser("rename", help="Préfixe le nom des dossiers (run_rename)")
+    rename.add_argument("--prefix", required=True)
+    rename.add_argument("--gma", help="Addon .gma : les dossiers sont des chemins internes à l'addon")
+    add_common(rename, "Dossiers à renommer")
+    move = sub.add_parser("move", help="Déplace les VMT/VTF des dossiers vers --target")
+    move.add_argument("--target", required=True)
+    move.add_argument("--prefix", default="")
+    move.add_argument("--referenced-from", metavar="MATERIALS",
+                      help="Ne déplacer que les VTF référencés par les VMT de ce dossier materials")
+    move.add_argument("--gma", help="Addon .gma : dossiers et --target sont des chemins internes à l'addon")
+    add_common(move, "Dossiers à déplacer")
+    vpk = sub.add_parser("vpk", help="Remplace les chemins dans les VMT d'archives VPK, sans extraction")
+    add_target(vpk)
+    vpk.add_argument("--output", help="Nouveau xxx_dir.vpk (par défaut l'archive est réécrite sur place)")
+    vpk.add_argument("--dry-run", action="store_true", help="Calculer les modifications sans écrire")
+    add_common(vpk, "Archives xxx_dir.vpk")
+    bsp = sub.add_parser("bsp", help="Remplace les chemins dans les VMT embarqués des cartes .bsp")
+    add_target(bsp)
+    bsp.add_argument("--output-dir", help="Écrire les cartes corrigées dans ce dossier (par défaut sur place)")
+    bsp.add_argument("--dry-run", action="store_true", help="Calculer les modifications sans écrire")
+    add_common(bsp, "Cartes .bsp ou dossiers de cartes")
+    refs = sub.add_parser("refs", help="Graphe VMT -> VTF : textures manquantes et orphelines")
+    refs.add_argument("--workers", type=int, default=None, help="Processus du moteur (0 = automatique, 1 = série)")
+    refs.add_argument("--details", action="store_true", help="Inclure la liste des références dans le JSON")
+    add_common(refs, "Dossiers materials")
+
+    args = parser.parse_args(argv)
+    roots = _read_cli_roots(args)
+    if not roots:
+        parser.error("aucun dossier (arguments ou --roots-file)")
+    if getattr(args, "gma", None):
+        if args.command == "move" and args.referenced_from:
+            parser.error("--referenced-from ne s'applique pas à un addon .gma")
+        # Un seul passage sur l'addon pour tous les dossiers listés
+        args.gma_dirs = roots
+        roots = [args.gma]
+    if args.command in ("rewrite", "vpk", "bsp"):
+        # Règles compilées une seule fois pour tous les dossiers
+        if args.rules:
+            try:
+                args.target = VMTRewriteRules.from_file(args.rules)
+            except Exception as e:
+                parser.error(str(e))
+        else:
+            args.target = args.new_path.replace('\\', '/')
+
+    log = VMTCliLog(quiet=args.quiet)
+    summary = {"command": args.command, "roots": 0, "failed": 0,
+               "files_scanned": 0, "files_rewritten": 0, "bytes_processed": 0}
+    start = time.perf_counter()
+    if args.command == "rename" and not args.gma:
+        all_stats = _run_cli_rename(args, roots, log)
+    else:
+        all_stats = (_run_cli_root(args, root, log) for root in roots)
+    for stats in all_stats:
+        sys.stdout.write(json.dumps(stats, ensure_ascii=False) + "\n")
+        sys.stdout.flush()
+        summary["roots"] += 1
+        summary["failed"] += stats["status"] != "ok"
+        for key in ("files_scanned", "files_rewritten", "bytes_processed"):
+            summary[key] += stats[key]
+    summary["elapsed"] = round(time.perf_counter() - start, 3)
+    sys.stdout.write(json.dumps({"summary": summary}, ensure_ascii=False) + "\n")
+    return 1 if summary["failed"] else 0
+
+
+if __name__ == "__main__":
+    # python vmt_engine.py rewrite|scan|... : même interface que python aa.py vmt ...
+    import multiprocessing
+    multiprocessing.freeze_support()
+    sys.exit(vmt_cli_main(sys.argv[1:]))